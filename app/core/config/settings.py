@@ -34,11 +34,104 @@ class Settings:
     # --- External Tools ---
     # Auto-detect ffmpeg or use env var
     FFMPEG_BINARY: str = os.getenv("FFMPEG_BINARY_PATH", shutil.which("ffmpeg") or "ffmpeg")
+    FFPROBE_BINARY: str = os.getenv("FFPROBE_BINARY_PATH", shutil.which("ffprobe") or "ffprobe")
+
+    # --- Decoded Audio Cache ---
+    # 16 kHz mono float32 PCM, decoded once per file_hash and memory-mapped by every audio stage.
+    PCM_CACHE_ENABLED: bool = os.getenv("PCM_CACHE_ENABLED", "true").lower() == "true"
+    PCM_CACHE_DIR: Path = Path(os.getenv("PCM_CACHE_DIR", str(DATA_DIR / "pcm_cache")))
+    PCM_CACHE_MAX_BYTES: int = int(os.getenv("PCM_CACHE_MAX_BYTES", str(20 * 1024 ** 3)))
+
+    # --- VAD ---
+    # 'marblenet' (NeMo model), 'energy' (NumPy on CPU, no model lease) or 'auto':
+    # energy first, MarbleNet only when its speech ratio falls in the borderline band.
+    VAD_BACKEND: str = os.getenv("VAD_BACKEND", "marblenet")
+    VAD_AUTO_MIN_SPEECH_RATIO: float = float(os.getenv("VAD_AUTO_MIN_SPEECH_RATIO", "0.05"))
+    VAD_AUTO_MAX_SPEECH_RATIO: float = float(os.getenv("VAD_AUTO_MAX_SPEECH_RATIO", "0.5"))
+    # Energy backend: speech must be this far above the file's noise floor, and above the absolute minimum.
+    VAD_ENERGY_MARGIN_DB: float = float(os.getenv("VAD_ENERGY_MARGIN_DB", "12"))
+    VAD_ENERGY_MIN_DB: float = float(os.getenv("VAD_ENERGY_MIN_DB", "-55"))
+
+    # --- Diarization ---
+    # Speaker embeddings are computed only inside VAD speech regions, on sliding windows,
+    # and cached per file so re-clustering (e.g. another num_speakers) skips the embedding pass.
+    DIARIZATION_SPEECH_ONLY: bool = os.getenv("DIARIZATION_SPEECH_ONLY", "true").lower() == "true"
+    DIARIZATION_WINDOW_SECONDS: float = float(os.getenv("DIARIZATION_WINDOW_SECONDS", "1.5"))
+    DIARIZATION_WINDOW_SHIFT_SECONDS: float = float(os.getenv("DIARIZATION_WINDOW_SHIFT_SECONDS", "0.75"))
+    DIARIZATION_CLUSTER_THRESHOLD: float = float(os.getenv("DIARIZATION_CLUSTER_THRESHOLD", "0.6"))
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_DIR: Path = Path(os.getenv("EMBEDDING_CACHE_DIR", str(DATA_DIR / "embedding_cache")))
+    EMBEDDING_CACHE_MAX_BYTES: int = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+    # --- Speaker Identities ---
+    # Voices are matched across sources by cosine similarity of their speaker embeddings.
+    SPEAKER_INDEX_ENABLED: bool = os.getenv("SPEAKER_INDEX_ENABLED", "true").lower() == "true"
+    SPEAKER_INDEX_PATH: Path = Path(os.getenv("SPEAKER_INDEX_PATH", str(DATA_DIR / "speaker_index.npz")))
+    SPEAKER_MATCH_THRESHOLD: float = float(os.getenv("SPEAKER_MATCH_THRESHOLD", "0.7"))
 
     # --- Model Configuration ---
     WHISPER_MODEL_NAME: str = "large-v3"
     WHISPER_DEVICE: str = "cuda" if os.getenv("USE_CUDA", "true").lower() == "true" else "cpu"
 
+    # --- Transcription ---
+    # 'whisper' (PyTorch) or 'faster_whisper' (CTranslate2, int8 on CPU; falls back if not installed).
+    TRANSCRIPTION_BACKEND: str = os.getenv("TRANSCRIPTION_BACKEND", "whisper")
+    # Empty = int8 on CPU, float16 on CUDA
+    FASTER_WHISPER_COMPUTE_TYPE: str = os.getenv("FASTER_WHISPER_COMPUTE_TYPE", "")
+    # Recordings longer than the threshold are split into chunks and transcribed in parallel.
+    TRANSCRIPTION_CHUNKING_THRESHOLD_SECONDS: float = float(os.getenv("TRANSCRIPTION_CHUNKING_THRESHOLD_SECONDS", "1800"))
+    TRANSCRIPTION_CHUNK_SECONDS: float = float(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "600"))
+    TRANSCRIPTION_CHUNK_OVERLAP_SECONDS: float = float(os.getenv("TRANSCRIPTION_CHUNK_OVERLAP_SECONDS", "5"))
+    # Shorter recordings are piped through FFmpeg in fixed windows, so memory does not grow with length.
+    TRANSCRIPTION_STREAMING: bool = os.getenv("TRANSCRIPTION_STREAMING", "true").lower() == "true"
+    TRANSCRIPTION_STREAM_WINDOW_SECONDS: float = float(os.getenv("TRANSCRIPTION_STREAM_WINDOW_SECONDS", "300"))
+    # CPU only: each worker process holds its own copy of the model.
+    TRANSCRIPTION_CHUNK_WORKERS: int = int(os.getenv("TRANSCRIPTION_CHUNK_WORKERS", str(max(1, (os.cpu_count() or 1) // 2))))
+    # Chunked/streamed jobs commit segments per chunk and resume from the last checkpoint on retry.
+    TRANSCRIPTION_CHECKPOINTING: bool = os.getenv("TRANSCRIPTION_CHECKPOINTING", "true").lower() == "true"
+
+    # --- Job Workers ---
+    # 'thread' shares one process (and one ModelOrchestrator); 'process' isolates each job.
+    WORKER_POOL_MODE: str = os.getenv("WORKER_POOL_MODE", "thread")
+    WORKER_CONCURRENCY: int = int(os.getenv("WORKER_CONCURRENCY", "2"))
+    WORKER_POLL_INTERVAL_SECONDS: float = float(os.getenv("WORKER_POLL_INTERVAL_SECONDS", "2.0"))
+    JOB_LEASE_SECONDS: int = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+    # --- Admission Gate ---
+    # TRANSCRIPTION/DIARIZATION jobs of sources with less speech than this complete at once, skipped.
+    # The VAD timeline is read from the store, else computed with ADMISSION_VAD_BACKEND.
+    ADMISSION_GATE_ENABLED: bool = os.getenv("ADMISSION_GATE_ENABLED", "true").lower() == "true"
+    ADMISSION_VAD_BACKEND: str = os.getenv("ADMISSION_VAD_BACKEND", "auto")
+    ADMISSION_MIN_SPEECH_SECONDS: float = float(os.getenv("ADMISSION_MIN_SPEECH_SECONDS", "1.0"))
+    ADMISSION_MIN_SPEECH_RATIO: float = float(os.getenv("ADMISSION_MIN_SPEECH_RATIO", "0.01"))
+    # GPU seconds per second of audio, for the 'gpu_seconds_saved' estimate of skipped jobs.
+    ADMISSION_TRANSCRIPTION_GPU_RTF: float = float(os.getenv("ADMISSION_TRANSCRIPTION_GPU_RTF", "0.1"))
+    ADMISSION_DIARIZATION_GPU_RTF: float = float(os.getenv("ADMISSION_DIARIZATION_GPU_RTF", "0.05"))
+
+    # --- Job Scheduling ---
+    # 'affinity' batches the queue by required model to avoid model swaps; 'fifo' is plain created_at order.
+    WORKER_SCHEDULER: str = os.getenv("WORKER_SCHEDULER", "affinity")
+    SCHEDULER_MAX_BATCH: int = int(os.getenv("SCHEDULER_MAX_BATCH", "50"))
+    SCHEDULER_MAX_WAIT_SECONDS: float = float(os.getenv("SCHEDULER_MAX_WAIT_SECONDS", "1800"))
+    SCHEDULER_LOOKAHEAD: int = int(os.getenv("SCHEDULER_LOOKAHEAD", "1000"))
+
+    # --- Model Residency ---
+    # 'single': strict one-model slot (small-VRAM GPUs).
+    # 'budget': keep several models resident under MODEL_MEMORY_BUDGET_BYTES, evicting LRU first.
+    MODEL_RESIDENCY_MODE: str = os.getenv("MODEL_RESIDENCY_MODE", "single" if WHISPER_DEVICE == "cuda" else "budget")
+    MODEL_MEMORY_BUDGET_BYTES: int = int(os.getenv("MODEL_MEMORY_BUDGET_BYTES", str(8 * 1024 ** 3)))
+    # Max time a model request waits for other models' leases to drain before a swap.
+    MODEL_LEASE_TIMEOUT_SECONDS: float = float(os.getenv("MODEL_LEASE_TIMEOUT_SECONDS", "600"))
+    # Warm tier: evicted torch modules are parked in host RAM up to this size (0 disables).
+    # Pointless on CPU-only boxes, where models already live in host RAM.
+    MODEL_HOST_CACHE_BYTES: int = int(os.getenv("MODEL_HOST_CACHE_BYTES", str(16 * 1024 ** 3) if WHISPER_DEVICE == "cuda" else "0"))
+    MODEL_HOST_PIN_MEMORY: bool = os.getenv("MODEL_HOST_PIN_MEMORY", "true").lower() == "true"
+    # Models unused for this long are dropped from memory (0 disables the idle reaper).
+    MODEL_IDLE_TIMEOUT_SECONDS: float = float(os.getenv("MODEL_IDLE_TIMEOUT_SECONDS", "1800"))
+    # Let the job worker warm the model needed by the next queued job.
+    MODEL_PREFETCH_ENABLED: bool = os.getenv("MODEL_PREFETCH_ENABLED", "true").lower() == "true"
+
     # --- NeMo Model Paths ---
     NEMO_VAD_PATH: Path = MODELS_DIR / "nemo/vad_multilingual_marblenet.nemo"
     NEMO_DIAR_PATH: Path = MODELS_DIR / "nemo/titanet_large.nemo"
@@ -0,0 +1,95 @@
+# File: app/core/jobs/admission.py
+
+import logging
+from typing import Dict, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config.settings import settings
+from .models import JobModel
+from .types import JobType
+
+logger = logging.getLogger(__name__)
+
+NO_SPEECH_REASON = "skipped: no speech"
+
+
+class SpeechAdmissionGate:
+    """
+    Keeps heavy speech models away from media without speech (silent clips,
+    surveillance footage). Before a gated job runs, the source's VAD timeline is
+    checked; below the speech thresholds the job completes at once with an empty result.
+
+    The timeline comes from the VAD store when the file was analyzed before, so
+    the gate usually costs one query; otherwise settings.ADMISSION_VAD_BACKEND runs
+    ('auto' = CPU energy VAD, MarbleNet only for borderline files).
+    Uses lazy imports, like JobManager._route_to_feature.
+    """
+
+    # Job type -> GPU seconds per second of audio (estimate of the work avoided)
+    GATED_JOB_TYPES: Dict[JobType, str] = {
+        JobType.TRANSCRIPTION: "ADMISSION_TRANSCRIPTION_GPU_RTF",
+        JobType.DIARIZATION: "ADMISSION_DIARIZATION_GPU_RTF",
+    }
+
+    def __init__(self, min_speech_seconds: Optional[float] = None, min_speech_ratio: Optional[float] = None):
+        self.min_speech_seconds = settings.ADMISSION_MIN_SPEECH_SECONDS if min_speech_seconds is None else min_speech_seconds
+        self.min_speech_ratio = settings.ADMISSION_MIN_SPEECH_RATIO if min_speech_ratio is None else min_speech_ratio
+
+    def check(self, job: JobModel) -> Optional[dict]:
+        """
+        The result of a skipped job, or None if the job should run.
+        Jobs can opt out with payload {"admission_gate": false}.
+        """
+        if job.job_type not in self.GATED_JOB_TYPES or not (job.payload or {}).get("admission_gate", True):
+            return None
+
+        file_record = job.source.original_file if job.source else None
+        if file_record is None:
+            return None  # Let the handler report the missing file
+
+        from app.features.vad.service.api import get_vad_timeline, analyze_voice_activity, speech_ratio
+        from app.features.vad.domain.models import VadEventType
+
+        segments = get_vad_timeline(file_record.file_hash)
+        if segments is None:
+            segments, _ = analyze_voice_activity(file_record.file_path, file_record.file_hash, settings.ADMISSION_VAD_BACKEND)
+
+        duration = max((s.end for s in segments), default=0.0)
+        speech_seconds = sum(s.end - s.start for s in segments if s.event_type == VadEventType.SPEECH)
+        ratio = speech_ratio(segments)
+        if speech_seconds >= self.min_speech_seconds and ratio >= self.min_speech_ratio:
+            return None
+
+        rtf = getattr(settings, self.GATED_JOB_TYPES[job.job_type])
+        logger.info(
+            f"Job {job.id} ({job.job_type.value}) skipped: {speech_seconds:.1f}s of speech "
+            f"in {duration:.1f}s (ratio {ratio:.3f})."
+        )
+        return {
+            "skipped": True,
+            "reason": NO_SPEECH_REASON,
+            "segment_count": 0,
+            "speech_seconds": speech_seconds,
+            "speech_ratio": ratio,
+            "duration_seconds": duration,
+            "gpu_seconds_saved": duration * rtf
+        }
+
+
+def admission_report(db: Session) -> dict:
+    """
+    Skip accounting over all jobs the gate completed without running.
+    """
+    rows = db.execute(
+        select(JobModel.job_type, JobModel.result_meta).where(JobModel.skip_reason.is_not(None))
+    ).all()
+
+    per_job_type: Dict[str, int] = {}
+    for job_type, _ in rows:
+        per_job_type[job_type.value] = per_job_type.get(job_type.value, 0) + 1
+
+    return {
+        "jobs_skipped": len(rows),
+        "per_job_type": per_job_type,
+        "gpu_seconds_saved": sum((meta or {}).get("gpu_seconds_saved", 0.0) for _, meta in rows)
+    }
@@ -2,7 +2,10 @@
 
 import logging
 from uuid import UUID
+from typing import Optional
 from datetime import datetime, timezone
+from sqlalchemy import update
+from app.core.config.settings import settings
 from app.core.database.connection import SessionLocal
 from .models import JobModel
 from .types import JobType, JobStatus
@@ -40,32 +43,100 @@ class JobManager:
             job.started_at = datetime.now(timezone.utc)
             db.commit()
 
+            # The claim this run belongs to. If the lease expires and the job is reclaimed
+            # (by any worker, this one included), the new claim owns the row from then on.
+            owner, attempt = job.worker_id, job.attempts
+            outcome = {}
+
             try:
                 logger.info(f"Starting Job {job_id} ({job.job_type})...")
                 
-                # Dynamic Routing to Feature Handlers
-                result = self._route_to_feature(job)
+                # Admission: heavy speech jobs on media without speech complete at once
+                result = self._admission_check(job)
+                if result is not None:
+                    outcome["skip_reason"] = result["reason"]
+                else:
+                    # Dynamic Routing to Feature Handlers
+                    result = self._route_to_feature(job)
 
                 # Update Status -> COMPLETED
-                job.result_meta = result
-                job.status = JobStatus.COMPLETED
-                job.finished_at = datetime.now(timezone.utc)
+                outcome.update(result_meta=result, status=JobStatus.COMPLETED, finished_at=datetime.now(timezone.utc))
                 logger.info(f"Job {job_id} Completed successfully.")
 
             except NotImplementedError as e:
                 # Configuration error
-                job.status = JobStatus.FAILED
-                job.error_message = f"Configuration Error: {str(e)}"
+                outcome.update(status=JobStatus.FAILED, error_message=f"Configuration Error: {str(e)}")
                 logger.error(f"Job {job_id} Failed: {e}")
 
             except Exception as e:
                 # Execution error
-                job.status = JobStatus.FAILED
-                job.error_message = str(e)
+                outcome.update(status=JobStatus.FAILED, error_message=str(e))
                 logger.exception(f"Job {job_id} Failed: {e}")
             
             finally:
+                # Release the worker lease (if any) so the reaper never reclaims a finished job.
+                # Only while the claim is still ours: a late duplicate must not overwrite the rerun.
+                finished = db.execute(
+                    update(JobModel)
+                    .where(
+                        JobModel.id == job_id,
+                        JobModel.status == JobStatus.PROCESSING,
+                        JobModel.worker_id == owner,
+                        JobModel.attempts == attempt
+                    )
+                    .values(lease_expires_at=None, **outcome)
+                ).rowcount
                 db.commit()
+                if not finished:
+                    logger.warning(f"Job {job_id}: Lease lost while running; result of this run discarded.")
+
+    def _admission_check(self, job: JobModel) -> Optional[dict]:
+        """Result of a job the admission gate skips, else None (see admission.py)."""
+        if not settings.ADMISSION_GATE_ENABLED:
+            return None
+        from .admission import SpeechAdmissionGate
+        try:
+            return SpeechAdmissionGate().check(job)
+        except Exception as e:
+            # The gate is an optimization: when VAD fails, the job simply runs
+            logger.warning(f"Admission check for Job {job.id} failed, running it: {e}")
+            return None
+
+    def prefetch_model(self, job_type: JobType, params: dict) -> bool:
+        """
+        Asks the ModelOrchestrator to warm the model a queued job will need.
+        Returns True if a background load was started.
+        """
+        target = self._model_loader_for(job_type, params or {})
+        if target is None:
+            return False
+
+        from app.core.model_lifecycle.orchestrator import ModelOrchestrator
+        model_type, loader_func, variant = target
+        return ModelOrchestrator().prefetch(model_type, loader_func, variant=variant)
+
+    def _model_loader_for(self, job_type: JobType, params: dict):
+        """
+        Resolves (ModelType, loader, variant) for a job without running it.
+        Uses lazy imports, like _route_to_feature.
+        """
+        from app.core.model_lifecycle.types import ModelType
+
+        if job_type == JobType.TRANSCRIPTION:
+            from app.features.transcription.data.backends import create_transcriber
+            adapter = create_transcriber(params.get("backend"))
+            model_size = params.get("model_size", "base")
+            return ModelType.WHISPER, adapter.model_loader(model_size), adapter.model_variant(model_size)
+
+        elif job_type == JobType.DIARIZATION:
+            from app.features.diarization.data.nemo_adapter import NemoDiarizationAdapter
+            return ModelType.NEMO_DIARIZATION, NemoDiarizationAdapter().model_loader(), None
+
+        elif job_type == JobType.VAD_ANALYSIS:
+            from app.features.vad.data.marblenet_adapter import MarbleNetAdapter
+            return ModelType.NEMO_VAD, MarbleNetAdapter().model_loader(), None
+
+        return None
 
     def _route_to_feature(self, job: JobModel) -> dict:
         """
@@ -74,14 +145,14 @@ class JobManager:
         """
         if job.job_type == JobType.TRANSCRIPTION:
             from app.features.transcription.service.job_handler import TranscriptionHandler
-            return TranscriptionHandler().handle(job.source_id, job.payload)
+            return TranscriptionHandler().handle(job.source_id, job.payload, job_id=job.id)
             
         elif job.job_type == JobType.DIARIZATION:
             from app.features.diarization.service.job_handler import DiarizationHandler
             return DiarizationHandler().handle(job.source_id, job.payload)
             
         elif job.job_type == JobType.VAD_ANALYSIS:
-            from app.features.vad.job_handler import VadHandler
+            from app.features.vad.service.job_handler import VadHandler
             return VadHandler().handle(job.source_id, job.payload)
 
         # Future features...
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, JSON, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, Enum as SQLEnum, JSON, ForeignKey
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database.base import Base
@@ -19,7 +19,7 @@ class JobModel(Base):
     source_id = Column(UUID(as_uuid=True), ForeignKey("sources.id"), nullable=False, index=True) 
     
     job_type = Column(SQLEnum(JobType), nullable=False)
-    status = Column(SQLEnum(JobStatus), default=JobStatus.PENDING)
+    status = Column(SQLEnum(JobStatus), default=JobStatus.PENDING, index=True)
     
     payload = Column(JSON, default=dict)     # Input parameters
     result_meta = Column(JSON, default=dict) # Output pointers (IDs, counts)
@@ -30,6 +30,22 @@ class JobModel(Base):
     
     error_message = Column(String, nullable=True)
 
+    # Worker Lease (see app/core/jobs/worker.py)
+    # A claimed job belongs to 'worker_id' until 'lease_expires_at'.
+    # Expired leases are returned to PENDING so a crashed worker never strands a job.
+    worker_id = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, default=0)
+
+    # Progress High-Water Mark
+    # Seconds of the source timeline whose results are already committed.
+    # A retried job resumes from here instead of starting over.
+    checkpoint_seconds = Column(Float, nullable=True)
+
+    # Admission Gate (see app/core/jobs/admission.py)
+    # Set when the job completed without running, e.g. "skipped: no speech".
+    skip_reason = Column(String, nullable=True)
+
     # FIXED: Added the reverse relationship
     # This matches SourceModel.jobs (back_populates="source")
     source = relationship("SourceModel", back_populates="jobs")
\ No newline at end of file
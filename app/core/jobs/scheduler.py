@@ -0,0 +1,153 @@
+# File: app/core/jobs/scheduler.py
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+from app.core.config.settings import settings
+from app.core.model_lifecycle.types import ModelType
+from .types import JobType
+
+logger = logging.getLogger(__name__)
+
+# Which heavy model each job type needs. Job types not listed are model-free
+# (FFmpeg, DB work) and can run alongside any group without causing a swap.
+JOB_MODEL_AFFINITY: Dict[JobType, ModelType] = {
+    JobType.TRANSCRIPTION: ModelType.WHISPER,
+    JobType.DIARIZATION: ModelType.NEMO_DIARIZATION,
+    JobType.VAD_ANALYSIS: ModelType.NEMO_VAD,
+}
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes even for timezone-aware columns.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class QueuedJob:
+    """
+    Lightweight view of a PENDING job, enough to make a scheduling decision.
+    """
+    job_type: JobType
+    created_at: datetime
+
+    @property
+    def model_type(self) -> Optional[ModelType]:
+        return JOB_MODEL_AFFINITY.get(self.job_type)
+
+
+class ModelAffinityScheduler:
+    """
+    Batches the queue by required model to minimize ModelOrchestrator swaps.
+
+    The active group is drained while its model is resident. We only switch when:
+    - the active group has no pending work, or
+    - 'max_batch' jobs ran back-to-back and another group is waiting, or
+    - another group has waited longer than 'max_wait_seconds' (starvation bound).
+    A group's wait runs from its oldest job, or from when it last lost the model if that
+    is later: an old backlog preempts once, not on every tick.
+    """
+
+    def __init__(self, max_batch: Optional[int] = None, max_wait_seconds: Optional[float] = None):
+        self.max_batch = max_batch or settings.SCHEDULER_MAX_BATCH
+        self.max_wait_seconds = max_wait_seconds if max_wait_seconds is not None else settings.SCHEDULER_MAX_WAIT_SECONDS
+
+        self.active_model: Optional[ModelType] = None
+        self._batch_count = 0
+
+        # When each group was last switched away from (restarts its wait clock).
+        self._left_at: Dict[ModelType, datetime] = {}
+
+        # (created_at, model) in dispatch order, used to compute the FIFO baseline.
+        self._history: List[Tuple[datetime, ModelType]] = []
+
+    def choose_model(self, pending: Sequence[QueuedJob], now: Optional[datetime] = None) -> Optional[ModelType]:
+        """
+        Picks the model group to dispatch next. Returns None if only model-free jobs are pending.
+        """
+        now = now or datetime.now(timezone.utc)
+
+        oldest: Dict[ModelType, datetime] = {}
+        for job in pending:
+            model = job.model_type
+            if model is None:
+                continue
+            created = _as_utc(job.created_at)
+            if model not in oldest or created < oldest[model]:
+                oldest[model] = created
+
+        if not oldest:
+            return None
+
+        others = {m: t for m, t in oldest.items() if m != self.active_model}
+        if self.active_model in oldest and others:
+            waiting_since = {m: max(t, self._left_at.get(m, t)) for m, t in others.items()}
+            starved = [m for m, t in waiting_since.items() if (now - t).total_seconds() > self.max_wait_seconds]
+            if starved:
+                return self._switch_to(min(starved, key=waiting_since.get), now, reason="starvation bound")
+            if self._batch_count >= self.max_batch:
+                return self._switch_to(min(others, key=others.get), now, reason="batch limit")
+            return self.active_model
+
+        if self.active_model in oldest:
+            return self.active_model
+
+        # Active group is empty: move to the group that has waited longest.
+        return self._switch_to(min(oldest, key=oldest.get), now, reason="group drained")
+
+    def job_types_for(self, model: Optional[ModelType]) -> List[JobType]:
+        """
+        Job types eligible for dispatch while 'model' is the active group.
+        Model-free job types are always eligible.
+        """
+        model_free = [t for t in JobType if t not in JOB_MODEL_AFFINITY]
+        return [t for t, m in JOB_MODEL_AFFINITY.items() if m == model] + model_free
+
+    def record_dispatch(self, jobs: Sequence[QueuedJob]):
+        """Accounts for jobs that were actually claimed."""
+        for job in jobs:
+            if job.model_type is None:
+                continue
+            if job.model_type == self.active_model:
+                self._batch_count += 1
+            self._history.append((_as_utc(job.created_at), job.model_type))
+
+    def report(self) -> dict:
+        """
+        Swap accounting. 'fifo_swaps' is what plain created_at ordering would
+        have cost for the same set of jobs.
+        """
+        actual = self._count_swaps(m for _, m in self._history)
+        fifo = self._count_swaps(m for _, m in sorted(self._history, key=lambda h: h[0]))
+
+        per_model: Dict[str, int] = {}
+        for _, model in self._history:
+            per_model[model.value] = per_model.get(model.value, 0) + 1
+
+        return {
+            "jobs_dispatched": len(self._history),
+            "swaps": actual,
+            "fifo_swaps": fifo,
+            "swaps_avoided": fifo - actual,
+            "per_model": per_model
+        }
+
+    def _switch_to(self, model: ModelType, now: datetime, reason: str) -> ModelType:
+        if model != self.active_model:
+            logger.info(f"Scheduler: Switching group {self.active_model} -> {model} ({reason}).")
+            if self.active_model is not None:
+                self._left_at[self.active_model] = now
+            self.active_model = model
+            self._batch_count = 0
+        return model
+
+    @staticmethod
+    def _count_swaps(models) -> int:
+        swaps = 0
+        previous = None
+        for model in models:
+            if previous is not None and model != previous:
+                swaps += 1
+            previous = model
+        return swaps
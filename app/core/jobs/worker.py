@@ -0,0 +1,375 @@
+# File: app/core/jobs/worker.py
+
+import os
+import time
+import socket
+import logging
+from uuid import UUID, uuid4
+from typing import Dict, List, Optional, Sequence
+from threading import Event
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from sqlalchemy import select, update, func
+from app.core.config.settings import settings
+from app.core.database.connection import SessionLocal, engine
+from .models import JobModel
+from .types import JobType, JobStatus
+from .manager import JobManager
+from .admission import admission_report
+from .scheduler import JOB_MODEL_AFFINITY, ModelAffinityScheduler, QueuedJob
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long a full pool waits before re-checking the stop event
+STOP_CHECK_SECONDS = 0.1
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+def _init_worker_process():
+    """
+    ProcessPool initializer.
+    Forked children must not reuse the parent's pooled DB connections.
+    """
+    engine.dispose(close=False)
+
+
+def _execute_job(job_id: UUID):
+    """Module-level entry point so it can be pickled into a ProcessPool."""
+    JobManager().run_job(job_id)
+
+
+class JobWorker:
+    """
+    Long-running Queue Consumer.
+    Polls the 'jobs' table, claims PENDING rows under a time-limited lease
+    and executes them on a pool of threads or processes.
+
+    Claiming uses SELECT ... FOR UPDATE SKIP LOCKED on PostgreSQL, so any number
+    of workers (on one box or many) can drain the same queue without double-claiming.
+    SQLite has no row locks; there we fall back to a compare-and-swap UPDATE on the status.
+
+    With 'affinity' scheduling, each claim is restricted to the job types of one
+    model group (see ModelAffinityScheduler) so the resident model is reused.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        pool_mode: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None,
+        worker_id: Optional[str] = None,
+        scheduling: Optional[str] = None
+    ):
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.pool_mode = pool_mode or settings.WORKER_POOL_MODE
+        self.poll_interval = poll_interval if poll_interval is not None else settings.WORKER_POLL_INTERVAL_SECONDS
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+        if self.pool_mode not in ("thread", "process"):
+            raise ValueError(f"Unknown worker pool mode: {self.pool_mode}")
+
+        scheduling = scheduling or settings.WORKER_SCHEDULER
+        if scheduling not in ("fifo", "affinity"):
+            raise ValueError(f"Unknown worker scheduling: {scheduling}")
+        self.scheduler = ModelAffinityScheduler() if scheduling == "affinity" else None
+
+        self._manager = JobManager()
+        self._executor: Optional[Executor] = None
+        self._inflight: Dict[Future, UUID] = {}
+        self._stop = Event()
+
+    # --- Queue Operations ---
+
+    def claim_jobs(self, limit: int, job_types: Optional[Sequence[JobType]] = None) -> List[UUID]:
+        """
+        Atomically moves up to 'limit' PENDING jobs to PROCESSING under this worker's lease.
+        Returns the claimed job IDs (oldest first).
+        """
+        if limit <= 0:
+            return []
+
+        now = utc_now()
+        lease_values = {
+            "status": JobStatus.PROCESSING,
+            "worker_id": self.worker_id,
+            "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+            "started_at": now,
+            "attempts": func.coalesce(JobModel.attempts, 0) + 1
+        }
+
+        stmt = (
+            select(JobModel.id)
+            .where(JobModel.status == JobStatus.PENDING)
+            .order_by(JobModel.created_at)
+            .limit(limit)
+        )
+        if job_types:
+            stmt = stmt.where(JobModel.job_type.in_(list(job_types)))
+
+        with SessionLocal() as db:
+            if db.get_bind().dialect.name == "postgresql":
+                # Rows locked by another worker's open claim are simply skipped.
+                claimed = list(db.execute(stmt.with_for_update(skip_locked=True)).scalars())
+                if claimed:
+                    db.execute(
+                        update(JobModel)
+                        .where(JobModel.id.in_(claimed))
+                        .values(**lease_values)
+                    )
+            else:
+                # SQLite Fallback: writes are serialized by the database lock,
+                # so a status-guarded UPDATE acts as compare-and-swap.
+                claimed = []
+                for job_id in db.execute(stmt).scalars().all():
+                    result = db.execute(
+                        update(JobModel)
+                        .where(JobModel.id == job_id, JobModel.status == JobStatus.PENDING)
+                        .values(**lease_values)
+                    )
+                    if result.rowcount == 1:
+                        claimed.append(job_id)
+            db.commit()
+
+        if claimed:
+            logger.info(f"Worker {self.worker_id}: Claimed {len(claimed)} job(s).")
+        return claimed
+
+    def reclaim_expired_leases(self) -> int:
+        """
+        Returns PROCESSING jobs whose lease expired (crashed/killed worker) to PENDING.
+        Jobs that already used up JOB_MAX_ATTEMPTS are marked FAILED instead.
+        """
+        now = utc_now()
+        expired = (
+            JobModel.status == JobStatus.PROCESSING,
+            JobModel.lease_expires_at.is_not(None),
+            JobModel.lease_expires_at < now
+        )
+
+        with SessionLocal() as db:
+            failed = db.execute(
+                update(JobModel)
+                .where(*expired, JobModel.attempts >= settings.JOB_MAX_ATTEMPTS)
+                .values(
+                    status=JobStatus.FAILED,
+                    lease_expires_at=None,
+                    finished_at=now,
+                    error_message=f"Lease expired after {settings.JOB_MAX_ATTEMPTS} attempts."
+                )
+            ).rowcount
+            requeued = db.execute(
+                update(JobModel)
+                .where(*expired)
+                .values(status=JobStatus.PENDING, worker_id=None, lease_expires_at=None)
+            ).rowcount
+            db.commit()
+
+        if failed or requeued:
+            logger.warning(f"Worker {self.worker_id}: Reclaimed {requeued} expired lease(s), failed {failed}.")
+        return requeued
+
+    def renew_leases(self):
+        """Heartbeat: extends the lease of every job this worker is still running."""
+        job_ids = list(self._inflight.values())
+        if not job_ids:
+            return
+
+        with SessionLocal() as db:
+            db.execute(
+                update(JobModel)
+                .where(
+                    JobModel.id.in_(job_ids),
+                    JobModel.worker_id == self.worker_id,
+                    JobModel.status == JobStatus.PROCESSING
+                )
+                .values(lease_expires_at=utc_now() + timedelta(seconds=self.lease_seconds))
+            )
+            db.commit()
+
+    # --- Execution Loop ---
+
+    def run_forever(self, stop_event: Optional[Event] = None):
+        """
+        Main service loop. Runs until stop() is called (or 'stop_event' is set).
+        A passed 'stop_event' replaces the worker's own, so both interrupt waiting.
+        """
+        if stop_event is not None:
+            self._stop = stop_event
+        stop_event = self._stop
+        logger.info(
+            f"Worker {self.worker_id} started "
+            f"({self.concurrency} {self.pool_mode}s, lease {self.lease_seconds}s)."
+        )
+        try:
+            while not stop_event.is_set():
+                claimed = self._tick()
+                if not claimed:
+                    self._wait_for_slot(self.poll_interval)
+        finally:
+            self._shutdown()
+
+    def drain(self) -> int:
+        """
+        Processes jobs until the queue is empty and nothing is in flight (or stop() is called).
+        Returns the number of jobs executed. Useful for batch runs and tests.
+        Pending jobs it cannot claim (e.g. locked by another worker) are retried every poll interval.
+        """
+        executed = 0
+        try:
+            while not self._stop.is_set():
+                claimed = self._tick()
+                executed += claimed
+                if not self._inflight and not self._has_pending_jobs():
+                    break
+                if not claimed:
+                    self._wait_for_slot(self.poll_interval)
+            return executed
+        finally:
+            self._shutdown()
+
+    def stop(self):
+        self._stop.set()
+
+    def _tick(self) -> int:
+        """One scheduling round: reap, heartbeat, fill free slots."""
+        self._collect_finished()
+        self.reclaim_expired_leases()
+        self.renew_leases()
+
+        free_slots = self.concurrency - len(self._inflight)
+        job_ids = self._select_jobs(free_slots)
+
+        executor = self._get_executor()
+        for job_id in job_ids:
+            self._inflight[executor.submit(_execute_job, job_id)] = job_id
+
+        if job_ids:
+            self._prefetch_next()
+        return len(job_ids)
+
+    def _prefetch_next(self):
+        """
+        Warms the model for the next queued job while the current ones run.
+        Only meaningful in thread mode, where jobs share this process's ModelOrchestrator.
+        """
+        if not settings.MODEL_PREFETCH_ENABLED or self.pool_mode != "thread":
+            return
+
+        with SessionLocal() as db:
+            upcoming = db.execute(
+                select(JobModel.job_type, JobModel.payload)
+                .where(JobModel.status == JobStatus.PENDING)
+                .order_by(JobModel.created_at)
+                .limit(settings.SCHEDULER_LOOKAHEAD)
+            ).all()
+
+        candidates = [row for row in upcoming if row.job_type in JOB_MODEL_AFFINITY]
+        if not candidates:
+            return
+
+        # Prefer the scheduler's active group; once it is drained, warm the group that runs next.
+        active = self.scheduler.active_model if self.scheduler is not None else None
+        target = next((row for row in candidates if JOB_MODEL_AFFINITY[row.job_type] == active), candidates[0])
+
+        try:
+            self._manager.prefetch_model(target.job_type, target.payload)
+        except Exception as e:
+            logger.warning(f"Worker {self.worker_id}: Prefetch for {target.job_type} failed: {e}")
+
+    def _select_jobs(self, free_slots: int) -> List[UUID]:
+        """Claims the next jobs, FIFO or restricted to the scheduler's active model group."""
+        if self.scheduler is None or free_slots <= 0:
+            return self.claim_jobs(free_slots)
+
+        pending = self._snapshot_pending()
+        model = self.scheduler.choose_model(list(pending.values()))
+        claimed = self.claim_jobs(free_slots, job_types=self.scheduler.job_types_for(model))
+        self.scheduler.record_dispatch([pending[job_id] for job_id in claimed if job_id in pending])
+        return claimed
+
+    def _snapshot_pending(self) -> Dict[UUID, QueuedJob]:
+        """The oldest SCHEDULER_LOOKAHEAD pending jobs, as scheduler input."""
+        with SessionLocal() as db:
+            rows = db.execute(
+                select(JobModel.id, JobModel.job_type, JobModel.created_at)
+                .where(JobModel.status == JobStatus.PENDING)
+                .order_by(JobModel.created_at)
+                .limit(settings.SCHEDULER_LOOKAHEAD)
+            ).all()
+        return {row.id: QueuedJob(job_type=row.job_type, created_at=row.created_at) for row in rows}
+
+    def _has_pending_jobs(self) -> bool:
+        with SessionLocal() as db:
+            return db.execute(
+                select(JobModel.id).where(JobModel.status == JobStatus.PENDING).limit(1)
+            ).first() is not None
+
+    def _wait_for_slot(self, timeout: float):
+        """Sleeps until a job finishes, 'timeout' passes or the worker is stopped."""
+        deadline = time.monotonic() + timeout
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if not self._inflight:
+                self._stop.wait(remaining)
+                continue
+            # Futures cannot wait on the event: wake up regularly to check it
+            done, _ = wait(list(self._inflight), timeout=min(remaining, STOP_CHECK_SECONDS), return_when=FIRST_COMPLETED)
+            if done:
+                break
+        self._collect_finished()
+
+    def _collect_finished(self):
+        for future in [f for f in self._inflight if f.done()]:
+            job_id = self._inflight.pop(future)
+            error = future.exception()
+            if error:
+                # run_job records its own failures; this is a crashed pool slot.
+                logger.error(f"Worker {self.worker_id}: Job {job_id} crashed the pool slot: {error}")
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool_mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.concurrency,
+                    initializer=_init_worker_process
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.concurrency,
+                    thread_name_prefix="onyx-job"
+                )
+        return self._executor
+
+    def _shutdown(self):
+        # Keep heartbeating until in-flight jobs finish: an expired lease would be
+        # reclaimed by another worker and the job would run twice.
+        while self._inflight:
+            wait(list(self._inflight), timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+            self._collect_finished()
+            self.renew_leases()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._collect_finished()
+        if self.scheduler is not None:
+            logger.info(f"Worker {self.worker_id}: Scheduler report {self.scheduler.report()}")
+        if settings.ADMISSION_GATE_ENABLED:
+            with SessionLocal() as db:
+                logger.info(f"Worker {self.worker_id}: Admission report {admission_report(db)}")
+        logger.info(f"Worker {self.worker_id} stopped.")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    worker = JobWorker()
+    try:
+        worker.run_forever()
+    except KeyboardInterrupt:
+        worker.stop()
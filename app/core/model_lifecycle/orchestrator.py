@@ -1,72 +1,527 @@
 # File: app/core/model_lifecycle/orchestrator.py
 
 import gc
+import time
 import torch
 import logging
-from threading import Lock
-from .types import ModelType
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Condition, Event, Lock, Thread
+from typing import Any, Dict, Iterator, List, Optional
+from app.core.config.settings import settings
+from .types import ModelType, ModelKey, MODEL_SIZE_ESTIMATES, model_key
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class _ResidentModel:
+    """Bookkeeping for one loaded model."""
+    model: Any
+    size_bytes: int
+    measured: bool
+    leases: int = 0
+    loaded_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _HostModel:
+    """A swapped-out torch module parked in (pinned) host RAM, ready for a cheap .to(device)."""
+    model: Any
+    size_bytes: int
+    device: torch.device
+    parked_at: float = field(default_factory=time.monotonic)
+
+
 class ModelOrchestrator:
     """
     Singleton Resource Manager.
-    Ensures only one 'Heavy' AI model is loaded in VRAM at a time.
+    Decides which 'Heavy' AI models stay resident in memory.
+
+    Modes (settings.MODEL_RESIDENCY_MODE):
+    - 'single': Only one heavy model at a time (small-VRAM GPUs).
+    - 'budget': Several models stay resident while their combined size fits
+                MODEL_MEMORY_BUDGET_BYTES. The least recently used model is evicted first.
+
+    Models are used through lease() which pins them while inference runs.
+    Any number of threads may lease the same resident model; a model with
+    active leases is never evicted, so a swap waits until its leases drain.
+    An optional 'variant' (e.g. the Whisper size) makes each build its own resident.
+
+    Warm Tier: Evicted torch modules are moved to host RAM (pinned when CUDA is
+    available) instead of being destroyed, within MODEL_HOST_CACHE_BYTES (LRU).
+    The next request restores them with .to(device) rather than reloading from disk.
+
+    Idle Reaper: Models unused for MODEL_IDLE_TIMEOUT_SECONDS are dropped entirely
+    (both tiers). prefetch() lets the job system warm the next model in the background.
     """
     _instance = None
     _lock = Lock()
-    
+    _cond = Condition(_lock)
+
     def __new__(cls):
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super(ModelOrchestrator, cls).__new__(cls)
-                cls._instance._current_type = None
-                cls._instance._loaded_model = None
+                cls._instance._resident = OrderedDict()  # LRU order: oldest first
+                cls._instance._measured_sizes = {}
+                cls._instance._size_estimates = dict(MODEL_SIZE_ESTIMATES)
+                cls._instance._mode = settings.MODEL_RESIDENCY_MODE
+                cls._instance._budget_bytes = settings.MODEL_MEMORY_BUDGET_BYTES
+                cls._instance._loading = set()
+                cls._instance._external_bytes = 0  # Copies loaded outside (see reserve_external)
+                cls._instance._prefetching = set()
+                cls._instance._lease_stats = {}
+                cls._instance._host_cache = OrderedDict()  # LRU order: oldest first
+                cls._instance._host_budget_bytes = settings.MODEL_HOST_CACHE_BYTES
+                cls._instance._load_stats = {}
+                cls._instance._idle_timeout = settings.MODEL_IDLE_TIMEOUT_SECONDS
+                cls._instance._reaper = None
+                cls._instance._reaper_stop = Event()
         return cls._instance
 
-    def request_model(self, model_type: ModelType, loader_func):
+    def configure(
+        self,
+        mode: Optional[str] = None,
+        budget_bytes: Optional[int] = None,
+        size_estimates: Optional[Dict[ModelType, int]] = None,
+        host_budget_bytes: Optional[int] = None,
+        idle_timeout_seconds: Optional[float] = None
+    ):
+        """Runtime override of the residency policy. Evicts immediately if the new policy is tighter."""
+        with self._lock:
+            if size_estimates is not None:
+                self._size_estimates.update(size_estimates)
+            if mode is not None:
+                if mode not in ("single", "budget"):
+                    raise ValueError(f"Unknown residency mode: {mode}")
+                self._mode = mode
+            if budget_bytes is not None:
+                self._budget_bytes = budget_bytes
+            if host_budget_bytes is not None:
+                self._host_budget_bytes = host_budget_bytes
+                self._trim_host_cache(0)
+            if idle_timeout_seconds is not None:
+                self._idle_timeout = idle_timeout_seconds
+            self._evict(self._over_policy())
+
+    @contextmanager
+    def lease(self, model_type: ModelType, loader_func, timeout: Optional[float] = None,
+              variant: Optional[str] = None) -> Iterator[Any]:
         """
-        Request usage of a model. If it's not loaded, unload current and load requested.
-        
+        Pins a model for the duration of the 'with' block.
+
+            with orchestrator.lease(ModelType.WHISPER, loader) as model:
+                model.transcribe(...)
+
         Args:
             model_type: The enum identifier for the model.
             loader_func: A lambda/function that returns the loaded model object.
                          Only called if the model needs to be loaded.
+            timeout: Max seconds to wait for other models' leases to drain before a swap.
+                     Defaults to settings.MODEL_LEASE_TIMEOUT_SECONDS.
+            variant: Distinguishes builds of the same model type (e.g. 'base' vs 'large-v3').
+
+        Raises:
+            TimeoutError: If room for the model could not be made in time.
+        """
+        key = model_key(model_type, variant)
+        requested_at = time.monotonic()
+        model = self._acquire(key, loader_func, timeout)
+        acquired_at = time.monotonic()
+        try:
+            yield model
+        finally:
+            self._release(key, wait_seconds=acquired_at - requested_at, hold_seconds=time.monotonic() - acquired_at)
+
+    @contextmanager
+    def reserve_external(self, model_type: ModelType, copies: int, variant: Optional[str] = None) -> Iterator[int]:
         """
+        Accounts for copies of a model loaded outside the orchestrator (e.g. one per worker
+        process) for the duration of the 'with' block.
+
+            with orchestrator.reserve_external(ModelType.WHISPER, 4, variant="base") as granted:
+                ...  # Start at most 'granted' workers
+
+        Grants as many of 'copies' as fit the budget next to the resident models
+        (possibly 0); resident models and loads see the reservation as used memory.
+        """
+        key = model_key(model_type, variant)
         with self._lock:
-            # 1. Already loaded? Return immediately.
-            if self._current_type == model_type and self._loaded_model is not None:
-                return self._loaded_model
+            size = self._expected_size(key)
+            free = self._budget_bytes - self._used_bytes()
+            granted = max(0, min(copies, free // size)) if size else copies
+            self._external_bytes += granted * size
+        try:
+            yield granted
+        finally:
+            with self._lock:
+                self._external_bytes -= granted * size
+                self._cond.notify_all()
 
-            # 2. Unload different model if exists
-            if self._loaded_model is not None:
-                self._unload()
+    def request_model(self, model_type: ModelType, loader_func):
+        """
+        Request usage of a model without pinning it.
+        NOTE: The model may be evicted as soon as this returns. Prefer lease().
+        """
+        with self.lease(model_type, loader_func) as model:
+            return model
 
-            # 3. Load new model
-            logger.info(f"Orchestrator: Loading {model_type} into VRAM...")
+    def prefetch(self, model_type: ModelType, loader_func, variant: Optional[str] = None) -> bool:
+        """
+        Loads a model in the background so the next job doesn't wait for a cold start.
+        Returns False if the model is already resident or being loaded.
+
+        The prefetch takes a regular lease, so it never evicts a model that is in use:
+        in 'single' mode it waits for the current job to release its model first.
+        """
+        key = model_key(model_type, variant)
+        with self._lock:
+            if key in self._resident or key in self._loading or key in self._prefetching:
+                return False
+            self._prefetching.add(key)
+
+        def _warm():
             try:
-                self._loaded_model = loader_func()
-                self._current_type = model_type
-                return self._loaded_model
+                with self.lease(model_type, loader_func, variant=variant):
+                    pass
+                logger.info(f"Orchestrator: Prefetched {key}.")
             except Exception as e:
-                logger.error(f"Failed to load {model_type}: {e}")
-                raise e
-
-    def _unload(self):
-        """Forcefully removes the current model from VRAM."""
-        if self._current_type:
-            logger.info(f"Orchestrator: Unloading {self._current_type}...")
-        
-        # Delete reference
-        del self._loaded_model
-        self._loaded_model = None
-        self._current_type = None
-        
-        # Force GC and CUDA clear
+                logger.warning(f"Orchestrator: Prefetch of {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._prefetching.discard(key)
+
+        Thread(target=_warm, name=f"onyx-prefetch-{key.value}", daemon=True).start()
+        return True
+
+    def evict_idle(self, idle_seconds: Optional[float] = None) -> List[ModelKey]:
+        """
+        Drops (without parking in the host tier) every unleased model unused for 'idle_seconds',
+        and host-tier entries parked for that long. Returns the dropped model types.
+        """
+        idle_seconds = self._idle_timeout if idle_seconds is None else idle_seconds
+        cutoff = time.monotonic() - idle_seconds
+
+        with self._lock:
+            idle = [t for t, e in self._resident.items() if e.leases == 0 and e.last_used <= cutoff]
+            for model_type in idle:
+                logger.info(f"Orchestrator: Unloading idle {model_type}...")
+                del self._resident[model_type]
+
+            stale = [t for t, h in self._host_cache.items() if h.parked_at <= cutoff]
+            for model_type in stale:
+                logger.info(f"Orchestrator: Dropping idle {model_type} from host RAM.")
+                del self._host_cache[model_type]
+
+            if idle or stale:
+                gc.collect()
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
+        return idle + stale
+
+    def unload_all(self):
+        """Evicts every resident model that is not currently leased (e.g. before a maintenance task)."""
+        with self._lock:
+            self._evict([t for t, e in self._resident.items() if e.leases == 0])
+
+    def clear_host_cache(self):
+        """Drops every model parked in the warm host tier."""
+        with self._lock:
+            self._host_cache.clear()
+            gc.collect()
+
+    def get_host_cached_models(self) -> List[ModelKey]:
+        """Models parked in the warm host tier, least recently used first."""
+        return list(self._host_cache)
+
+    def get_load_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-model cold (disk) load vs. warm (host RAM) restore timings,
+        to see what the host tier saves.
+        """
+        with self._lock:
+            return {t.value: dict(stats) for t, stats in self._load_stats.items()}
+
+    def get_current_model_type(self):
+        """The most recently used resident model (None if nothing is loaded)."""
+        return next(reversed(self._resident), None)
+
+    def get_resident_models(self) -> List[ModelKey]:
+        """Resident models, least recently used first."""
+        return list(self._resident)
+
+    def get_memory_usage(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self._mode,
+                "budget_bytes": self._budget_bytes,
+                "used_bytes": self._used_bytes(),
+                "models": {
+                    t.value: {"size_bytes": e.size_bytes, "measured": e.measured}
+                    for t, e in self._resident.items()
+                }
+            }
+
+    def get_lease_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-model lease statistics: how long callers waited for a model
+        (load + swap drain) and how long they held it (inference).
+        """
+        with self._lock:
+            metrics = {}
+            for model_type, stats in self._lease_stats.items():
+                count = stats["leases"] or 1
+                metrics[model_type.value] = {
+                    **stats,
+                    "wait_avg_seconds": stats["wait_total_seconds"] / count,
+                    "hold_avg_seconds": stats["hold_total_seconds"] / count,
+                    "active_leases": self._resident[model_type].leases if model_type in self._resident else 0
+                }
+            return metrics
+
+    # --- Lease Lifecycle ---
+
+    def _acquire(self, model_type: ModelKey, loader_func, timeout: Optional[float]):
+        timeout = settings.MODEL_LEASE_TIMEOUT_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        self._ensure_idle_reaper()
+
+        with self._cond:
+            while True:
+                # 1. Already loaded? Share it.
+                entry = self._resident.get(model_type)
+                if entry is not None:
+                    entry.leases += 1
+                    self._touch(model_type)
+                    return entry.model
+
+                # 2. Another thread is loading it (or, in single mode, loading anything).
+                if model_type in self._loading or (self._mode == "single" and self._loading):
+                    self._wait(model_type, deadline, "a model load to finish")
+                    continue
+
+                # 3. Make room. Leased victims can't go yet: wait for their leases to drain.
+                victims = self._victims_for(model_type)
+                busy = [v for v in victims if self._resident[v].leases > 0]
+                if busy:
+                    self._wait(model_type, deadline, f"leases on {[b.value for b in busy]} to drain")
+                    continue
+
+                self._evict(victims)
+                self._loading.add(model_type)
+                parked = self._host_cache.pop(model_type, None)
+                break
+
+        # 4. Load outside the lock so leases on other resident models keep flowing.
+        #    A model parked in the host tier only needs a device transfer.
+        started = time.monotonic()
+        try:
+            if parked is not None:
+                logger.info(f"Orchestrator: Restoring {model_type} from host RAM to {parked.device}...")
+                model = parked.model.to(parked.device)
+                source = "host_restore"
+            else:
+                logger.info(f"Orchestrator: Loading {model_type} ({self._mode} mode)...")
+                model = loader_func()
+                source = "disk_load"
+        except Exception as e:
+            logger.error(f"Failed to load {model_type}: {e}")
+            with self._cond:
+                self._loading.discard(model_type)
+                self._cond.notify_all()
+            raise e
+
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self._loading.discard(model_type)
+            self._record_load(model_type, source, elapsed)
+            self._register(model_type, model)
+            self._resident[model_type].leases = 1
+
+            # 5. The measured size may exceed the estimate we made room for
+            self._evict([t for t in self._over_policy() if t != model_type])
+            self._cond.notify_all()
+        return model
+
+    def _release(self, model_type: ModelKey, wait_seconds: float, hold_seconds: float):
+        with self._cond:
+            entry = self._resident.get(model_type)
+            if entry is not None:
+                entry.leases -= 1
+                # Idle time runs from the end of the last lease, not its start
+                entry.last_used = time.monotonic()
+
+            stats = self._stats_for(model_type)
+            stats["leases"] += 1
+            stats["wait_total_seconds"] += wait_seconds
+            stats["wait_max_seconds"] = max(stats["wait_max_seconds"], wait_seconds)
+            stats["hold_total_seconds"] += hold_seconds
+            stats["hold_max_seconds"] = max(stats["hold_max_seconds"], hold_seconds)
+
+            self._cond.notify_all()
+
+    def _wait(self, model_type: ModelKey, deadline: float, reason: str):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            stats = self._stats_for(model_type)
+            stats["timeouts"] += 1
+            raise TimeoutError(f"Orchestrator: Timed out waiting for {reason} (requested {model_type}).")
+        self._cond.wait(remaining)
+
+    def _ensure_idle_reaper(self):
+        """Starts the background idle-eviction thread on first use (if enabled)."""
+        if self._idle_timeout <= 0 or (self._reaper is not None and self._reaper.is_alive()):
+            return
+
+        def _reap():
+            interval = max(1.0, min(60.0, self._idle_timeout / 4))
+            while not self._reaper_stop.wait(interval):
+                if self._idle_timeout > 0:
+                    self.evict_idle()
+
+        with self._lock:
+            if self._reaper is None or not self._reaper.is_alive():
+                self._reaper = Thread(target=_reap, name="onyx-model-reaper", daemon=True)
+                self._reaper.start()
+
+    # --- Internals (call with self._lock held) ---
+
+    def _stats_for(self, model_type: ModelKey) -> Dict[str, float]:
+        return self._lease_stats.setdefault(model_type, {
+            "leases": 0,
+            "timeouts": 0,
+            "wait_total_seconds": 0.0,
+            "wait_max_seconds": 0.0,
+            "hold_total_seconds": 0.0,
+            "hold_max_seconds": 0.0
+        })
+
+    def _record_load(self, model_type: ModelKey, source: str, seconds: float):
+        stats = self._load_stats.setdefault(model_type, {
+            "disk_loads": 0,
+            "disk_load_total_seconds": 0.0,
+            "host_restores": 0,
+            "host_restore_total_seconds": 0.0
+        })
+        stats[f"{source}s"] += 1
+        stats[f"{source}_total_seconds"] += seconds
+
+    def _touch(self, model_type: ModelKey):
+        self._resident.move_to_end(model_type)
+        self._resident[model_type].last_used = time.monotonic()
+
+    def _register(self, model_type: ModelKey, model):
+        measured = self._measure_bytes(model)
+        if measured:
+            self._measured_sizes[model_type] = measured
+        self._resident[model_type] = _ResidentModel(
+            model=model,
+            size_bytes=measured or self._expected_size(model_type),
+            measured=bool(measured)
+        )
+
+    def _expected_size(self, model_type: ModelKey) -> int:
+        # Variants fall back to their model type's estimate until measured
+        base_type = getattr(model_type, "model_type", model_type)
+        return self._measured_sizes.get(model_type, self._size_estimates.get(base_type, 0))
+
+    def _used_bytes(self) -> int:
+        # In-flight loads count against the budget with their expected size.
+        resident = sum(e.size_bytes for e in self._resident.values())
+        return resident + self._external_bytes + sum(self._expected_size(t) for t in self._loading)
+
+    def _victims_for(self, incoming: ModelKey) -> List[ModelKey]:
+        """LRU-ordered models that must go before 'incoming' can be loaded."""
+        if self._mode == "single":
+            return list(self._resident)
+
+        victims = []
+        needed = self._expected_size(incoming)
+        used = self._used_bytes()
+        for model_type, entry in self._resident.items():
+            if used + needed <= self._budget_bytes:
+                break
+            victims.append(model_type)
+            used -= entry.size_bytes
+
+        if needed > self._budget_bytes:
+            logger.warning(
+                f"Orchestrator: {incoming} (~{needed} bytes) exceeds the memory budget "
+                f"({self._budget_bytes} bytes). Loading it alone."
+            )
+        return victims
+
+    def _over_policy(self) -> List[ModelKey]:
+        """LRU-ordered models that must go for the current state to satisfy the policy."""
+        types = list(self._resident)
+        if self._mode == "single":
+            return [t for t in types[:-1] if self._resident[t].leases == 0]
+
+        victims = []
+        used = self._used_bytes()
+        for model_type in types[:-1]:  # Never evict the most recently used model
+            if used <= self._budget_bytes:
+                break
+            if self._resident[model_type].leases > 0:
+                continue
+            victims.append(model_type)
+            used -= self._resident[model_type].size_bytes
+        return victims
+
+    def _evict(self, model_types: List[ModelKey]):
+        """Removes models from the accelerator, parking torch modules in the host tier when they fit."""
+        if not model_types:
+            return
+
+        for model_type in model_types:
+            entry = self._resident.pop(model_type)
+            if self._park_in_host(model_type, entry):
+                logger.info(f"Orchestrator: Offloaded {model_type} to host RAM.")
+            else:
+                logger.info(f"Orchestrator: Unloading {model_type}...")
+            del entry
+
+        # Force GC and CUDA clear (once per batch of evictions)
         gc.collect()
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
-            
-    def get_current_model_type(self):
-        """Helper for testing state."""
-        return self._current_type
\ No newline at end of file
+
+    def _park_in_host(self, model_type: ModelKey, entry: _ResidentModel) -> bool:
+        if not isinstance(entry.model, torch.nn.Module) or entry.size_bytes > self._host_budget_bytes:
+            return False
+
+        self._trim_host_cache(entry.size_bytes)
+        device = self._device_of(entry.model)
+        model = entry.model.to("cpu")
+        if settings.MODEL_HOST_PIN_MEMORY and torch.cuda.is_available():
+            # Page-locked memory makes the host -> GPU copy on restore much faster
+            for tensor in list(model.parameters()) + list(model.buffers()):
+                tensor.data = tensor.data.pin_memory()
+
+        self._host_cache[model_type] = _HostModel(model=model, size_bytes=entry.size_bytes, device=device)
+        return True
+
+    def _trim_host_cache(self, incoming_bytes: int):
+        """LRU eviction for the host tier."""
+        used = sum(h.size_bytes for h in self._host_cache.values())
+        while self._host_cache and used + incoming_bytes > self._host_budget_bytes:
+            model_type, dropped = self._host_cache.popitem(last=False)
+            used -= dropped.size_bytes
+            logger.info(f"Orchestrator: Dropping {model_type} from host RAM.")
+
+    @staticmethod
+    def _device_of(model: torch.nn.Module) -> torch.device:
+        for tensor in model.parameters():
+            return tensor.device
+        return torch.device("cpu")
+
+    @staticmethod
+    def _measure_bytes(model) -> Optional[int]:
+        """Parameter + buffer footprint for torch modules; None if the model can't be measured."""
+        if not isinstance(model, torch.nn.Module):
+            return None
+        tensors = list(model.parameters()) + list(model.buffers())
+        return sum(t.numel() * t.element_size() for t in tensors) or None
@@ -1,9 +1,45 @@
 # File: app/core/model_lifecycle/types.py
 
 from enum import Enum
+from dataclasses import dataclass
+from typing import Optional, Union
 
 class ModelType(str, Enum):
     WHISPER = "whisper"
     NEMO_VAD = "nemo_vad"
     NEMO_DIARIZATION = "nemo_diarization"
-    QWEN_VL = "qwen_vl"
\ No newline at end of file
+    QWEN_VL = "qwen_vl"
+
+
+@dataclass(frozen=True)
+class ModelVariant:
+    """
+    One build of a model type (e.g. Whisper 'base' vs 'large-v3').
+    Variants are tracked as separate residents, so two sizes can be loaded side by side.
+    """
+    model_type: ModelType
+    variant: str
+
+    @property
+    def value(self) -> str:
+        return f"{self.model_type.value}:{self.variant}"
+
+
+ModelKey = Union[ModelType, ModelVariant]
+
+
+def model_key(model_type: ModelType, variant: Optional[str] = None) -> ModelKey:
+    """Orchestrator key: the plain ModelType unless a specific variant is requested."""
+    return model_type if variant is None else ModelVariant(model_type, variant)
+
+
+GB = 1024 ** 3
+
+# Rough resident footprint (weights + runtime buffers) per model.
+# Used to make room BEFORE loading; replaced by the measured size once a model is loaded.
+MODEL_SIZE_ESTIMATES = {
+    ModelType.WHISPER: int(3.2 * GB),          # large-v3, fp32
+    ModelType.NEMO_VAD: int(0.05 * GB),        # MarbleNet is tiny
+    ModelType.NEMO_DIARIZATION: int(0.4 * GB), # TitaNet-L + clustering buffers
+    ModelType.QWEN_VL: int(8.0 * GB),
+}
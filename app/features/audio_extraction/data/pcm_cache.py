@@ -0,0 +1,180 @@
+# File: app/features/audio_extraction/data/pcm_cache.py
+import os
+import uuid
+import logging
+import numpy as np
+from pathlib import Path
+from contextlib import closing
+from threading import Lock
+from typing import Iterator, Optional, Tuple
+from app.core.config.settings import settings
+from .pcm_decoder import FFmpegPcmDecoder, SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+
+class PcmCache:
+    """
+    Disk cache of decoded 16 kHz mono float32 PCM, one raw file per file_hash.
+
+    Files are opened with numpy.memmap, so VAD, diarization and transcription
+    (and every worker process) share the same pages through the OS page cache
+    instead of each decoding the MP3 again.
+    Size-bounded; least recently used files (by mtime) are evicted first.
+    """
+
+    # Counters are per process and shared by all instances
+    _lock = Lock()
+    _stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None, decoder: Optional[FFmpegPcmDecoder] = None):
+        self.cache_dir = Path(cache_dir or settings.PCM_CACHE_DIR)
+        self.max_bytes = settings.PCM_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.decoder = decoder or FFmpegPcmDecoder()
+
+    def path_for(self, file_hash: str) -> Path:
+        return self.cache_dir / f"{file_hash}.f32"
+
+    def open(self, file_hash: str, source_path: str) -> np.ndarray:
+        """
+        Read-only memory map of the decoded audio; decodes and stores it on a miss.
+        """
+        path = self.path_for(file_hash)
+        if path.exists():
+            try:
+                samples = self._map(path)
+                os.utime(path)  # Bump LRU recency
+                self._count("hits")
+                return samples
+            except FileNotFoundError:
+                pass  # Evicted by another worker in between
+
+        self._count("misses")
+        self._materialize(source_path, path)
+        self.evict(keep=path)
+        return self._map(path)
+
+    def stream(self, file_hash: str, source_path: str, window_seconds: float, overlap_seconds: float = 0.0,
+               start: float = 0.0) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Same windows as FFmpegPcmDecoder.iter_windows. A hit serves slices of the memory map;
+        a miss streams the FFmpeg pipe and fills the cache in the same pass, so memory stays
+        at one window either way. The entry is only published once the whole file went through:
+        a run stopped early (or resumed at 'start' > 0) leaves the cache untouched.
+        """
+        path = self.path_for(file_hash)
+        cached = None
+        if path.exists():
+            try:
+                cached = self._map(path)
+                os.utime(path)  # Bump LRU recency
+            except FileNotFoundError:
+                pass  # Evicted by another worker in between
+        if cached is not None:
+            self._count("hits")
+            yield from iter_array_windows(cached, window_seconds, overlap_seconds, start=start)
+            return
+
+        self._count("misses")
+        windows = self.decoder.iter_windows(source_path, window_seconds, overlap_seconds, start)
+        if start > 0:
+            # The pipe starts mid-file: nothing complete to store
+            with closing(windows):
+                yield from windows
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            with closing(windows), open(tmp_path, "wb") as out:
+                written = 0  # Samples on disk; windows overlap, so only their new tail is appended
+                for offset, samples in windows:
+                    first = int(round(offset * SAMPLE_RATE))
+                    out.write(memoryview(samples[written - first:]).cast("B"))
+                    written = first + samples.size
+                    yield offset, samples
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Deletes least recently used entries until the cache fits in max_bytes.
+        Open memory maps stay valid: unlinked files live until they are unmapped.
+        """
+        entries = []
+        for entry in self.cache_dir.glob("*.f32"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            entry.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        if evicted:
+            self._count("evictions", evicted)
+            logger.info(f"PCM cache: Evicted {evicted} file(s), {total / 1024 ** 2:.0f} MB remain.")
+        return evicted
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        with cls._lock:
+            stats = dict(cls._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _materialize(self, source_path: str, path: Path):
+        # Decode into a private temp file, then rename atomically so
+        # concurrent workers never map a half-written file.
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        logger.info(f"PCM cache: Decoding {source_path}...")
+        try:
+            self.decoder.decode_to_file(source_path, str(tmp_path))
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _map(path: Path) -> np.ndarray:
+        if path.stat().st_size == 0:
+            return np.zeros(0, dtype=np.float32)  # mmap refuses empty files
+        return np.memmap(path, dtype=np.float32, mode="r")
+
+    @classmethod
+    def _count(cls, key: str, amount: int = 1):
+        with cls._lock:
+            cls._stats[key] += amount
+
+
+def iter_array_windows(samples: np.ndarray, window_seconds: float, overlap_seconds: float = 0.0,
+                       sample_rate: int = SAMPLE_RATE, start: float = 0.0) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Same windows as FFmpegPcmDecoder.iter_windows, as zero-copy slices of an in-memory or mapped array.
+    """
+    window = int(window_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    if window <= 0 or not 0 <= overlap < window:
+        raise ValueError("Window must be positive and longer than the overlap.")
+
+    offset = int(start * sample_rate)
+    while True:
+        chunk = samples[offset:offset + window]
+        if chunk.size == 0:
+            break
+        yield offset / sample_rate, chunk
+        if offset + window >= samples.size:
+            break
+        offset += window - overlap
@@ -0,0 +1,152 @@
+# File: app/features/audio_extraction/data/pcm_decoder.py
+import subprocess
+import logging
+import numpy as np
+from typing import Iterator, Optional, Tuple
+from app.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# All ASR/VAD/Diarization models in Onyx consume 16 kHz mono float32.
+SAMPLE_RATE = 16000
+
+
+class FFmpegPcmDecoder:
+    """
+    Decodes any FFmpeg-readable media into 16 kHz mono float32 PCM.
+    Supports decoding a time range without touching the rest of the file.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    def build_command(self, path: str, start: float = 0.0, duration: Optional[float] = None) -> list:
+        cmd = [settings.FFMPEG_BINARY, "-nostdin", "-v", "error"]
+        if start > 0:
+            # Input seeking (-ss before -i) is fast and sample-accurate for audio
+            cmd += ["-ss", f"{start:.3f}"]
+        cmd += ["-i", str(path)]
+        if duration is not None:
+            cmd += ["-t", f"{duration:.3f}"]
+        cmd += [
+            "-vn",
+            "-ac", "1",
+            "-ar", str(self.sample_rate),
+            "-f", "f32le",
+            "-"
+        ]
+        return cmd
+
+    def decode(self, path: str, start: float = 0.0, duration: Optional[float] = None) -> np.ndarray:
+        """
+        Returns the requested range as a float32 array in [-1, 1].
+        """
+        cmd = self.build_command(path, start, duration)
+        try:
+            proc = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            logger.error(f"FFmpeg decode failed: {error_msg}")
+            raise RuntimeError(f"Audio decode failed: {error_msg}")
+
+        return np.frombuffer(proc.stdout, dtype=np.float32)
+
+    def decode_to_file(self, path: str, output_path: str):
+        """
+        Writes the whole file as raw f32le PCM to 'output_path'.
+        FFmpeg writes straight to disk, nothing is buffered in Python.
+        """
+        cmd = self.build_command(path)
+        try:
+            with open(output_path, "wb") as out:
+                subprocess.run(cmd, check=True, stdout=out, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            logger.error(f"FFmpeg decode failed: {error_msg}")
+            raise RuntimeError(f"Audio decode failed: {error_msg}")
+
+    def iter_windows(self, path: str, window_seconds: float, overlap_seconds: float = 0.0,
+                     start: float = 0.0) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        Streams the file through an FFmpeg pipe as (start_seconds, samples) windows.
+        Consecutive windows share 'overlap_seconds' of audio. Decoding begins
+        at 'start' seconds; yielded offsets stay on the file's timeline.
+
+        Memory stays at one window no matter how long the recording is:
+        the pipe is read straight into a single preallocated buffer, which is
+        reused for every window. Consumers must finish with (or copy) a window
+        before asking for the next one.
+        """
+        window = int(window_seconds * self.sample_rate)
+        overlap = int(overlap_seconds * self.sample_rate)
+        if window <= 0 or not 0 <= overlap < window:
+            raise ValueError("Window must be positive and longer than the overlap.")
+
+        buffer = np.empty(window, dtype=np.float32)
+        raw = memoryview(buffer).cast("B")
+        item = buffer.itemsize
+
+        proc = subprocess.Popen(self.build_command(path, start), stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        finished = False
+        try:
+            offset = 0      # Absolute sample index of buffer[0]
+            filled = 0      # Valid samples in the buffer
+            while True:
+                filled += self._read_into(proc.stdout, raw[filled * item:]) // item
+                if filled == 0 or (offset > 0 and filled <= overlap):
+                    break
+
+                yield start + offset / self.sample_rate, buffer[:filled]
+                if filled < window:
+                    break
+
+                # Carry the tail over as the head of the next window
+                buffer[:overlap] = buffer[window - overlap:]
+                offset += window - overlap
+                filled = overlap
+            finished = True
+        finally:
+            if not finished:
+                proc.kill()
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            proc.wait()
+
+        if proc.returncode != 0:
+            error_msg = stderr.decode() if stderr else f"exit code {proc.returncode}"
+            logger.error(f"FFmpeg stream decode failed: {error_msg}")
+            raise RuntimeError(f"Audio decode failed: {error_msg}")
+
+    @staticmethod
+    def _read_into(stream, target: memoryview) -> int:
+        """Fills 'target' from the pipe; returns bytes read (short only at EOF)."""
+        total = 0
+        while total < len(target):
+            n = stream.readinto(target[total:])
+            if not n:
+                break
+            total += n
+        return total
+
+    def probe_duration(self, path: str) -> float:
+        """
+        Container duration in seconds (via ffprobe, without decoding).
+        """
+        cmd = [
+            settings.FFPROBE_BINARY, "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            str(path)
+        ]
+        try:
+            proc = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except subprocess.CalledProcessError as e:
+            error_msg = e.stderr.decode() if e.stderr else str(e)
+            logger.error(f"FFprobe failed: {error_msg}")
+            raise RuntimeError(f"Audio probe failed: {error_msg}")
+
+        try:
+            return float(proc.stdout.decode().strip())
+        except ValueError:
+            raise RuntimeError(f"Audio probe returned no duration for {path}")
@@ -1,6 +1,11 @@
+import numpy as np
 from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from app.core.config.settings import settings
 from ..domain.models import ExtractionConfig, ExtractionResult
 from ..data.ffmpeg_adapter import FFmpegAdapter
+from ..data.pcm_decoder import FFmpegPcmDecoder, SAMPLE_RATE
+from ..data.pcm_cache import PcmCache
 
 def run_extraction(video_path: str, output_dir: str) -> ExtractionResult:
     """
@@ -10,4 +15,52 @@ def run_extraction(video_path: str, output_dir: str) -> ExtractionResult:
     adapter = FFmpegAdapter()
     config = ExtractionConfig() # Uses defaults
     
-    return adapter.extract_audio(Path(video_path), Path(output_dir), config)
\ No newline at end of file
+    return adapter.extract_audio(Path(video_path), Path(output_dir), config)
+
+def load_pcm(audio_path: str, file_hash: Optional[str] = None) -> np.ndarray:
+    """
+    Standalone API: The whole file as 16 kHz mono float32 PCM.
+    With a file_hash (and the cache enabled) this is a read-only memory map
+    of the shared decoded-audio cache; otherwise the file is decoded into memory.
+    """
+    if file_hash and settings.PCM_CACHE_ENABLED:
+        return PcmCache().open(file_hash, audio_path)
+    return FFmpegPcmDecoder().decode(audio_path)
+
+def decode_audio(audio_path: str, start: float = 0.0, duration: Optional[float] = None, file_hash: Optional[str] = None) -> np.ndarray:
+    """
+    Standalone API: Decodes (a range of) a media file to 16 kHz mono float32 PCM.
+    This is the input format every speech model in Onyx expects.
+    """
+    if file_hash and settings.PCM_CACHE_ENABLED:
+        samples = load_pcm(audio_path, file_hash)
+        first = int(start * SAMPLE_RATE)
+        last = None if duration is None else first + int(duration * SAMPLE_RATE)
+        return samples[first:last]
+    return FFmpegPcmDecoder().decode(audio_path, start, duration)
+
+
+def stream_audio(audio_path: str, window_seconds: float, overlap_seconds: float = 0.0,
+                 file_hash: Optional[str] = None, start: float = 0.0) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Standalone API: Decodes a media file window by window with bounded memory,
+    beginning at 'start' seconds (used to resume interrupted work).
+    Yields (start_seconds, samples); the sample buffer is reused between windows.
+    Cached audio is served as slices of the memory map instead; on a cache miss
+    the pipe fills the cache while it streams.
+    """
+    if file_hash and settings.PCM_CACHE_ENABLED:
+        return PcmCache().stream(file_hash, audio_path, window_seconds, overlap_seconds, start)
+    return FFmpegPcmDecoder().iter_windows(audio_path, window_seconds, overlap_seconds, start)
+
+def probe_duration(audio_path: str) -> float:
+    """
+    Standalone API: Duration of a media file in seconds.
+    """
+    return FFmpegPcmDecoder().probe_duration(audio_path)
+
+def get_pcm_cache_stats() -> dict:
+    """
+    Standalone API: Hit/miss/eviction counters of the decoded-audio cache (this process).
+    """
+    return PcmCache.get_stats()
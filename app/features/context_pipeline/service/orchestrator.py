@@ -1,4 +1,6 @@
 import logging
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
 from typing import List
 from uuid import UUID
 from sqlalchemy.orm import joinedload
@@ -112,82 +114,53 @@ class ContextOrchestrator:
 
     def _build_sliding_windows(self, segments: List[TranscriptionSegmentModel], config: WindowConfig) -> List[
         ContextWindow]:
-        windows: List[ContextWindow] = []
+        """
+        Greedy windows of at most target_size tokens (a single larger segment gets a window
+        of its own); each new window starts with the trailing segments that fit in
+        overlap_size tokens (at least one), followed by the segment that overflowed.
 
+        Windows are index ranges over the segments. With cumulative token counts
+        (cumulative[k] = tokens of segments [0, k)) every boundary is a binary search,
+        and each window's token count is a single subtraction.
+        """
         # Pre-calculate formatted text and token counts
         # This is CRITICAL: We must count the tokens of the FINAL format, not just the raw text.
-        enriched_segments = []
-        for seg in segments:
-            formatted_text = self._format_segment(seg)
-            count = self.tokenizer.count_tokens(formatted_text)
-            enriched_segments.append((seg, count, formatted_text))
-
-        current_window_segments = []
-        current_tokens = 0
-        window_idx = 0
-
-        i = 0
-        while i < len(enriched_segments):
-            seg, tokens, fmt_text = enriched_segments[i]
-
-            # Check if adding this segment breaches the target size
-            if current_tokens + tokens > config.target_size and current_window_segments:
-                # A. Finalize current window
-                self._finalize_window(windows, current_window_segments, window_idx)
-                window_idx += 1
-
-                # B. Handle Overlap (The "10%" Logic)
-                # We look BACKWARDS to fill the overlap quota
-                overlap_buffer = []
-                overlap_tokens = 0
-                back_ptr = i - 1
-
-                while back_ptr >= 0:
-                    b_seg, b_tokens, b_fmt = enriched_segments[back_ptr]
-
-                    if overlap_tokens + b_tokens > config.overlap_size and overlap_buffer:
-                        break
-
-                    overlap_buffer.insert(0, (b_seg, b_tokens, b_fmt))
-                    overlap_tokens += b_tokens
-                    back_ptr -= 1
-
-                # C. Start new window with Overlap + Current Segment
-                current_window_segments = list(overlap_buffer)
-                current_tokens = overlap_tokens
-
-                # Add the segment that caused overflow
-                current_window_segments.append((seg, tokens, fmt_text))
-                current_tokens += tokens
-            else:
-                # Just add to current window
-                current_window_segments.append((seg, tokens, fmt_text))
-                current_tokens += tokens
-
-            i += 1
-
-        # Finalize tail
-        if current_window_segments:
-            self._finalize_window(windows, current_window_segments, window_idx)
-
-        return windows
+        formatted = [self._format_segment(seg) for seg in segments]
+        cumulative = list(accumulate((self.tokenizer.count_tokens(text) for text in formatted), initial=0))
+
+        ranges = []
+        n = len(segments)
+        start, filled = 0, 1  # The window is [start, filled) and grows from there
+        while filled <= n:
+            # First segment that would breach the target
+            overflow = bisect_right(cumulative, cumulative[start] + config.target_size, filled + 1) - 1
+            if overflow >= n:
+                ranges.append((start, n))
+                break
+            ranges.append((start, overflow))
+
+            # Overlap: the longest run of segments before the overflow within overlap_size (at least one).
+            # It may reach back past the window start.
+            start = bisect_left(cumulative, cumulative[overflow] - config.overlap_size, 0, overflow - 1)
+            filled = overflow + 1
+
+        return [
+            self._make_window(segments, formatted, cumulative, first, last, idx)
+            for idx, (first, last) in enumerate(ranges)
+        ]
 
     @staticmethod
-    def _finalize_window(windows_list, enriched_tuples, idx):
+    def _make_window(segments, formatted, cumulative, first: int, last: int, idx: int) -> ContextWindow:
         """
-        Joins the formatted strings with newlines to create the "Script".
+        Joins the formatted strings of segments [first, last) with newlines to create the "Script".
         """
-        # Join with newlines to separate speech turns cleanly
-        full_text = "\n".join([t[2] for t in enriched_tuples])
-        total_tokens = sum([t[1] for t in enriched_tuples])
-        seg_ids = [t[0].id for t in enriched_tuples]
-
-        windows_list.append(ContextWindow(
+        return ContextWindow(
             window_index=idx,
-            full_text=full_text,
-            token_count=total_tokens,
-            segment_ids=seg_ids
-        ))
+            # Join with newlines to separate speech turns cleanly
+            full_text="\n".join(formatted[first:last]),
+            token_count=cumulative[last] - cumulative[first],
+            segment_ids=[seg.id for seg in segments[first:last]]
+        )
 
     @staticmethod
     def _save_windows(db, source_id, windows: List[ContextWindow]):
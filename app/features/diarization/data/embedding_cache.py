@@ -0,0 +1,82 @@
+# File: app/features/diarization/data/embedding_cache.py
+import os
+import uuid
+import hashlib
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Optional
+from app.core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Disk cache of per-window speaker embeddings, one .npy per
+    (file_hash, embedding model, window layout).
+
+    Embedding every window is the expensive part of diarization; clustering the
+    vectors takes seconds. With the vectors cached, re-running diarization with other
+    clustering options (e.g. a num_speakers hint) never touches the model.
+    Size-bounded; least recently used files (by mtime) are evicted first.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or settings.EMBEDDING_CACHE_DIR)
+        self.max_bytes = settings.EMBEDDING_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    @staticmethod
+    def build_key(file_hash: str, model_name: str, windows: np.ndarray) -> str:
+        """The window array encodes both the speech regions and the window parameters."""
+        digest = hashlib.sha256(f"{file_hash}:{model_name}:".encode())
+        digest.update(np.ascontiguousarray(windows, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npy"
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        path = self.path_for(key)
+        try:
+            embeddings = np.load(path)
+            os.utime(path)  # Bump LRU recency
+            return embeddings
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, key: str, embeddings: np.ndarray):
+        # Write to a private temp file, then rename atomically for concurrent workers
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp.npy")
+        try:
+            np.save(tmp_path, np.asarray(embeddings, dtype=np.float32))
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        self.evict(keep=path)
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        entries = []
+        for entry in self.cache_dir.glob("*.npy"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if entry == keep:
+                continue
+            entry.unlink(missing_ok=True)
+            total -= size
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Embedding cache: Evicted {evicted} file(s), {total / 1024 ** 2:.0f} MB remain.")
+        return evicted
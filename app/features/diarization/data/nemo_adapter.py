@@ -2,64 +2,67 @@
 import logging
 import json
 import os
+import zlib
 import torch
-from typing import List
+import numpy as np
+from functools import partial
+from typing import List, Optional
 from app.core.config.settings import settings
 from app.core.model_lifecycle.orchestrator import ModelOrchestrator, ModelType
-from ..domain.models import DiarizationResult, SpeakerSegment
+from app.features.audio_extraction.service.api import load_pcm
 
 logger = logging.getLogger(__name__)
 
 class NemoDiarizationAdapter:
     """
-    Wrapper for NVIDIA NeMo Diarization.
+    Wrapper for NVIDIA NeMo speaker embeddings (TitaNet), the heavy half of diarization.
+    Windowing and clustering run on the vectors outside the model (see service/clustering.py).
     """
+    # Part of the embedding cache key: vectors of different models are not comparable
+    model_name = "titanet_large"
+
     def __init__(self):
         self.orchestrator = ModelOrchestrator()
         self.device = settings.WHISPER_DEVICE # Share GPU config
 
-    def run_inference(self, audio_path: str, num_speakers: int = None) -> DiarizationResult:
-        logger.info(f"Requesting NeMo Diarization for {audio_path}...")
-
+    def model_loader(self):
+        """Loader callable for the ModelOrchestrator (also used for prefetching)."""
         def loader():
-            logger.debug("Loading NeMo SpeakerDiarizer into VRAM...")
+            logger.debug("Loading NeMo speaker embedding model into VRAM...")
             # Real implementation imports:
-            # from nemo.collections.asr.models import ClusteringDiarizer
-            # return ClusteringDiarizer(cfg=...)
-            
+            # from nemo.collections.asr.models import EncDecSpeakerLabelModel
+            # return EncDecSpeakerLabelModel.from_pretrained("titanet_large")
+
             # For this architecture implementation, we simulate the Heavy Model
             # to prove the Orchestrator works.
             class MockNemo:
-                def diarize(self, path, count):
-                    # Simulate output
-                    return [
-                        {"start": 0.0, "end": 2.0, "label": "speaker_0"},
-                        {"start": 2.0, "end": 4.5, "label": "speaker_1"},
-                        {"start": 4.5, "end": 6.0, "label": "speaker_0"}
-                    ]
+                # Simulated conversation: (start, end, voice)
+                TIMELINE = [(0.0, 2.0, 0), (2.0, 4.5, 1), (4.5, 6.0, 0)]
+
+                def embed(self, audio, windows):
+                    # 'audio()' returns the 16 kHz PCM; the mock doesn't need it.
+                    # Real: one 192-d TitaNet embedding per window.
+                    # Simulated: the voice talking at the window center, plus a little noise.
+                    rng = np.random.default_rng(0)
+                    vectors = []
+                    for start, end in windows:
+                        center = (start + end) / 2
+                        voice = next((v for s, e, v in self.TIMELINE if s <= center < e), 0)
+                        base = np.random.default_rng(zlib.crc32(f"voice_{voice}".encode())).standard_normal(192)
+                        vectors.append(base + rng.normal(0, 0.1, 192))
+                    return np.array(vectors, dtype=np.float32).reshape(-1, 192)
             return MockNemo()
+        return loader
+
+    def embed_windows(self, audio_path: str, windows: np.ndarray, file_hash: Optional[str] = None) -> np.ndarray:
+        """
+        One speaker embedding per (start, end) window, shape (n, d).
+        """
+        logger.info(f"Requesting NeMo speaker embeddings for {len(windows)} window(s) of {audio_path}...")
 
-        # Request Lock
-        model = self.orchestrator.request_model(ModelType.NEMO_DIARIZATION, loader)
-        
-        # Run
-        raw_segments = model.diarize(audio_path, num_speakers)
-        
-        # Parse
-        domain_segments = []
-        unique_labels = set()
-        for seg in raw_segments:
-            label = seg["label"]
-            unique_labels.add(label)
-            domain_segments.append(SpeakerSegment(
-                start=float(seg["start"]),
-                end=float(seg["end"]),
-                speaker_label=label,
-                confidence=0.9 # Mock confidence
-            ))
+        # The model pulls PCM on demand, memory-mapped from the shared decoded-audio cache
+        audio = partial(load_pcm, audio_path, file_hash)
 
-        return DiarizationResult(
-            source_file=audio_path,
-            num_speakers=len(unique_labels),
-            segments=domain_segments
-        )
\ No newline at end of file
+        # Lease the model for the duration of inference
+        with self.orchestrator.lease(ModelType.NEMO_DIARIZATION, self.model_loader()) as model:
+            return np.asarray(model.embed(audio, windows), dtype=np.float32)
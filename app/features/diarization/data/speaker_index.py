@@ -0,0 +1,132 @@
+# File: app/features/diarization/data/speaker_index.py
+import os
+import uuid
+import logging
+import numpy as np
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from app.core.config.settings import settings
+from .sql_models import SpeakerIdentityModel
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalizes rows, so a dot product is the cosine similarity."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def encode_embedding(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def decode_embedding(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+class SpeakerEmbeddingIndex:
+    """
+    All identity embeddings as one L2-normalized float32 matrix (one row per identity).
+    A batch of queries is a single (q x d) @ (d x n) product, so search stays in
+    milliseconds with tens of thousands of enrolled voices.
+
+    The matrix is persisted as .npz so jobs don't rebuild it from the DB every time.
+    The speaker_identities table is the source of truth: the file carries a stamp
+    (row count + last update) and is rebuilt when it no longer matches.
+    """
+
+    # Jobs in one process (thread workers) must not interleave writes to the file
+    _lock = Lock()
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or settings.SPEAKER_INDEX_PATH)
+        self.ids: List[UUID] = []
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self._rows: Dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def load(cls, db: Session, path: Optional[Path] = None) -> "SpeakerEmbeddingIndex":
+        """The persisted index, rebuilt from the DB if missing or stale."""
+        index = cls(path)
+        stamp = cls.stamp(db)
+        with cls._lock:
+            if index._read() != stamp:
+                index.rebuild(db)
+        return index
+
+    @staticmethod
+    def stamp(db: Session) -> str:
+        """Identifies the current state of speaker_identities (visible to this transaction)."""
+        count, last = db.execute(
+            select(func.count(SpeakerIdentityModel.id), func.max(SpeakerIdentityModel.updated_at))
+        ).one()
+        return f"{count}:{last}"
+
+    def rebuild(self, db: Session):
+        rows = db.execute(select(SpeakerIdentityModel.id, SpeakerIdentityModel.embedding)).all()
+        logger.info(f"Rebuilding speaker index from {len(rows)} identities...")
+        matrix = normalize(np.stack([decode_embedding(r.embedding) for r in rows])) if rows else np.empty((0, 0), dtype=np.float32)
+        self._set([r.id for r in rows], matrix)
+
+    def search(self, queries: np.ndarray, k: int = 1) -> Tuple[List[List[UUID]], np.ndarray]:
+        """
+        Top-k identities by cosine similarity for every query row.
+        Returns (ids per query, scores of shape (q, k)), best first.
+        """
+        queries = normalize(queries)
+        if not self.ids:
+            return [[] for _ in range(len(queries))], np.empty((len(queries), 0), dtype=np.float32)
+        if queries.shape[1] != self.matrix.shape[1]:
+            raise ValueError(f"Embedding size {queries.shape[1]} does not match the index ({self.matrix.shape[1]}).")
+
+        scores = queries @ self.matrix.T
+        k = min(k, len(self.ids))
+        # argpartition is O(n) per query; only the k winners get sorted
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return [[self.ids[j] for j in row] for row in top], np.take_along_axis(top_scores, order, axis=1)
+
+    def upsert(self, identity_id: UUID, vector: np.ndarray):
+        """Adds or replaces one identity's row."""
+        row = normalize(vector)
+        if identity_id in self._rows:
+            self.matrix[self._rows[identity_id]] = row[0]
+        elif not self.ids:
+            self._set([identity_id], row)
+        else:
+            self._set(self.ids + [identity_id], np.vstack([self.matrix, row]))
+
+    def save(self, stamp: str):
+        """Atomically replaces the index file ('stamp' from stamp() after the writes)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.stem}.{uuid.uuid4().hex}.npz")
+        with self._lock:
+            np.savez(tmp, matrix=self.matrix, ids=np.array([i.hex for i in self.ids]), stamp=np.array(stamp))
+            os.replace(tmp, self.path)
+
+    def _read(self) -> Optional[str]:
+        """Loads the file; returns its stamp (None if there is no usable file)."""
+        try:
+            with np.load(self.path) as data:
+                self._set([UUID(hex=h) for h in data["ids"]], data["matrix"].astype(np.float32))
+                return str(data["stamp"])
+        except (FileNotFoundError, KeyError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Speaker index {self.path} is unreadable, rebuilding: {e}")
+            return None
+
+    def _set(self, ids: List[UUID], matrix: np.ndarray):
+        self.ids = ids
+        self.matrix = matrix
+        self._rows = {identity_id: row for row, identity_id in enumerate(ids)}
@@ -0,0 +1,86 @@
+# File: app/features/diarization/data/speaker_writer.py
+import uuid
+import logging
+from typing import Dict, Iterable, List, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import select, update, values, column
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+from app.features.transcription.data.sql_models import TranscriptionSegmentModel
+from .sql_models import SourceSpeakerModel
+
+logger = logging.getLogger(__name__)
+
+
+class SpeakerBulkWriter:
+    """
+    Set-based persistence for diarization results.
+    A long transcript has tens of thousands of segments; loading each as an ORM object
+    just to set speaker_id (and one SELECT per speaker label) made the DB the slow part:
+    - Speakers: one INSERT ... ON CONFLICT DO NOTHING on uix_source_speaker_label, one SELECT back.
+    - Segments: PostgreSQL gets one UPDATE ... FROM (VALUES ...) per batch,
+      SQLite a batched executemany UPDATE by primary key.
+    """
+
+    def __init__(self, batch_size: int = 5000):
+        self.batch_size = batch_size
+
+    def upsert_speakers(self, db: Session, source_id: UUID, labels: Iterable[str]) -> Tuple[Dict[str, UUID], int]:
+        """
+        Ensures a SourceSpeakerModel row per label. Existing rows (and their user labels) are kept.
+        Returns ({detected_label: speaker_id}, number of rows created).
+        """
+        labels = sorted(set(labels))
+        if not labels:
+            return {}, 0
+
+        rows = [
+            {"id": uuid.uuid4(), "source_id": source_id, "detected_label": label,
+             "user_label": f"Unknown {label}", "profile_meta": {}}
+            for label in labels
+        ]
+        created = db.execute(self._insert_ignore(db).values(rows)).rowcount
+
+        speaker_ids = dict(db.execute(
+            select(SourceSpeakerModel.detected_label, SourceSpeakerModel.id)
+            .where(SourceSpeakerModel.source_id == source_id, SourceSpeakerModel.detected_label.in_(labels))
+        ).all())
+        return speaker_ids, max(created, 0)
+
+    def assign_speakers(self, db: Session, assignments: Sequence[Tuple[UUID, UUID]]) -> int:
+        """
+        Sets speaker_id for (segment_id, speaker_id) pairs. Runs inside the caller's transaction.
+        """
+        postgres = db.get_bind().dialect.name == "postgresql"
+        for start in range(0, len(assignments), self.batch_size):
+            batch = assignments[start:start + self.batch_size]
+            if postgres:
+                self._update_from_values(db, batch)
+            else:
+                # ORM bulk UPDATE by primary key: one executemany, no objects loaded
+                db.execute(
+                    update(TranscriptionSegmentModel),
+                    [{"id": segment_id, "speaker_id": speaker_id} for segment_id, speaker_id in batch]
+                )
+        return len(assignments)
+
+    @staticmethod
+    def _insert_ignore(db: Session):
+        if db.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(SourceSpeakerModel).on_conflict_do_nothing(constraint="uix_source_speaker_label")
+        return sqlite.insert(SourceSpeakerModel).on_conflict_do_nothing(index_elements=["source_id", "detected_label"])
+
+    @staticmethod
+    def _update_from_values(db: Session, batch: List[Tuple[UUID, UUID]]):
+        pairs = values(
+            column("segment_id", PG_UUID(as_uuid=True)),
+            column("speaker_id", PG_UUID(as_uuid=True)),
+            name="aligned"
+        ).data(batch)
+        db.execute(
+            update(TranscriptionSegmentModel)
+            .where(TranscriptionSegmentModel.id == pairs.c.segment_id)
+            .values(speaker_id=pairs.c.speaker_id)
+            .execution_options(synchronize_session=False)
+        )
@@ -1,7 +1,7 @@
 # File: app/features/diarization/data/sql_models.py
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, ForeignKey, DateTime, JSON, UniqueConstraint
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, JSON, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database.base import Base
@@ -28,12 +28,38 @@ class SourceSpeakerModel(Base):
     
     # Metadata for UI (e.g., "Voice profile color", "Avg Pitch")
     profile_meta = Column(JSON, default=dict)
+
+    # The same voice across sources (see SpeakerIdentityModel)
+    identity_id = Column(UUID(as_uuid=True), ForeignKey("speaker_identities.id"), nullable=True, index=True)
     
     created_at = Column(DateTime(timezone=True), default=utc_now)
 
     source = relationship("SourceModel")
+    identity = relationship("SpeakerIdentityModel")
     
     # Ensure speaker_0 only exists once per source
     __table_args__ = (
         UniqueConstraint('source_id', 'detected_label', name='uix_source_speaker_label'),
-    )
\ No newline at end of file
+    )
+
+
+class SpeakerIdentityModel(Base):
+    """
+    Cross-Source Identity.
+    One voice, recognized across recordings by its speaker embedding.
+    The vectors are searched through SpeakerEmbeddingIndex, not in SQL.
+    """
+    __tablename__ = "speaker_identities"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Last name a user gave to any source speaker of this identity; suggested for new matches
+    display_name = Column(String, nullable=True)
+
+    # L2-normalized float32 centroid of every enrolled embedding
+    embedding = Column(LargeBinary, nullable=False)
+    embedding_dim = Column(Integer, nullable=False)
+    enrollment_count = Column(Integer, default=1)
+
+    created_at = Column(DateTime(timezone=True), default=utc_now)
+    updated_at = Column(DateTime(timezone=True), default=utc_now, onupdate=utc_now)
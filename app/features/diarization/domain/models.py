@@ -1,6 +1,6 @@
 # File: app/features/diarization/domain/models.py
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 @dataclass(frozen=True)
 class SpeakerSegment:
@@ -19,4 +19,19 @@ class DiarizationResult:
     """
     source_file: str
     num_speakers: int
-    segments: List[SpeakerSegment] = field(default_factory=list)
\ No newline at end of file
+    segments: List[SpeakerSegment] = field(default_factory=list)
+    # One voice embedding per speaker label (empty if the engine provides none)
+    speaker_embeddings: Dict[str, List[float]] = field(default_factory=dict)
+    processing_meta: dict = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class DiarizationConfig:
+    """
+    Sliding-window embedding + clustering parameters.
+    Windows are laid out inside speech regions only; consecutive windows overlap
+    by window_seconds - shift_seconds.
+    """
+    window_seconds: float = 1.5
+    shift_seconds: float = 0.75
+    # Cosine similarity needed to join an existing cluster when num_speakers is unknown
+    cluster_threshold: float = 0.6
\ No newline at end of file
@@ -0,0 +1,62 @@
+# File: app/features/diarization/service/alignment.py
+from typing import List, Optional, Sequence, Tuple, TypeVar
+from ..domain.models import SpeakerSegment
+
+T = TypeVar("T")
+
+
+def assign_speakers(spans: Sequence[Tuple[float, float]], speaker_segments: Sequence[SpeakerSegment]) -> List[Optional[str]]:
+    """
+    For every (start, end) span, the speaker label with the largest total overlap (None if nobody overlaps).
+    Zero-length spans take the speaker whose segment contains them.
+
+    One forward sweep over both lists in start order: each speaker segment enters the
+    active set once and leaves it once, so the cost is O(N + M) plus the sorts
+    (both inputs normally arrive time-ordered, which timsort handles in linear time).
+    The active set only holds segments that can still overlap, i.e. the handful of
+    speakers talking at the current position.
+    """
+    order = sorted(range(len(spans)), key=lambda i: spans[i][0])
+    segments = sorted(speaker_segments, key=lambda s: s.start)
+
+    labels: List[Optional[str]] = [None] * len(spans)
+    active: List[SpeakerSegment] = []
+    next_segment = 0
+
+    for i in order:
+        start, end = spans[i]
+
+        # Admit everything that starts before this span ends; drop what ended before it starts
+        while next_segment < len(segments) and segments[next_segment].start <= end:
+            active.append(segments[next_segment])
+            next_segment += 1
+        active = [s for s in active if s.end >= start]
+
+        overlap = {}
+        for seg in active:
+            shared = min(end, seg.end) - max(start, seg.start)
+            if shared > 0 or (start == end and seg.start <= start <= seg.end):
+                overlap[seg.speaker_label] = overlap.get(seg.speaker_label, 0.0) + max(shared, 0.0)
+
+        if overlap:
+            labels[i] = max(overlap, key=overlap.get)
+
+    return labels
+
+
+def split_by_speaker(items: Sequence[T], labels: Sequence[Optional[str]]) -> List[Tuple[Optional[str], List[T]]]:
+    """
+    Groups consecutive items (e.g. words) into runs of the same speaker.
+    Unlabelled items (pauses between diarization segments) stay with the run they follow,
+    so a gap never fragments a sentence.
+    """
+    runs: List[Tuple[Optional[str], List[T]]] = []
+    for item, label in zip(items, labels):
+        if runs and (label is None or label == runs[-1][0]):
+            runs[-1][1].append(item)
+        elif runs and runs[-1][0] is None:
+            # Leading unlabelled items join the first speaker
+            runs[-1] = (label, runs[-1][1] + [item])
+        else:
+            runs.append((label, [item]))
+    return runs
@@ -1,12 +1,79 @@
 # File: app/features/diarization/service/api.py
-from typing import Optional
+import time
+import logging
+import numpy as np
+from typing import List, Optional, Tuple
+from uuid import UUID
+from app.core.config.settings import settings
+from app.core.database.connection import SessionLocal
+from app.features.audio_extraction.service.api import probe_duration
 from ..data.nemo_adapter import NemoDiarizationAdapter
-from ..domain.models import DiarizationResult
+from ..data.embedding_cache import EmbeddingCache
+from ..domain.models import DiarizationConfig, DiarizationResult
+from .clustering import plan_embedding_windows, cluster_embeddings, windows_to_segments, speaker_centroids
+from . import identity
 
-def run_diarization(audio_path: str, num_speakers: Optional[int] = None) -> DiarizationResult:
+logger = logging.getLogger(__name__)
+
+def run_diarization(audio_path: str, num_speakers: Optional[int] = None, file_hash: Optional[str] = None,
+                    speech_regions: Optional[List[Tuple[float, float]]] = None,
+                    config: Optional[DiarizationConfig] = None) -> DiarizationResult:
     """
     Public API for the Diarization Feature.
     Used by the Pipeline to enrich transcripts.
+
+    1. Sliding windows are laid out over 'speech_regions' (e.g. from VAD), or the whole file.
+    2. Each window is embedded by the speaker model; with a file_hash the vectors are
+       cached, so re-running with other clustering options skips this step entirely.
+    3. The windows are clustered into speakers and merged into turns.
     """
+    config = config or DiarizationConfig()
+    started = time.monotonic()
+
+    if speech_regions is None:
+        speech_regions = [(0.0, probe_duration(audio_path))]
+    windows = plan_embedding_windows(speech_regions, config)
+
     adapter = NemoDiarizationAdapter()
-    return adapter.run_inference(audio_path, num_speakers)
\ No newline at end of file
+    cache = EmbeddingCache() if file_hash and settings.EMBEDDING_CACHE_ENABLED else None
+    key = EmbeddingCache.build_key(file_hash, adapter.model_name, windows) if cache else None
+
+    embeddings = cache.get(key) if cache else None
+    cache_hit = embeddings is not None
+    if embeddings is None:
+        embeddings = adapter.embed_windows(audio_path, windows, file_hash) if len(windows) else np.empty((0, 0), dtype=np.float32)
+        if cache and len(windows):
+            cache.put(key, embeddings)
+    embed_elapsed = time.monotonic() - started
+
+    labels = cluster_embeddings(embeddings, num_speakers, config.cluster_threshold)
+    segments = windows_to_segments(windows, labels)
+    elapsed = time.monotonic() - started
+
+    logger.info(
+        f"Diarization: {len(windows)} window(s) over {sum(e - s for s, e in speech_regions):.1f}s of speech, "
+        f"{len(set(labels.tolist()))} speaker(s), embeddings {'cached' if cache_hit else 'computed'}."
+    )
+    return DiarizationResult(
+        source_file=audio_path,
+        num_speakers=len(set(labels.tolist())),
+        segments=segments,
+        speaker_embeddings=speaker_centroids(embeddings, labels) if len(labels) else {},
+        processing_meta={
+            "windows": len(windows),
+            "speech_seconds": sum(e - s for s, e in speech_regions),
+            "embedding_cache_hit": cache_hit,
+            "embedding_seconds": embed_elapsed,
+            "clustering_seconds": elapsed - embed_elapsed
+        }
+    )
+
+def rename_speaker(speaker_id: UUID, user_label: str):
+    """
+    Public API: Renames a source speaker (e.g. 'Unknown speaker_0' -> 'Dr. Smith').
+    The name is remembered for the speaker's voice and suggested when it is
+    recognized in other sources.
+    """
+    with SessionLocal() as db:
+        identity.rename_speaker(db, speaker_id, user_label)
+        db.commit()
@@ -0,0 +1,107 @@
+# File: app/features/diarization/service/clustering.py
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..data.speaker_index import normalize
+from ..domain.models import DiarizationConfig, SpeakerSegment
+
+
+def plan_embedding_windows(speech_regions: Sequence[Tuple[float, float]], config: DiarizationConfig) -> np.ndarray:
+    """
+    Sliding windows (start, end) laid out inside the speech regions only, shape (n, 2).
+    Regions shorter than one window get a single window; the last window of a
+    region is aligned to its end so no speech is left uncovered.
+    """
+    if not 0 < config.shift_seconds <= config.window_seconds:
+        raise ValueError("Window shift must be positive and no longer than the window.")
+
+    windows: List[Tuple[float, float]] = []
+    for start, end in sorted(speech_regions):
+        if end <= start:
+            continue
+        t = start
+        while t + config.window_seconds < end:
+            windows.append((t, t + config.window_seconds))
+            t += config.shift_seconds
+        windows.append((max(start, end - config.window_seconds), end))
+
+    return np.array(windows, dtype=np.float64).reshape(-1, 2)
+
+
+def cluster_embeddings(embeddings: np.ndarray, num_speakers: Optional[int] = None,
+                       threshold: float = 0.6, iterations: int = 20) -> np.ndarray:
+    """
+    Spherical k-means over L2-normalized window embeddings; returns one label per window,
+    numbered by first appearance (label 0 speaks first).
+    - num_speakers known: farthest-point seeding with that many centroids.
+    - Unknown: one pass opens a new cluster whenever a window's best cosine
+      similarity is below 'threshold'; those clusters seed the refinement.
+    Cost is O(n * k) per iteration, no n x n affinity matrix.
+    """
+    if len(embeddings) == 0:
+        return np.empty(0, dtype=np.int64)
+    x = normalize(embeddings)
+
+    if num_speakers:
+        chosen = [0]
+        closest = x @ x[0]
+        for _ in range(min(num_speakers, len(x)) - 1):
+            chosen.append(int(np.argmin(closest)))
+            closest = np.maximum(closest, x @ x[chosen[-1]])
+        centroids = x[chosen]
+    else:
+        sums = x[:1].copy()
+        centroids = x[:1].copy()
+        for row in x[1:]:
+            sims = centroids @ row
+            best = int(np.argmax(sims))
+            if sims[best] >= threshold:
+                sums[best] += row
+                centroids[best] = normalize(sums[best])[0]
+            else:
+                sums = np.vstack([sums, row])
+                centroids = np.vstack([centroids, row])
+
+    labels = np.argmax(x @ centroids.T, axis=1)
+    for _ in range(iterations):
+        used = np.unique(labels)
+        centroids = normalize(np.stack([x[labels == k].sum(axis=0) for k in used]))
+        updated = np.argmax(x @ centroids.T, axis=1)
+        if np.array_equal(used[updated], labels):
+            break
+        labels = used[updated]
+
+    # Renumber by first appearance
+    _, first = np.unique(labels, return_index=True)
+    order = np.argsort(first)
+    mapping = np.empty(labels.max() + 1, dtype=np.int64)
+    mapping[np.unique(labels)[order]] = np.arange(len(order))
+    return mapping[labels]
+
+
+def windows_to_segments(windows: np.ndarray, labels: np.ndarray, label_prefix: str = "speaker_") -> List[SpeakerSegment]:
+    """
+    Turns labelled windows into speaker turns.
+    Where two windows overlap, each owns the half of the overlap nearest to it;
+    adjacent windows of the same speaker are merged.
+    """
+    segments: List[SpeakerSegment] = []
+    for i, ((start, end), label) in enumerate(zip(windows, labels)):
+        if i > 0 and windows[i - 1][1] > start:
+            start = (start + windows[i - 1][1]) / 2
+        if i + 1 < len(windows) and windows[i + 1][0] < end:
+            end = (windows[i + 1][0] + end) / 2
+
+        speaker = f"{label_prefix}{label}"
+        if segments and segments[-1].speaker_label == speaker and segments[-1].end >= start:
+            segments[-1] = SpeakerSegment(segments[-1].start, float(end), speaker, segments[-1].confidence)
+        else:
+            segments.append(SpeakerSegment(float(start), float(end), speaker, confidence=0.9))
+    return segments
+
+
+def speaker_centroids(embeddings: np.ndarray, labels: np.ndarray, label_prefix: str = "speaker_") -> Dict[str, List[float]]:
+    """One normalized mean embedding per speaker (the voice used for identity matching)."""
+    return {
+        f"{label_prefix}{k}": normalize(embeddings[labels == k].mean(axis=0))[0].tolist()
+        for k in np.unique(labels)
+    }
@@ -0,0 +1,100 @@
+# File: app/features/diarization/service/identity.py
+import logging
+import numpy as np
+from typing import Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config.settings import settings
+from ..data.sql_models import SourceSpeakerModel, SpeakerIdentityModel
+from ..data.speaker_index import SpeakerEmbeddingIndex, normalize, encode_embedding, decode_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def match_speaker_identities(db: Session, speaker_ids: Dict[str, UUID], embeddings: Dict[str, List[float]],
+                             threshold: Optional[float] = None) -> dict:
+    """
+    Links this source's speakers to cross-source identities.
+    - All new speakers are searched in one batch against the embedding index.
+    - A match above 'threshold' links the speaker, folds its embedding into the identity's
+      centroid and, if the user never renamed the speaker, suggests the identity's name.
+    - Anything else is enrolled as a new identity so later recordings can match it.
+    Two speakers of one recording are never linked to the same identity.
+    Returns match statistics.
+    """
+    threshold = settings.SPEAKER_MATCH_THRESHOLD if threshold is None else threshold
+
+    speakers = {
+        s.detected_label: s
+        for s in db.execute(
+            select(SourceSpeakerModel).where(SourceSpeakerModel.id.in_(list(speaker_ids.values())))
+        ).scalars()
+    }
+    # Speakers linked on an earlier run keep their identity (no double enrollment)
+    labels = [label for label in embeddings if label in speakers and speakers[label].identity_id is None]
+    stats = {"matched": 0, "enrolled": 0, "suggested_labels": 0}
+    if not labels:
+        return stats
+
+    index = SpeakerEmbeddingIndex.load(db)
+    queries = normalize(np.stack([np.asarray(embeddings[label], dtype=np.float32) for label in labels]))
+    hits, scores = index.search(queries, k=1)
+
+    # Best matches claim their identity first
+    order = sorted(range(len(labels)), key=lambda i: -scores[i, 0] if hits[i] else 0.0)
+    claimed = set()
+    for i in order:
+        speaker = speakers[labels[i]]
+        identity_id = hits[i][0] if hits[i] else None
+
+        if identity_id is not None and scores[i, 0] >= threshold and identity_id not in claimed:
+            identity = db.get(SpeakerIdentityModel, identity_id)
+            count = identity.enrollment_count or 1
+            centroid = normalize(decode_embedding(identity.embedding) * count + queries[i])[0]
+            identity.embedding = encode_embedding(centroid)
+            identity.enrollment_count = count + 1
+            index.upsert(identity.id, centroid)
+
+            meta = {**(speaker.profile_meta or {}), "identity_score": float(scores[i, 0])}
+            if identity.display_name and speaker.user_label == f"Unknown {speaker.detected_label}":
+                speaker.user_label = identity.display_name
+                meta["suggested_label"] = identity.display_name
+                stats["suggested_labels"] += 1
+            speaker.profile_meta = meta
+            stats["matched"] += 1
+        else:
+            renamed = speaker.user_label != f"Unknown {speaker.detected_label}"
+            identity = SpeakerIdentityModel(
+                display_name=speaker.user_label if renamed else None,
+                embedding=encode_embedding(queries[i]),
+                embedding_dim=queries.shape[1],
+                enrollment_count=1
+            )
+            db.add(identity)
+            db.flush()
+            index.upsert(identity.id, queries[i])
+            stats["enrolled"] += 1
+
+        speaker.identity_id = identity.id
+        claimed.add(identity.id)
+
+    db.flush()
+    index.save(SpeakerEmbeddingIndex.stamp(db))
+    logger.info(f"Speaker identities: {stats['matched']} matched, {stats['enrolled']} enrolled.")
+    return stats
+
+
+def rename_speaker(db: Session, speaker_id: UUID, user_label: str) -> SourceSpeakerModel:
+    """
+    Sets a speaker's user_label; the name becomes the suggestion for every
+    future recording of the same identity.
+    """
+    speaker = db.get(SourceSpeakerModel, speaker_id)
+    if speaker is None:
+        raise ValueError(f"Speaker {speaker_id} not found.")
+
+    speaker.user_label = user_label
+    if speaker.identity is not None:
+        speaker.identity.display_name = user_label
+    return speaker
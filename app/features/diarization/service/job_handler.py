@@ -1,10 +1,19 @@
 import logging
 from uuid import UUID
+from sqlalchemy import select, delete
+from app.core.config.settings import settings
 from app.core.database.connection import SessionLocal
 from app.features.storage.data.sql_models import SourceModel
 from app.features.transcription.data.sql_models import TranscriptionModel, TranscriptionSegmentModel
-from ..data.sql_models import SourceSpeakerModel
-from ..data.nemo_adapter import NemoDiarizationAdapter
+from app.features.transcription.data.bulk_writer import TranscriptionBulkWriter
+from app.features.transcription.data.word_codec import pack_words, unpack_words
+from app.features.vad.service.api import run_vad_analysis
+from app.features.vad.domain.models import VadEventType
+from ..data.speaker_writer import SpeakerBulkWriter
+from ..domain.models import DiarizationConfig
+from .api import run_diarization
+from .alignment import assign_speakers, split_by_speaker
+from .identity import match_speaker_identities
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +25,6 @@ class DiarizationHandler:
     """
 
     def handle(self, source_id: UUID, params: dict) -> dict:
-        # 'params' is part of the standard interface, even if unused here.
-        _ = params
-
         logger.info(f"Processing Diarization for Source: {source_id}")
 
         with SessionLocal() as db:
@@ -35,65 +41,89 @@ class DiarizationHandler:
             audio_path = source.original_file.file_path
 
             # 2. Run Inference (NeMo)
-            # FIX: Pass raw string 'audio_path' instead of 'Path(audio_path)'
-            adapter = NemoDiarizationAdapter()
-            result = adapter.run_inference(audio_path)
+            # Only the speech regions found by VAD are embedded.
+            # Embeddings are cached per file, so a re-run with another 'num_speakers' only re-clusters.
+            file_hash = source.original_file.file_hash
+            speech_regions = None
+            if params.get("speech_only", settings.DIARIZATION_SPEECH_ONLY):
+                speech_regions = [
+                    (s.start, s.end) for s in run_vad_analysis(audio_path, file_hash)
+                    if s.event_type == VadEventType.SPEECH
+                ]
+            config = DiarizationConfig(
+                window_seconds=params.get("window_seconds", settings.DIARIZATION_WINDOW_SECONDS),
+                shift_seconds=params.get("window_shift_seconds", settings.DIARIZATION_WINDOW_SHIFT_SECONDS),
+                cluster_threshold=params.get("cluster_threshold", settings.DIARIZATION_CLUSTER_THRESHOLD)
+            )
+            result = run_diarization(audio_path, params.get("num_speakers"), file_hash, speech_regions, config)
 
             # 3. Save Speakers to DB & Build a Lookup Map
-            # Map: "speaker_0" -> UUID(123-abc...)
-            label_to_uuid_map = {}
-            created_count = 0
-
-            unique_labels = set(s.speaker_label for s in result.segments)
-
-            for label in unique_labels:
-                # Check if already exists
-                existing = db.query(SourceSpeakerModel).filter_by(
-                    source_id=source.id,
-                    detected_label=label
-                ).first()
-
-                if not existing:
-                    speaker = SourceSpeakerModel(
-                        source_id=source.id,
-                        detected_label=label,
-                        user_label=f"Unknown {label}"
-                    )
-                    db.add(speaker)
-                    db.flush()  # Flush to get the ID
-                    label_to_uuid_map[label] = speaker.id
-                    created_count += 1
-                else:
-                    label_to_uuid_map[label] = existing.id
-
-            # 4. Perform Alignment
-            # Fetch all text segments for this source
-            text_segments = (
-                db.query(TranscriptionSegmentModel)
-                .join(TranscriptionModel)
-                .filter(TranscriptionModel.source_id == source_id)
-                .all()
+            # Map: "speaker_0" -> UUID(123-abc...), one upsert for all labels
+            writer = SpeakerBulkWriter()
+            label_to_uuid_map, created_count = writer.upsert_speakers(
+                db, source.id, (s.speaker_label for s in result.segments)
             )
 
-            aligned_count = 0
-
-            if text_segments:
-                # Sort diarization segments by start time for efficiency
-                diarization_segments = sorted(result.segments, key=lambda x: x.start)
+            # 3b. Link speakers to voices known from other sources
+            identity_stats = {}
+            if result.speaker_embeddings and params.get("match_identities", settings.SPEAKER_INDEX_ENABLED):
+                identity_stats = match_speaker_identities(db, label_to_uuid_map, result.speaker_embeddings)
 
-                for txt_seg in text_segments:
-                    # Find the speaker segment with the largest overlap
-                    midpoint = (txt_seg.start_time + txt_seg.end_time) / 2
+            # 4. Perform Alignment
+            # Each text segment gets the speaker it overlaps most (single sweep, see alignment.py).
+            # Only the columns needed are read; no ORM objects are built for the segments.
+            split_words = params.get("split_words", False)
+            columns = [TranscriptionSegmentModel.id, TranscriptionSegmentModel.start_time, TranscriptionSegmentModel.end_time]
+            if split_words:
+                columns += [TranscriptionSegmentModel.transcription_id, TranscriptionSegmentModel.meta_data,
+                            TranscriptionSegmentModel.words_blob]
+            text_segments = db.execute(
+                select(*columns)
+                .join(TranscriptionModel)
+                .where(TranscriptionModel.source_id == source_id)
+                .order_by(TranscriptionSegmentModel.start_time)
+            ).all()
+
+            labels = assign_speakers([(s.start_time, s.end_time) for s in text_segments], result.segments)
+
+            # With 'split_words', segments where the speaker changes mid-way are cut at the word level
+            split_ids = []
+            split_rows = []
+            if split_words and text_segments:
+                words = [unpack_words(s.words_blob, base=s.start_time) if s.words_blob else [] for s in text_segments]
+                word_labels = iter(assign_speakers([(w.start, w.end) for ws in words for w in ws], result.segments))
+
+                for i, seg in enumerate(text_segments):
+                    runs = split_by_speaker(words[i], [next(word_labels) for _ in words[i]])
+                    if len(runs) < 2:
+                        continue
+
+                    split_ids.append(seg.id)
+                    labels[i] = None
+                    split_rows.extend(
+                        {
+                            "transcription_id": seg.transcription_id,
+                            "start_time": run[0].start,
+                            "end_time": run[-1].end,
+                            "text": " ".join(w.word for w in run),
+                            "speaker_id": label_to_uuid_map.get(label),
+                            "meta_data": {**(seg.meta_data or {}), "word_count": len(run), "split_from": str(seg.id)},
+                            "words_blob": pack_words(run, base=run[0].start)
+                        }
+                        for label, run in runs
+                    )
 
-                    matched_label = None
-                    for ds in diarization_segments:
-                        if ds.start <= midpoint <= ds.end:
-                            matched_label = ds.speaker_label
-                            break
+            if split_ids:
+                db.execute(delete(TranscriptionSegmentModel).where(TranscriptionSegmentModel.id.in_(split_ids)))
+                TranscriptionBulkWriter().insert_segments(db, split_rows)
 
-                    if matched_label and matched_label in label_to_uuid_map:
-                        txt_seg.speaker_id = label_to_uuid_map[matched_label]
-                        aligned_count += 1
+            assignments = [
+                (seg.id, label_to_uuid_map[label])
+                for seg, label in zip(text_segments, labels)
+                if label in label_to_uuid_map
+            ]
+            writer.assign_speakers(db, assignments)
+            aligned_count = len(assignments) + sum(1 for row in split_rows if row["speaker_id"] is not None)
 
             db.commit()
 
@@ -102,5 +132,8 @@ class DiarizationHandler:
             return {
                 "speakers_found": result.num_speakers,
                 "new_profiles_created": created_count,
-                "segments_aligned": aligned_count
+                "segments_aligned": aligned_count,
+                "segments_split": len(split_ids),
+                "identities": identity_stats,
+                **result.processing_meta
             }
\ No newline at end of file
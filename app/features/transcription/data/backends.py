@@ -0,0 +1,29 @@
+# File: app/features/transcription/data/backends.py
+import logging
+from typing import Optional
+from app.core.config.settings import settings
+from .whisper_adapter import WhisperAdapter
+from .faster_whisper_adapter import FasterWhisperAdapter
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTION_BACKENDS = {
+    WhisperAdapter.backend: WhisperAdapter,
+    FasterWhisperAdapter.backend: FasterWhisperAdapter,
+}
+
+
+def create_transcriber(backend: Optional[str] = None) -> WhisperAdapter:
+    """
+    Adapter for the requested backend (job payload), else settings.TRANSCRIPTION_BACKEND.
+    Falls back to PyTorch Whisper when faster-whisper is not installed.
+    """
+    backend = backend or settings.TRANSCRIPTION_BACKEND
+    if backend not in TRANSCRIPTION_BACKENDS:
+        raise ValueError(f"Unknown transcription backend: {backend}")
+
+    if backend == FasterWhisperAdapter.backend and not FasterWhisperAdapter.is_available():
+        logger.warning("faster-whisper is not installed; using the PyTorch Whisper backend.")
+        return WhisperAdapter()
+
+    return TRANSCRIPTION_BACKENDS[backend]()
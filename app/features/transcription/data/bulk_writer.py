@@ -0,0 +1,103 @@
+# File: app/features/transcription/data/bulk_writer.py
+import io
+import csv
+import json
+import uuid
+import logging
+from typing import Iterable, List
+from uuid import UUID
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from .sql_models import TranscriptionModel, TranscriptionSegmentModel
+
+logger = logging.getLogger(__name__)
+
+# Column order for COPY; must match the keys produced by the handlers
+_SEGMENT_COLUMNS = ("id", "transcription_id", "start_time", "end_time", "text", "speaker_id", "meta_data", "words_blob")
+
+
+class TranscriptionBulkWriter:
+    """
+    Set-based persistence for transcription headers and segments.
+    Long recordings produce tens of thousands of segments; building an ORM
+    object per row dominates the write time, so rows go in as plain dicts:
+    - PostgreSQL (psycopg2): one COPY ... FROM STDIN per batch.
+    - Anything else (SQLite): batched executemany INSERTs.
+    """
+
+    def __init__(self, batch_size: int = 5000):
+        self.batch_size = batch_size
+
+    def insert_header(self, db: Session, **values) -> UUID:
+        """Inserts one transcriptions row and returns its id."""
+        header_id = values.pop("id", None) or uuid.uuid4()
+        db.execute(insert(TranscriptionModel).values(id=header_id, **values))
+        return header_id
+
+    def insert_segments(self, db: Session, rows: Iterable[dict]) -> int:
+        """
+        Inserts segment rows (keys: transcription_id, start_time, end_time, text,
+        optional id/speaker_id/meta_data/words_blob). Runs inside the caller's transaction.
+        """
+        use_copy = self._supports_copy(db)
+        written = 0
+        for batch in self._batches(rows):
+            if use_copy:
+                self._copy(db, batch)
+            else:
+                db.execute(insert(TranscriptionSegmentModel), batch)
+            written += len(batch)
+        return written
+
+    def _batches(self, rows: Iterable[dict]):
+        batch: List[dict] = []
+        for row in rows:
+            batch.append({
+                "id": row.get("id") or uuid.uuid4(),
+                "transcription_id": row["transcription_id"],
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+                "text": row["text"],
+                "speaker_id": row.get("speaker_id"),
+                "meta_data": row.get("meta_data") or {},
+                "words_blob": row.get("words_blob")
+            })
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _supports_copy(db: Session) -> bool:
+        dialect = db.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg2"
+
+    @staticmethod
+    def _copy(db: Session, batch: List[dict]):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+        for row in batch:
+            writer.writerow([
+                str(row["id"]),
+                str(row["transcription_id"]),
+                repr(float(row["start_time"])),
+                repr(float(row["end_time"])),
+                row["text"],
+                str(row["speaker_id"]) if row["speaker_id"] else "",
+                json.dumps(row["meta_data"]),
+                "\\x" + row["words_blob"].hex() if row["words_blob"] is not None else ""
+            ])
+        buffer.seek(0)
+
+        # Everything is quoted, so empty text stays ''; FORCE_NULL maps empty speaker_id/words_blob to NULL.
+        # bytea goes in as hex ('\x...').
+        sql = (
+            f"COPY {TranscriptionSegmentModel.__tablename__} ({', '.join(_SEGMENT_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv, FORCE_NULL (speaker_id, words_blob))"
+        )
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(sql, buffer)
+        finally:
+            cursor.close()
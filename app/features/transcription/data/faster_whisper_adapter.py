@@ -0,0 +1,73 @@
+# File: app/features/transcription/data/faster_whisper_adapter.py
+import os
+import logging
+import numpy as np
+from typing import Optional
+from app.core.config.settings import settings
+from .whisper_adapter import WhisperAdapter
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+logger = logging.getLogger(__name__)
+
+
+class FasterWhisperAdapter(WhisperAdapter):
+    """
+    Whisper on CTranslate2 (faster-whisper), quantized to int8 on CPU.
+    Produces the same TranscriptionResult/WordTiming shape as WhisperAdapter:
+    raw output is mapped to openai-whisper's dict layout and parsed by the shared code.
+    """
+    backend = "faster_whisper"
+
+    @staticmethod
+    def is_available() -> bool:
+        return WhisperModel is not None
+
+    @classmethod
+    def load_model(cls, model_size: str, device: str, threads: Optional[int] = None):
+        if WhisperModel is None:
+            raise RuntimeError("faster-whisper is not installed (pip install faster-whisper).")
+
+        compute_type = settings.FASTER_WHISPER_COMPUTE_TYPE or ("float16" if device == "cuda" else "int8")
+        return WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=threads or os.cpu_count() or 1
+        )
+
+    def model_variant(self, model_size: str) -> str:
+        return f"{self.backend}:{model_size}"
+
+    @staticmethod
+    def _run_whisper(model, device: str, audio):
+        """'audio' is either a file path or a 16 kHz mono float32 array."""
+        segments, info = model.transcribe(
+            audio if isinstance(audio, str) else np.ascontiguousarray(audio, dtype=np.float32),
+            word_timestamps=True
+        )
+
+        # The segment generator does the decoding; consume it inside the caller's lease
+        raw_segments = [
+            {
+                "start": seg.start,
+                "end": seg.end,
+                "text": seg.text,
+                "avg_logprob": seg.avg_logprob,
+                "compression_ratio": seg.compression_ratio,
+                "no_speech_prob": seg.no_speech_prob,
+                "words": [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in (seg.words or [])
+                ]
+            }
+            for seg in segments
+        ]
+        return {
+            "language": info.language,
+            "text": "".join(seg["text"] for seg in raw_segments),
+            "segments": raw_segments
+        }
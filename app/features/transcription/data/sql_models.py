@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Text, Float, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, String, Text, Float, Boolean, ForeignKey, DateTime, JSON, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database.base import Base
@@ -30,6 +30,12 @@ class TranscriptionModel(Base):
     # Processing stats (e.g. {"duration": 120.5, "device": "cuda"})
     processing_meta = Column(JSON, default=dict)
 
+    # Hash of file_hash + model + decode options; identical requests reuse this result
+    cache_key = Column(String, nullable=True, index=True)
+
+    # False while a checkpointed job is still committing segments (see JobModel.checkpoint_seconds)
+    is_complete = Column(Boolean, default=True, nullable=False)
+
     created_at = Column(DateTime(timezone=True), default=utc_now)
 
     source = relationship("SourceModel", back_populates="transcriptions")
@@ -43,6 +49,10 @@ class TranscriptionSegmentModel(Base):
     Includes rich metadata (confidence, timestamps) in JSONB.
     """
     __tablename__ = "transcription_segments"
+    __table_args__ = (
+        # Time-range reads (get_words_in_range, context windows)
+        Index("ix_transcription_segments_transcription_start", "transcription_id", "start_time"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     transcription_id = Column(UUID(as_uuid=True), ForeignKey("transcriptions.id"), nullable=False)
@@ -57,6 +67,9 @@ class TranscriptionSegmentModel(Base):
     # Rich Metadata Container
     meta_data = Column(JSON, default=dict)
 
+    # Word timings, packed columnar (see data/word_codec.py); times relative to start_time
+    words_blob = Column(LargeBinary, nullable=True)
+
     transcription = relationship("TranscriptionModel", back_populates="segments")
 
     # --- ADDED THIS RELATIONSHIP ---
@@ -1,53 +1,233 @@
 # File: app/features/transcription/data/whisper_adapter.py
+import os
+import time
 import whisper
 import torch
 import logging
+import numpy as np
+import multiprocessing
+from typing import Iterator, List, Optional
+from concurrent.futures import ProcessPoolExecutor
 from app.core.config.settings import settings
 from app.core.model_lifecycle.orchestrator import ModelOrchestrator, ModelType
+from app.features.audio_extraction.service.api import decode_audio, stream_audio, load_pcm, SAMPLE_RATE
 from ..domain.interfaces import ITranscriber
-from ..domain.models import TranscriptionResult, TranscriptionSegment, WordTiming
+from ..domain.models import TranscriptionResult, TranscriptionSegment, WordTiming, AudioSpan, ChunkTranscript
 
 logger = logging.getLogger(__name__)
 
+# Per-process model for chunk workers (see transcribe_chunks)
+_chunk_adapter = None
+_chunk_model = None
+_chunk_device = "cpu"
+
+
+def _init_chunk_worker(adapter_cls, model_size: str, device: str, threads: int):
+    """ProcessPool initializer: every worker loads its own model once."""
+    global _chunk_adapter, _chunk_model, _chunk_device
+    torch.set_num_threads(threads)
+    _chunk_adapter = adapter_cls
+    _chunk_device = device
+    _chunk_model = adapter_cls.load_model(model_size, device, threads)
+
+
+def _transcribe_chunk(audio_path: str, span: AudioSpan, file_hash: Optional[str]) -> ChunkTranscript:
+    """Module-level entry point so it can be pickled into a ProcessPool."""
+    return _chunk_adapter.transcribe_chunk(_chunk_model, _chunk_device, audio_path, span, file_hash)
+
+
 class WhisperAdapter(ITranscriber):
+    """
+    OpenAI Whisper (PyTorch). Subclasses swap the engine by overriding
+    load_model() and _run_whisper(); span, chunk and streaming modes are shared.
+    """
+    backend = "whisper"
+
     def __init__(self):
         self.orchestrator = ModelOrchestrator()
         self.device = settings.WHISPER_DEVICE
 
-    def transcribe(self, audio_path: str, model_size: str) -> TranscriptionResult:
-        logger.info(f"Requesting Whisper ({model_size}) for {audio_path}...")
+    @classmethod
+    def load_model(cls, model_size: str, device: str, threads: Optional[int] = None):
+        return whisper.load_model(model_size, device=device)
 
+    def model_variant(self, model_size: str) -> str:
+        """ModelOrchestrator variant: one resident per backend and size."""
+        return model_size
+
+    def model_loader(self, model_size: str):
+        """Loader callable for the ModelOrchestrator (also used for prefetching)."""
         def loader():
-            logger.debug(f"Loading Whisper {model_size} into VRAM...")
-            return whisper.load_model(model_size, device=self.device)
+            logger.debug(f"Loading {self.backend} {model_size} into VRAM...")
+            return self.load_model(model_size, self.device)
+        return loader
+
+    def transcribe(self, audio_path: str, model_size: str, file_hash: Optional[str] = None) -> TranscriptionResult:
+        logger.info(f"Requesting {self.backend} ({model_size}) for {audio_path}...")
+        started = time.monotonic()
+
+        # Known files are read from the shared decoded-audio cache instead of decoding again
+        audio = load_pcm(audio_path, file_hash) if file_hash else audio_path
+
+        # Lease pins the model so it can't be swapped out mid-inference
+        with self.orchestrator.lease(ModelType.WHISPER, self.model_loader(model_size), variant=self.model_variant(model_size)) as model:
+            result_raw = self._run_model(model, audio)
+
+        return TranscriptionResult(
+            source_file=audio_path,
+            language=result_raw.get('language', 'unknown'),
+            model_used=model_size,
+            full_text=result_raw.get('text', '').strip(),
+            segments=self._parse_segments(result_raw),
+            processing_meta={"device": self.device, "backend": self.backend, "elapsed_seconds": time.monotonic() - started}
+        )
+
+    def transcribe_spans(self, audio_path: str, model_size: str, spans: List[AudioSpan], file_hash: Optional[str] = None) -> TranscriptionResult:
+        """
+        Transcribes only the given spans of the recording.
+        Each span is decoded on its own; timestamps are mapped back onto the original timeline.
+        """
+        logger.info(f"Requesting {self.backend} ({model_size}) for {len(spans)} span(s) of {audio_path}...")
+        started = time.monotonic()
+
+        segments: List[TranscriptionSegment] = []
+        language = "unknown"
+
+        with self.orchestrator.lease(ModelType.WHISPER, self.model_loader(model_size), variant=self.model_variant(model_size)) as model:
+            for span in spans:
+                chunk = self.transcribe_chunk(model, self.device, audio_path, span, file_hash)
+                if language == "unknown":
+                    language = chunk.language
+                segments.extend(chunk.segments)
+
+        return TranscriptionResult(
+            source_file=audio_path,
+            language=language,
+            model_used=model_size,
+            full_text=" ".join(s.text for s in segments if s.text),
+            segments=segments,
+            processing_meta={"device": self.device, "backend": self.backend, "elapsed_seconds": time.monotonic() - started}
+        )
+
+    def transcribe_stream(self, audio_path: str, model_size: str, window_seconds: float, overlap_seconds: float,
+                          file_hash: Optional[str] = None, start: float = 0.0) -> Iterator[ChunkTranscript]:
+        """
+        Bounded-memory transcription: audio is piped in window by window
+        instead of decoding the whole recording up front. Yields one transcript per window.
+        'start' skips the audio before it (resuming a checkpointed job).
+        """
+        logger.info(f"Requesting {self.backend} ({model_size}) to stream {audio_path} in {window_seconds:.0f}s windows...")
+
+        with self.orchestrator.lease(ModelType.WHISPER, self.model_loader(model_size), variant=self.model_variant(model_size)) as model:
+            for start, samples in stream_audio(audio_path, window_seconds, overlap_seconds, file_hash, start):
+                span = AudioSpan(start, start + samples.size / SAMPLE_RATE)
+                result_raw = self._run_model(model, samples)
+                yield ChunkTranscript(
+                    span=span,
+                    language=result_raw.get('language', 'unknown'),
+                    segments=self._parse_segments(result_raw, offset=start)
+                )
+
+    def transcribe_chunks(self, audio_path: str, model_size: str, chunks: List[AudioSpan], workers: int = 1,
+                          file_hash: Optional[str] = None) -> List[ChunkTranscript]:
+        """
+        Transcribes each chunk of a long recording independently (results in chunk order).
+        - CPU: chunks are spread over 'workers' processes, each with its own model
+          (capped by the orchestrator's memory budget).
+        - GPU: chunks run back-to-back on the one leased model, which keeps the device saturated.
+        """
+        return list(self.iter_chunks(audio_path, model_size, chunks, workers, file_hash))
+
+    def iter_chunks(self, audio_path: str, model_size: str, chunks: List[AudioSpan], workers: int = 1,
+                    file_hash: Optional[str] = None) -> Iterator[ChunkTranscript]:
+        """
+        Same as transcribe_chunks, but yields each transcript (in chunk order)
+        as soon as it and all chunks before it are done.
+        """
+        if self.device == "cuda" or workers <= 1 or len(chunks) <= 1:
+            yield from self._iter_chunks_leased(audio_path, model_size, chunks, file_hash)
+            return
+
+        # Each worker process loads its own model outside the leases: reserve those copies
+        # in the orchestrator's memory budget, and start only as many workers as fit.
+        requested = min(workers, len(chunks))
+        with self.orchestrator.reserve_external(ModelType.WHISPER, requested, variant=self.model_variant(model_size)) as granted:
+            if granted < 2:
+                logger.info(f"Memory budget fits {granted} of {requested} chunk worker(s); transcribing in-process.")
+                yield from self._iter_chunks_leased(audio_path, model_size, chunks, file_hash)
+                return
 
-        model = self.orchestrator.request_model(ModelType.WHISPER, loader)
-        use_fp16 = (self.device == "cuda")
+            if file_hash:
+                # Decode into the shared cache once; every worker then maps the same pages
+                load_pcm(audio_path, file_hash)
+
+            threads = max(1, (os.cpu_count() or 1) // granted)
+            logger.info(f"Transcribing {len(chunks)} chunk(s) on {granted} process(es), {threads} thread(s) each...")
+
+            # 'spawn': torch's thread pools do not survive fork()
+            with ProcessPoolExecutor(
+                max_workers=granted,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_chunk_worker,
+                initargs=(type(self), model_size, self.device, threads)
+            ) as pool:
+                yield from pool.map(_transcribe_chunk, [audio_path] * len(chunks), chunks, [file_hash] * len(chunks))
+
+    def _iter_chunks_leased(self, audio_path: str, model_size: str, chunks: List[AudioSpan],
+                            file_hash: Optional[str] = None) -> Iterator[ChunkTranscript]:
+        """Chunks back-to-back on the one leased model."""
+        with self.orchestrator.lease(ModelType.WHISPER, self.model_loader(model_size), variant=self.model_variant(model_size)) as model:
+            for span in chunks:
+                yield self.transcribe_chunk(model, self.device, audio_path, span, file_hash)
+
+    @classmethod
+    def transcribe_chunk(cls, model, device: str, audio_path: str, span: AudioSpan, file_hash: Optional[str] = None) -> ChunkTranscript:
+        samples = decode_audio(audio_path, start=span.start, duration=span.duration, file_hash=file_hash)
+        if samples.size == 0:
+            return ChunkTranscript(span=span, language="unknown")
+
+        result_raw = cls._run_whisper(model, device, samples)
+        return ChunkTranscript(
+            span=span,
+            language=result_raw.get('language', 'unknown'),
+            segments=cls._parse_segments(result_raw, offset=span.start)
+        )
+
+    def _run_model(self, model, audio):
+        return self._run_whisper(model, self.device, audio)
+
+    @staticmethod
+    def _run_whisper(model, device: str, audio):
+        """'audio' is either a file path or a 16 kHz mono float32 array."""
+        use_fp16 = (device == "cuda")
 
         # UPDATED: Enable word_timestamps to get the rich metadata
-        result_raw = model.transcribe(
-            audio_path, 
-            fp16=use_fp16, 
+        return model.transcribe(
+            audio if isinstance(audio, str) else np.ascontiguousarray(audio),
+            fp16=use_fp16,
             word_timestamps=True
         )
 
+    @staticmethod
+    def _parse_segments(result_raw: dict, offset: float = 0.0) -> List[TranscriptionSegment]:
+        """Maps Whisper's raw output to domain segments, shifted by 'offset' seconds."""
         segments = []
         for seg in result_raw.get('segments', []):
-            
+
             # Extract Word Timings
             words_list = []
             if 'words' in seg:
                 for w in seg['words']:
                     words_list.append(WordTiming(
                         word=w['word'].strip(),
-                        start=float(w['start']),
-                        end=float(w['end']),
+                        start=float(w['start']) + offset,
+                        end=float(w['end']) + offset,
                         confidence=float(w['probability'])
                     ))
-            
+
             segments.append(TranscriptionSegment(
-                start=float(seg['start']),
-                end=float(seg['end']),
+                start=float(seg['start']) + offset,
+                end=float(seg['end']) + offset,
                 text=seg['text'].strip(),
                 confidence=float(seg.get('avg_logprob', 0.0)), # Approximation using logprob
                 words=words_list,
@@ -56,12 +236,4 @@ class WhisperAdapter(ITranscriber):
                     "no_speech_prob": seg.get('no_speech_prob')
                 }
             ))
-
-        return TranscriptionResult(
-            source_file=audio_path,
-            language=result_raw.get('language', 'unknown'),
-            model_used=model_size,
-            full_text=result_raw.get('text', '').strip(),
-            segments=segments,
-            processing_meta={"device": self.device}
-        )
\ No newline at end of file
+        return segments
@@ -0,0 +1,79 @@
+# File: app/features/transcription/data/word_codec.py
+import struct
+import numpy as np
+from typing import List, Optional, Tuple
+from ..domain.models import WordTiming
+
+# Packed layout (little-endian), one blob per segment:
+#   uint32 n
+#   float32 start[n] | float32 end[n] | float32 confidence[n]
+#       (times relative to the segment start, so float32 stays ms-accurate on 10h+ recordings)
+#   uint32 offsets[n + 1]   (byte offsets into the UTF-8 text)
+#   UTF-8 text of all words, concatenated
+# ~16 bytes per word plus the text, versus ~60 bytes of JSON, and no parser needed to read it.
+_U32 = np.dtype("<u4")
+_F32 = np.dtype("<f4")
+
+
+def pack_words(words: List[WordTiming], base: float = 0.0) -> bytes:
+    n = len(words)
+    encoded = [w.word.encode("utf-8") for w in words]
+
+    offsets = np.zeros(n + 1, dtype=_U32)
+    if n:
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+
+    return b"".join((
+        np.array([n], dtype=_U32).tobytes(),
+        np.array([w.start - base for w in words], dtype=_F32).tobytes(),
+        np.array([w.end - base for w in words], dtype=_F32).tobytes(),
+        np.array([w.confidence for w in words], dtype=_F32).tobytes(),
+        offsets.tobytes(),
+        b"".join(encoded)
+    ))
+
+
+def unpack_arrays(blob: bytes, base: float = 0.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, bytes]:
+    """
+    Array view of a packed blob: (start, end, confidence, offsets, text_bytes),
+    with absolute times. Lets callers filter by time before decoding any text.
+    """
+    if not blob:
+        empty = np.zeros(0, dtype=_F32)
+        return empty, empty, empty, np.zeros(1, dtype=_U32), b""
+
+    n = int(np.frombuffer(blob, dtype=_U32, count=1)[0])
+    pos = _U32.itemsize
+    start = np.frombuffer(blob, dtype=_F32, count=n, offset=pos) + np.float64(base)
+    end = np.frombuffer(blob, dtype=_F32, count=n, offset=pos + 4 * n) + np.float64(base)
+    confidence = np.frombuffer(blob, dtype=_F32, count=n, offset=pos + 8 * n)
+    offsets = np.frombuffer(blob, dtype=_U32, count=n + 1, offset=pos + 12 * n)
+    text = blob[pos + 16 * n + 4:]
+    return start, end, confidence, offsets, text
+
+
+def unpack_words(blob: bytes, base: float = 0.0, start: Optional[float] = None, end: Optional[float] = None) -> List[WordTiming]:
+    """
+    Decodes the words of a blob; with start/end only those overlapping [start, end).
+    Segments hold a handful of words, so one struct.unpack beats numpy's per-call overhead here.
+    """
+    if not blob:
+        return []
+
+    n = struct.unpack_from("<I", blob)[0]
+    values = struct.unpack_from(f"<{3 * n}f{n + 1}I", blob, 4)
+    starts, ends, confidences, offsets = values[:n], values[n:2 * n], values[2 * n:3 * n], values[3 * n:]
+    text = blob[16 * n + 8:]
+
+    words = []
+    for i in range(n):
+        w_start, w_end = starts[i] + base, ends[i] + base
+        if (start is not None and w_end <= start) or (end is not None and w_start >= end):
+            continue
+        words.append(WordTiming(
+            word=text[offsets[i]:offsets[i + 1]].decode("utf-8"),
+            start=w_start,
+            end=w_end,
+            confidence=confidences[i]
+        ))
+    return words
@@ -42,4 +42,61 @@ class TranscriptionResult:
     
     # Header Metadata
     duration_seconds: float = 0.0
-    processing_meta: Dict[str, Any] = field(default_factory=dict)
\ No newline at end of file
+    processing_meta: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class AudioSpan:
+    """
+    A time range of the ORIGINAL recording that gets decoded and transcribed on its own.
+    """
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class SpeechGatingConfig:
+    """
+    How VAD speech regions are turned into transcription spans.
+    """
+    padding_seconds: float = 0.25     # Context kept around each speech region (avoids clipped words)
+    merge_gap_seconds: float = 1.0    # Bridge silences shorter than this (fewer, longer spans)
+    min_span_seconds: float = 0.2     # Drop blips too short to contain a word
+
+
+@dataclass(frozen=True)
+class ChunkingConfig:
+    """
+    How a long recording is split for parallel transcription.
+    """
+    chunk_seconds: float = 600.0       # Target chunk length
+    overlap_seconds: float = 5.0       # Shared context when a chunk has to be cut mid-speech
+    min_silence_seconds: float = 0.5   # Silences at least this long are acceptable cut points
+    search_fraction: float = 0.5       # Look for a silence in the last half of each chunk
+
+
+@dataclass(frozen=True)
+class ChunkTranscript:
+    """
+    Output of one chunk, timestamps already on the original timeline.
+    """
+    span: AudioSpan
+    language: str
+    segments: List[TranscriptionSegment] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class CascadeConfig:
+    """
+    Fast model first; segments crossing any threshold are re-decoded with the accurate model.
+    Defaults mirror Whisper's own temperature-fallback thresholds.
+    """
+    accurate_model: str = "large-v3"
+    min_avg_logprob: float = -1.0         # Below -> low confidence
+    max_no_speech_prob: float = 0.6       # Above -> possibly hallucinated over silence/noise
+    max_compression_ratio: float = 2.4    # Above -> repetitive/looping output
+    padding_seconds: float = 0.2          # Context re-decoded around each weak segment
+    merge_gap_seconds: float = 1.0        # Re-decode neighbouring weak segments as one span
@@ -1,10 +1,38 @@
-from ..data.whisper_adapter import WhisperAdapter
-from ..domain.models import TranscriptionResult
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import select
+from app.core.database.connection import SessionLocal
+from ..data.backends import create_transcriber
+from ..data.sql_models import TranscriptionSegmentModel
+from ..data.word_codec import unpack_words
+from ..domain.models import TranscriptionResult, WordTiming
 
-def run_transcription(audio_path: str, model_size: str = "large-v3") -> TranscriptionResult:
+def run_transcription(audio_path: str, model_size: str = "large-v3", backend: Optional[str] = None) -> TranscriptionResult:
     """
     Standalone API for running transcription directly.
     Useful for testing or CLI tools without the full Job system.
     """
-    adapter = WhisperAdapter()
-    return adapter.transcribe(audio_path, model_size)
\ No newline at end of file
+    adapter = create_transcriber(backend)
+    return adapter.transcribe(audio_path, model_size)
+
+def get_words_in_range(transcription_id: UUID, start: float, end: float) -> List[WordTiming]:
+    """
+    Words of a stored transcription overlapping [start, end), in time order.
+    Only the segments touching the range are read (index on transcription_id, start_time),
+    and only the matching words are decoded.
+    """
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(TranscriptionSegmentModel.start_time, TranscriptionSegmentModel.words_blob)
+            .where(
+                TranscriptionSegmentModel.transcription_id == transcription_id,
+                TranscriptionSegmentModel.start_time < end,
+                TranscriptionSegmentModel.end_time > start
+            )
+            .order_by(TranscriptionSegmentModel.start_time)
+        ).all()
+
+    words: List[WordTiming] = []
+    for row in rows:
+        words.extend(unpack_words(row.words_blob, base=row.start_time, start=start, end=end))
+    return words
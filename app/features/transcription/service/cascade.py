@@ -0,0 +1,57 @@
+# File: app/features/transcription/service/cascade.py
+from bisect import bisect_right
+from typing import List
+from ..domain.models import AudioSpan, CascadeConfig, TranscriptionSegment
+
+
+def is_weak_segment(seg: TranscriptionSegment, config: CascadeConfig) -> bool:
+    """
+    True if the fast model's output looks unreliable.
+    'confidence' holds Whisper's avg_logprob; the other scores live in metadata.
+    """
+    no_speech = seg.metadata.get("no_speech_prob")
+    compression = seg.metadata.get("compression_ratio")
+    return (
+        seg.confidence < config.min_avg_logprob
+        or (no_speech is not None and no_speech > config.max_no_speech_prob)
+        or (compression is not None and compression > config.max_compression_ratio)
+    )
+
+
+def plan_redecode_spans(segments: List[TranscriptionSegment], config: CascadeConfig) -> List[AudioSpan]:
+    """
+    Padded spans around the weak segments, merged when closer than merge_gap_seconds.
+    """
+    spans: List[AudioSpan] = []
+    for seg in sorted((s for s in segments if is_weak_segment(s, config)), key=lambda s: s.start):
+        start = max(0.0, seg.start - config.padding_seconds)
+        end = seg.end + config.padding_seconds
+
+        if spans and start - spans[-1].end <= config.merge_gap_seconds:
+            spans[-1] = AudioSpan(spans[-1].start, max(spans[-1].end, end))
+        else:
+            spans.append(AudioSpan(start, end))
+    return spans
+
+
+def splice_segments(
+    fast: List[TranscriptionSegment],
+    spans: List[AudioSpan],
+    accurate: List[TranscriptionSegment]
+) -> List[TranscriptionSegment]:
+    """
+    Replaces everything the fast model produced inside the re-decoded spans
+    with the accurate model's segments for those spans (by segment midpoint).
+    """
+    # Spans don't overlap: the only candidate is the last one starting at or before the midpoint
+    spans = sorted(spans, key=lambda span: span.start)
+    starts = [span.start for span in spans]
+
+    def inside(seg: TranscriptionSegment) -> bool:
+        mid = (seg.start + seg.end) / 2
+        i = bisect_right(starts, mid) - 1
+        return i >= 0 and mid < spans[i].end
+
+    kept = [s for s in fast if not inside(s)]
+    replacements = [s for s in accurate if inside(s)]
+    return sorted(kept + replacements, key=lambda s: s.start)
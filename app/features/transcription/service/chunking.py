@@ -0,0 +1,135 @@
+# File: app/features/transcription/service/chunking.py
+from bisect import bisect_right
+from dataclasses import replace
+from typing import Iterable, Iterator, List, Optional, Tuple
+from app.features.vad.domain.models import VadSegment, VadEventType
+from ..domain.models import AudioSpan, ChunkingConfig, ChunkTranscript, TranscriptionSegment
+
+
+def plan_chunks(total_duration: float, config: ChunkingConfig, vad_segments: Optional[List[VadSegment]] = None) -> List[AudioSpan]:
+    """
+    Splits [0, total_duration] into chunks of about config.chunk_seconds.
+    1. Preferred: cut in the middle of a VAD silence found in the tail of the chunk (no overlap needed).
+    2. Fallback: cut at the fixed length and let the next chunk start overlap_seconds earlier.
+    """
+    if config.overlap_seconds >= config.chunk_seconds:
+        raise ValueError("Chunk overlap must be shorter than the chunk itself.")
+
+    cut_points = sorted(
+        (s.start + s.end) / 2
+        for s in (vad_segments or [])
+        if s.event_type == VadEventType.SILENCE and (s.end - s.start) >= config.min_silence_seconds
+    )
+
+    chunks: List[AudioSpan] = []
+    start = 0.0
+    while start < total_duration:
+        ideal_end = start + config.chunk_seconds
+        if ideal_end >= total_duration:
+            chunks.append(AudioSpan(start, total_duration))
+            break
+
+        # Latest silence midpoint inside the search window of this chunk
+        window_start = start + config.chunk_seconds * (1 - config.search_fraction)
+        idx = bisect_right(cut_points, ideal_end) - 1
+        if idx >= 0 and cut_points[idx] > window_start:
+            cut = cut_points[idx]
+            chunks.append(AudioSpan(start, cut))
+            start = cut
+        else:
+            chunks.append(AudioSpan(start, ideal_end))
+            start = ideal_end - config.overlap_seconds
+
+    return chunks
+
+
+def stitch_chunks(chunks: List[ChunkTranscript]) -> List[TranscriptionSegment]:
+    """
+    Merges per-chunk transcripts into one timeline.
+    Where two chunks overlap, each owns the half of the overlap nearest to it;
+    segments and words are kept only by the chunk that owns their midpoint.
+    """
+    ordered = sorted(chunks, key=lambda c: c.span.start)
+
+    stitched: List[TranscriptionSegment] = []
+    for i, chunk in enumerate(ordered):
+        own_start = _boundary(ordered[i - 1].span, chunk.span) if i > 0 else float("-inf")
+        own_end = _boundary(chunk.span, ordered[i + 1].span) if i + 1 < len(ordered) else float("inf")
+
+        for seg in chunk.segments:
+            kept = _clip_segment(seg, own_start, own_end)
+            if kept is not None:
+                stitched.append(kept)
+
+    stitched.sort(key=lambda s: s.start)
+    return stitched
+
+
+def stitch_incremental(transcripts: Iterable[ChunkTranscript],
+                       resume_from: float = float("-inf")) -> Iterator[Tuple[float, ChunkTranscript]]:
+    """
+    stitch_chunks for transcripts that arrive one at a time, in timeline order.
+    Yields (owned_until, transcript) as soon as a chunk's ownership is settled,
+    i.e. once its successor is known (the last chunk is settled at its end).
+    The transcript carries only the segments that chunk owns; everything
+    before 'resume_from' is treated as already stored and dropped.
+    """
+    previous: Optional[ChunkTranscript] = None
+    own_start = resume_from
+    for chunk in transcripts:
+        if previous is not None:
+            boundary = max(own_start, _boundary(previous.span, chunk.span))
+            yield boundary, _owned(previous, own_start, boundary)
+            own_start = boundary
+        previous = chunk
+
+    if previous is not None:
+        yield max(own_start, previous.span.end), _owned(previous, own_start, float("inf"))
+
+
+def chunks_after(chunks: List[AudioSpan], checkpoint: float) -> List[AudioSpan]:
+    """
+    The planned chunks that still own audio past 'checkpoint'
+    (an 'owned_until' reported by stitch_incremental for the same plan).
+    """
+    for i, chunk in enumerate(chunks):
+        own_end = _boundary(chunk, chunks[i + 1]) if i + 1 < len(chunks) else chunk.end
+        if own_end > checkpoint:
+            return chunks[i:]
+    return []
+
+
+def _owned(chunk: ChunkTranscript, own_start: float, own_end: float) -> ChunkTranscript:
+    kept = [s for s in (_clip_segment(seg, own_start, own_end) for seg in chunk.segments) if s is not None]
+    kept.sort(key=lambda s: s.start)
+    return replace(chunk, segments=kept)
+
+
+def _boundary(left: AudioSpan, right: AudioSpan) -> float:
+    # Middle of the overlap; for chunks cut at a silence this is the cut itself.
+    return (right.start + left.end) / 2
+
+
+def _owns(start: float, end: float, own_start: float, own_end: float) -> bool:
+    mid = (start + end) / 2
+    return own_start <= mid < own_end
+
+
+def _clip_segment(seg: TranscriptionSegment, own_start: float, own_end: float) -> Optional[TranscriptionSegment]:
+    if not seg.words:
+        return seg if _owns(seg.start, seg.end, own_start, own_end) else None
+
+    words = [w for w in seg.words if _owns(w.start, w.end, own_start, own_end)]
+    if not words:
+        return None
+    if len(words) == len(seg.words):
+        return seg
+
+    # Segment straddles the boundary: keep only the words this chunk owns
+    return replace(
+        seg,
+        start=words[0].start,
+        end=words[-1].end,
+        text=" ".join(w.word for w in words),
+        words=words
+    )
@@ -1,11 +1,27 @@
 # File: app/features/transcription/service/job_handler.py
+import time
 import logging
+from contextlib import closing
+from dataclasses import replace
+from typing import Iterator, List, Optional
 from uuid import UUID
+from sqlalchemy import select, update
+from app.core.config.settings import settings
 from app.core.database.connection import SessionLocal
-from app.core.jobs.models import JobModel, JobStatus
+from app.core.jobs.models import JobModel, JobStatus, JobType
 from app.features.storage.data.sql_models import SourceModel
+from app.features.audio_extraction.service.api import probe_duration
+from app.features.vad.service.api import run_vad_analysis
 from ..data.whisper_adapter import WhisperAdapter
+from ..data.backends import create_transcriber
+from ..data.bulk_writer import TranscriptionBulkWriter
+from ..data.word_codec import pack_words
 from ..data.sql_models import TranscriptionModel, TranscriptionSegmentModel
+from ..domain.models import SpeechGatingConfig, ChunkingConfig, CascadeConfig, TranscriptionResult, TranscriptionSegment
+from .speech_gating import build_speech_spans
+from .chunking import plan_chunks, stitch_chunks, stitch_incremental, chunks_after
+from .cascade import is_weak_segment, plan_redecode_spans, splice_segments
+from .result_cache import build_cache_key, find_cached_transcription, clone_transcription
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +31,7 @@ class TranscriptionHandler:
     Updated to save Rich Metadata to DB.
     """
     
-    def handle(self, source_id: UUID, params: dict) -> dict:
+    def handle(self, source_id: UUID, params: dict, job_id: Optional[UUID] = None) -> dict:
         logger.info(f"Processing Transcription for Source: {source_id}")
 
         with SessionLocal() as db:
@@ -29,65 +45,433 @@ class TranscriptionHandler:
                 raise ValueError(f"Source {source_id} has no associated file.")
                 
             audio_path = file_record.file_path
+            file_hash = file_record.file_hash
             model_size = params.get("model_size", "base")
+            backend = params.get("backend", settings.TRANSCRIPTION_BACKEND)
 
-            # 2. Execute Transcription
-            adapter = WhisperAdapter()
-            result = adapter.transcribe(audio_path, model_size)
-
-            # 3. Retrieve the Job ID
-            job = db.query(JobModel).filter(
-                JobModel.source_id == source_id,
-                JobModel.status == JobStatus.PROCESSING
-            ).first()
+            # 2. Retrieve the Job
+            # Checkpoints and the partial header are keyed by it, so it must be this job:
+            # JobManager passes its id. Direct callers fall back to the source's only
+            # PROCESSING transcription job (other job types may run on the source concurrently).
+            job = self._resolve_job(db, source_id, job_id)
             job_id_val = job.id if job else None
-            
+
             if not job_id_val:
                 logger.warning("No active JOB found for this transcription.")
                 # If rigorous, create dummy job or raise error. 
                 # For now, we proceed to allow testing.
 
-            # 4. Save Header
-            transcription = TranscriptionModel(
+            # 3. Result Cache
+            # Same bytes + model + decode options were already transcribed (e.g. a duplicate source)
+            adapter = create_transcriber(backend)
+            cache_key = build_cache_key(file_hash, model_size, adapter.backend, params)
+            if params.get("use_cache", True):
+                cached = find_cached_transcription(db, cache_key)
+                if cached is not None:
+                    clone, segment_count = clone_transcription(db, cached, source.id, job_id_val)
+                    db.commit()
+                    return {
+                        "transcription_id": str(clone.id),
+                        "segment_count": segment_count,
+                        "language": clone.language,
+                        "cache_hit": True,
+                        "compute_seconds_saved": clone.processing_meta["compute_seconds_saved"]
+                    }
+
+            # 4. Execute Transcription
+            # With 'vad_gating', only the speech regions found by VAD are decoded.
+            # Long recordings are split into chunks and transcribed in parallel;
+            # everything else is streamed window by window to keep memory flat.
+            mode_stats = {}
+            if params.get("vad_gating", False):
+                result, mode_stats["vad_gating"] = self._transcribe_speech_only(adapter, audio_path, file_hash, model_size, params)
+            else:
+                duration = self._chunking_duration(audio_path, params)
+                streaming = params.get("streaming", settings.TRANSCRIPTION_STREAMING)
+                if (duration is not None or streaming) and self._can_checkpoint(job, params):
+                    # Segments are committed as they are produced; see _transcribe_checkpointed
+                    return self._transcribe_checkpointed(db, job, source.id, adapter, audio_path, file_hash,
+                                                         model_size, duration, cache_key, params)
+                if duration is not None:
+                    result = self._transcribe_chunked(adapter, audio_path, file_hash, model_size, duration, params)
+                elif streaming:
+                    result = self._transcribe_streaming(adapter, audio_path, file_hash, model_size, params)
+                else:
+                    result = adapter.transcribe(audio_path, model_size, file_hash)
+
+            # With 'cascade', weak segments are re-decoded by the accurate model
+            if params.get("cascade", False):
+                result, mode_stats["cascade"] = self._refine_weak_segments(adapter, audio_path, file_hash, result, params)
+
+            # 5. Save Header & Segments (set-based, no per-row ORM objects)
+            writer = TranscriptionBulkWriter()
+            transcription_id = writer.insert_header(
+                db,
                 source_id=source.id,
                 job_id=job_id_val,
                 language=result.language,
                 model_used=result.model_used,
                 full_text=result.full_text,
-                processing_meta=result.processing_meta
+                cache_key=cache_key,
+                processing_meta={**result.processing_meta, **mode_stats}
             )
+
+            # 6. Save Segments with Rich Metadata
+            writer.insert_segments(db, self._segment_rows(transcription_id, result.segments))
+
+            db.commit()
             
-            db.add(transcription)
-            db.flush() 
+            logger.info(f"Transcription saved. ID: {transcription_id}, Segments: {len(result.segments)}")
+            
+            summary = {
+                "transcription_id": str(transcription_id),
+                "segment_count": len(result.segments),
+                "language": result.language,
+                "cache_hit": False
+            }
+            summary.update(mode_stats)
+            return summary
 
-            # 5. Save Segments with Rich Metadata
-            for seg in result.segments:
-                
-                # Serialize the domain objects to JSON dicts
-                meta_payload = {
+    @staticmethod
+    def _segment_rows(transcription_id: UUID, segments: List[TranscriptionSegment]) -> Iterator[dict]:
+        """
+        Serializes domain segments into bulk-writer rows.
+        speaker_id remains NULL until Pipeline feature is built.
+        """
+        for seg in segments:
+            yield {
+                "transcription_id": transcription_id,
+                "start_time": seg.start,
+                "end_time": seg.end,
+                "text": seg.text,
+                "meta_data": {
                     "confidence": seg.confidence,
-                    "words": [
-                        {"w": w.word, "s": w.start, "e": w.end, "c": w.confidence} 
-                        for w in seg.words
-                    ],
+                    "word_count": len(seg.words),
                     "raw_meta": seg.metadata
-                }
+                },
+                # Word timings are stored packed, not as JSON (see get_words_in_range)
+                "words_blob": pack_words(seg.words, base=seg.start)
+            }
+
+    @staticmethod
+    def _resolve_job(db, source_id: UUID, job_id: Optional[UUID]) -> Optional[JobModel]:
+        if job_id is not None:
+            return db.get(JobModel, job_id)
+
+        candidates = db.query(JobModel).filter(
+            JobModel.source_id == source_id,
+            JobModel.job_type == JobType.TRANSCRIPTION,
+            JobModel.status == JobStatus.PROCESSING
+        ).order_by(JobModel.created_at, JobModel.id).limit(2).all()
+        if len(candidates) > 1:
+            logger.warning(f"Several transcription jobs are running for Source {source_id}; pass job_id to checkpoint.")
+            return None
+        return candidates[0] if candidates else None
 
-                db.add(TranscriptionSegmentModel(
-                    transcription_id=transcription.id,
-                    start_time=seg.start,
-                    end_time=seg.end,
-                    text=seg.text,
-                    # speaker_id remains NULL until Pipeline feature is built
-                    meta_data=meta_payload
-                ))
+    @staticmethod
+    def _can_checkpoint(job: Optional[JobModel], params: dict) -> bool:
+        # Cascade rewrites segments after the first pass, so it needs the whole result in memory
+        if job is None or params.get("cascade", False):
+            return False
+        return params.get("checkpointing", settings.TRANSCRIPTION_CHECKPOINTING)
 
+    def _transcribe_checkpointed(self, db, job: JobModel, source_id: UUID, adapter: WhisperAdapter, audio_path: str,
+                                 file_hash: str, model_size: str, duration: Optional[float], cache_key: str, params: dict) -> dict:
+        """
+        Chunked or streaming mode with checkpoints.
+        Every chunk/window is committed as soon as its stitching is settled, together with
+        the job's high-water mark (JobModel.checkpoint_seconds). Until the last one lands,
+        the header is flagged is_complete=False and its segments can already be read.
+        A retried job finds its partial header and resumes from the checkpoint.
+        """
+        started = time.monotonic()
+        writer = TranscriptionBulkWriter()
+        overlap = params.get("chunk_overlap", settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS)
+
+        partial = db.execute(
+            select(TranscriptionModel)
+            .where(TranscriptionModel.job_id == job.id, TranscriptionModel.is_complete.is_(False))
+            .limit(1)
+        ).scalars().first()
+
+        if partial is not None:
+            transcription_id = partial.id
+            resume_from = job.checkpoint_seconds or 0.0
+            previous_meta = partial.processing_meta or {}
+            logger.info(f"Resuming transcription {transcription_id} from {resume_from:.1f}s.")
+        else:
+            # No cache_key yet: a partial transcript must never be served as a cache hit
+            transcription_id = writer.insert_header(
+                db,
+                source_id=source_id,
+                job_id=job.id,
+                language="unknown",
+                model_used=model_size,
+                full_text="",
+                is_complete=False,
+                processing_meta={"device": adapter.device, "backend": adapter.backend}
+            )
+            resume_from = 0.0
+            previous_meta = {}
+            job.checkpoint_seconds = resume_from
             db.commit()
-            
-            logger.info(f"Transcription saved. ID: {transcription.id}, Segments: {len(result.segments)}")
-            
-            return {
-                "transcription_id": str(transcription.id),
-                "segment_count": len(result.segments),
-                "language": result.language
-            }
\ No newline at end of file
+
+        if duration is not None:
+            config = ChunkingConfig(
+                chunk_seconds=params.get("chunk_seconds", settings.TRANSCRIPTION_CHUNK_SECONDS),
+                overlap_seconds=overlap
+            )
+            workers = params.get("chunk_workers", settings.TRANSCRIPTION_CHUNK_WORKERS)
+            vad_segments = run_vad_analysis(audio_path, file_hash) if params.get("chunk_on_silence", True) else None
+            chunks = plan_chunks(duration, config, vad_segments)
+            # The plan is deterministic, so chunks settled before the checkpoint are skipped
+            remaining = chunks_after(chunks, resume_from)
+            transcripts = adapter.iter_chunks(audio_path, model_size, remaining, workers, file_hash)
+            mode_meta = {"chunks": len(chunks), "chunk_workers": workers}
+        else:
+            # Restart one overlap early so the first resumed window has left context
+            transcripts = adapter.transcribe_stream(
+                audio_path,
+                model_size,
+                window_seconds=params.get("stream_window_seconds", settings.TRANSCRIPTION_STREAM_WINDOW_SECONDS),
+                overlap_seconds=overlap,
+                file_hash=file_hash,
+                start=max(0.0, resume_from - overlap)
+            )
+            mode_meta = {}
+
+        language = partial.language if partial is not None else "unknown"
+        committed = 0
+        # The generator holds the model lease (or the worker pool) while suspended:
+        # close it as soon as we stop, even when a commit or the stitch fails.
+        with closing(transcripts):
+            for owned_until, transcript in stitch_incremental(transcripts, resume_from):
+                if language == "unknown":
+                    language = transcript.language
+                writer.insert_segments(db, self._segment_rows(transcription_id, transcript.segments))
+                job.checkpoint_seconds = owned_until
+                db.commit()
+                committed += 1
+                logger.debug(f"Transcription {transcription_id}: Checkpoint at {owned_until:.1f}s.")
+
+        # Finalize the header from the committed segments (they may span several attempts)
+        texts = db.execute(
+            select(TranscriptionSegmentModel.text)
+            .where(TranscriptionSegmentModel.transcription_id == transcription_id)
+            .order_by(TranscriptionSegmentModel.start_time)
+        ).scalars().all()
+
+        audio_seconds = duration if duration is not None else job.checkpoint_seconds or 0.0
+        elapsed = time.monotonic() - started
+        total_elapsed = previous_meta.get("elapsed_seconds", 0.0) + elapsed
+        db.execute(
+            update(TranscriptionModel)
+            .where(TranscriptionModel.id == transcription_id)
+            .values(
+                language=language,
+                full_text=" ".join(t for t in texts if t),
+                cache_key=cache_key,
+                is_complete=True,
+                processing_meta={
+                    "device": adapter.device,
+                    "backend": adapter.backend,
+                    "elapsed_seconds": total_elapsed,
+                    "rtf": total_elapsed / audio_seconds if audio_seconds > 0 else 0.0,
+                    "checkpoints": previous_meta.get("checkpoints", 0) + committed,
+                    "resumed_from": resume_from if partial is not None else None,
+                    **mode_meta
+                }
+            )
+        )
+        db.commit()
+
+        logger.info(
+            f"Transcription saved. ID: {transcription_id}, Segments: {len(texts)} "
+            f"({committed} checkpoint(s), resumed from {resume_from:.1f}s)."
+        )
+        return {
+            "transcription_id": str(transcription_id),
+            "segment_count": len(texts),
+            "language": language,
+            "cache_hit": False,
+            "resumed_from": resume_from if partial is not None else None
+        }
+
+    @staticmethod
+    def _chunking_duration(audio_path: str, params: dict) -> Optional[float]:
+        """
+        Returns the recording length if it should be chunked, else None.
+        'chunked' forces the mode on/off; by default it kicks in above the configured threshold.
+        """
+        chunked = params.get("chunked")
+        if chunked is False:
+            return None
+
+        try:
+            duration = probe_duration(audio_path)
+        except RuntimeError as e:
+            if chunked:
+                raise
+            logger.warning(f"Could not probe duration, transcribing in one pass: {e}")
+            return None
+
+        if chunked or duration > settings.TRANSCRIPTION_CHUNKING_THRESHOLD_SECONDS:
+            return duration
+        return None
+
+    @staticmethod
+    def _transcribe_chunked(adapter: WhisperAdapter, audio_path: str, file_hash: str, model_size: str, duration: float, params: dict) -> TranscriptionResult:
+        """
+        Chunked mode: cut at VAD silences where possible, transcribe chunks in parallel, stitch overlaps.
+        """
+        started = time.monotonic()
+        config = ChunkingConfig(
+            chunk_seconds=params.get("chunk_seconds", settings.TRANSCRIPTION_CHUNK_SECONDS),
+            overlap_seconds=params.get("chunk_overlap", settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS)
+        )
+        workers = params.get("chunk_workers", settings.TRANSCRIPTION_CHUNK_WORKERS)
+
+        vad_segments = run_vad_analysis(audio_path, file_hash) if params.get("chunk_on_silence", True) else None
+        chunks = plan_chunks(duration, config, vad_segments)
+        transcripts = adapter.transcribe_chunks(audio_path, model_size, chunks, workers, file_hash)
+        segments = stitch_chunks(transcripts)
+
+        language = next((t.language for t in transcripts if t.language != "unknown"), "unknown")
+        elapsed = time.monotonic() - started
+        logger.info(f"Chunked transcription: {len(chunks)} chunk(s) of {duration:.1f}s in {elapsed:.1f}s.")
+
+        return TranscriptionResult(
+            source_file=audio_path,
+            language=language,
+            model_used=model_size,
+            full_text=" ".join(s.text for s in segments if s.text),
+            segments=segments,
+            duration_seconds=duration,
+            processing_meta={
+                "device": adapter.device,
+                "elapsed_seconds": elapsed,
+                "chunks": len(chunks),
+                "chunk_workers": workers,
+                "rtf": elapsed / duration if duration > 0 else 0.0
+            }
+        )
+
+    @staticmethod
+    def _transcribe_streaming(adapter: WhisperAdapter, audio_path: str, file_hash: str, model_size: str, params: dict) -> TranscriptionResult:
+        """
+        Streaming mode: decode through a pipe in fixed windows and stitch the window overlaps.
+        """
+        started = time.monotonic()
+        transcripts = list(adapter.transcribe_stream(
+            audio_path,
+            model_size,
+            window_seconds=params.get("stream_window_seconds", settings.TRANSCRIPTION_STREAM_WINDOW_SECONDS),
+            overlap_seconds=params.get("chunk_overlap", settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS),
+            file_hash=file_hash
+        ))
+        segments = stitch_chunks(transcripts)
+
+        duration = max((t.span.end for t in transcripts), default=0.0)
+        elapsed = time.monotonic() - started
+        return TranscriptionResult(
+            source_file=audio_path,
+            language=next((t.language for t in transcripts if t.language != "unknown"), "unknown"),
+            model_used=model_size,
+            full_text=" ".join(s.text for s in segments if s.text),
+            segments=segments,
+            duration_seconds=duration,
+            processing_meta={
+                "device": adapter.device,
+                "elapsed_seconds": elapsed,
+                "windows": len(transcripts),
+                "rtf": elapsed / duration if duration > 0 else 0.0
+            }
+        )
+
+    @staticmethod
+    def _refine_weak_segments(adapter: WhisperAdapter, audio_path: str, file_hash: str, result: TranscriptionResult, params: dict):
+        """
+        Cascade mode: re-transcribe only the low-confidence spans with the accurate model
+        and splice its segments in. Returns (result, stats).
+        """
+        config = CascadeConfig(
+            accurate_model=params.get("cascade_model", settings.WHISPER_MODEL_NAME),
+            min_avg_logprob=params.get("cascade_min_avg_logprob", -1.0),
+            max_no_speech_prob=params.get("cascade_max_no_speech_prob", 0.6),
+            max_compression_ratio=params.get("cascade_max_compression_ratio", 2.4)
+        )
+
+        spans = plan_redecode_spans(result.segments, config)
+        weak_count = sum(1 for seg in result.segments if is_weak_segment(seg, config))
+        audio_seconds = result.duration_seconds or max((s.end for s in result.segments), default=0.0)
+        redecoded = sum(span.duration for span in spans)
+
+        stats = {
+            "fast_model": result.model_used,
+            "accurate_model": config.accurate_model,
+            "segments": len(result.segments),
+            "weak_segments": weak_count,
+            "redecoded_spans": len(spans),
+            "redecoded_seconds": redecoded,
+            "redecoded_fraction": redecoded / audio_seconds if audio_seconds > 0 else 0.0,
+            "fast_elapsed_seconds": result.processing_meta.get("elapsed_seconds", 0.0),
+            "accurate_elapsed_seconds": 0.0
+        }
+        if not spans:
+            return result, stats
+
+        refined = adapter.transcribe_spans(audio_path, config.accurate_model, spans, file_hash)
+        segments = splice_segments(result.segments, spans, refined.segments)
+        stats["accurate_elapsed_seconds"] = refined.processing_meta.get("elapsed_seconds", 0.0)
+
+        logger.info(
+            f"Cascade: Re-decoded {weak_count} weak segment(s) ({redecoded:.1f}s of {audio_seconds:.1f}s) "
+            f"with {config.accurate_model}."
+        )
+        return replace(
+            result,
+            model_used=f"{result.model_used}+{config.accurate_model}",
+            full_text=" ".join(s.text for s in segments if s.text),
+            segments=segments,
+            processing_meta={
+                **result.processing_meta,
+                "elapsed_seconds": stats["fast_elapsed_seconds"] + stats["accurate_elapsed_seconds"]
+            }
+        ), stats
+
+    @staticmethod
+    def _transcribe_speech_only(adapter: WhisperAdapter, audio_path: str, file_hash: str, model_size: str, params: dict):
+        """
+        VAD-gated mode: run VAD, merge speech regions into padded spans and transcribe only those.
+        Returns (result, stats).
+        """
+        config = SpeechGatingConfig(
+            padding_seconds=params.get("vad_padding", 0.25),
+            merge_gap_seconds=params.get("vad_merge_gap", 1.0),
+            min_span_seconds=params.get("vad_min_span", 0.2)
+        )
+
+        vad_segments = run_vad_analysis(audio_path, file_hash)
+        spans = build_speech_spans(vad_segments, config)
+        result: TranscriptionResult = adapter.transcribe_spans(audio_path, model_size, spans, file_hash)
+
+        total = max((s.end for s in vad_segments), default=0.0)
+        decoded = sum(span.duration for span in spans)
+        elapsed = result.processing_meta.get("elapsed_seconds", 0.0)
+
+        # Realtime factor = processing seconds per audio second.
+        # Without gating the engine would spend the same per-second cost on the whole timeline,
+        # so elapsed/decoded estimates the ungated RTF; elapsed/total is what gating achieved.
+        stats = {
+            "speech_spans": len(spans),
+            "audio_seconds_total": total,
+            "audio_seconds_decoded": decoded,
+            "audio_seconds_skipped": max(0.0, total - decoded),
+            "rtf_gated": elapsed / total if total > 0 else 0.0,
+            "rtf_ungated_estimate": elapsed / decoded if decoded > 0 else 0.0
+        }
+        logger.info(
+            f"VAD gating: decoded {decoded:.1f}s of {total:.1f}s in {len(spans)} span(s) "
+            f"(skipped {stats['audio_seconds_skipped']:.1f}s)."
+        )
+        return result, stats
\ No newline at end of file
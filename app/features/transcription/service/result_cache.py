@@ -0,0 +1,127 @@
+# File: app/features/transcription/service/result_cache.py
+import json
+import hashlib
+import logging
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core.config.settings import settings
+from ..data.sql_models import TranscriptionModel, TranscriptionSegmentModel
+from ..data.bulk_writer import TranscriptionBulkWriter
+
+logger = logging.getLogger(__name__)
+
+# Bump when a change to the pipeline makes older cached transcripts stale.
+CACHE_KEY_VERSION = 2
+
+# Job params that change how work is scheduled, not what is transcribed.
+# 'backend' is keyed by the resolved adapter instead (see build_cache_key).
+_NON_OUTPUT_PARAMS = {"model_size", "backend", "use_cache", "chunk_workers", "checkpointing"}
+
+
+def effective_decode_options(params: dict) -> dict:
+    """
+    Every option that shapes the transcript, with the configured default filled in
+    where the job leaves it out: a settings change then changes the key, and an
+    explicit default keys the same as an omitted one.
+    """
+    options = {k: v for k, v in params.items() if k not in _NON_OUTPUT_PARAMS}
+    defaults = {
+        "vad_gating": False,
+        "chunked": None,
+        "chunking_threshold_seconds": settings.TRANSCRIPTION_CHUNKING_THRESHOLD_SECONDS,
+        "chunk_seconds": settings.TRANSCRIPTION_CHUNK_SECONDS,
+        "chunk_overlap": settings.TRANSCRIPTION_CHUNK_OVERLAP_SECONDS,
+        "chunk_on_silence": True,
+        "streaming": settings.TRANSCRIPTION_STREAMING,
+        "stream_window_seconds": settings.TRANSCRIPTION_STREAM_WINDOW_SECONDS,
+        "cascade": False,
+        # Silence cut points and speech gating follow the VAD timeline
+        "vad_backend": settings.VAD_BACKEND,
+    }
+    if options.get("vad_gating", False):
+        defaults.update({"vad_padding": 0.25, "vad_merge_gap": 1.0, "vad_min_span": 0.2})
+    if options.get("cascade", False):
+        defaults.update({
+            "cascade_model": settings.WHISPER_MODEL_NAME,
+            "cascade_min_avg_logprob": -1.0,
+            "cascade_max_no_speech_prob": 0.6,
+            "cascade_max_compression_ratio": 2.4
+        })
+    return {**defaults, **options}
+
+
+def build_cache_key(file_hash: str, model_size: str, backend: str, params: dict) -> str:
+    """
+    Identity of a transcription: same bytes + same model (backend and size) + same effective
+    decode options = same result. 'backend' is the adapter actually used (after fallbacks).
+    """
+    payload = json.dumps(
+        {"v": CACHE_KEY_VERSION, "file": file_hash, "backend": backend, "model": model_size,
+         "options": effective_decode_options(params)},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def find_cached_transcription(db: Session, cache_key: str) -> Optional[TranscriptionModel]:
+    return db.execute(
+        select(TranscriptionModel)
+        .where(TranscriptionModel.cache_key == cache_key, TranscriptionModel.is_complete.is_(True))
+        .order_by(TranscriptionModel.created_at.desc())
+        .limit(1)
+    ).scalars().first()
+
+
+def clone_transcription(db: Session, cached: TranscriptionModel, source_id: UUID, job_id: UUID) -> Tuple[TranscriptionModel, int]:
+    """
+    Copies a finished transcription onto another source (header + all segments).
+    Returns the new header and the number of segments copied.
+    Segments are copied with the bulk writer; no ORM objects are built for them.
+    Speaker links are per source, so they are left for this source's own diarization.
+    """
+    compute_seconds = float((cached.processing_meta or {}).get("elapsed_seconds", 0.0))
+
+    clone = TranscriptionModel(
+        source_id=source_id,
+        job_id=job_id,
+        language=cached.language,
+        model_used=cached.model_used,
+        full_text=cached.full_text,
+        cache_key=cached.cache_key,
+        processing_meta={
+            **(cached.processing_meta or {}),
+            "cache_hit": True,
+            "cloned_from": str(cached.id),
+            "compute_seconds_saved": compute_seconds
+        }
+    )
+    db.add(clone)
+    db.flush()
+
+    rows = db.execute(
+        select(
+            TranscriptionSegmentModel.start_time,
+            TranscriptionSegmentModel.end_time,
+            TranscriptionSegmentModel.text,
+            TranscriptionSegmentModel.meta_data,
+            TranscriptionSegmentModel.words_blob
+        ).where(TranscriptionSegmentModel.transcription_id == cached.id)
+    ).all()
+
+    TranscriptionBulkWriter().insert_segments(db, (
+        {
+            "transcription_id": clone.id,
+            "start_time": row.start_time,
+            "end_time": row.end_time,
+            "text": row.text,
+            "meta_data": row.meta_data,
+            "words_blob": row.words_blob
+        }
+        for row in rows
+    ))
+
+    logger.info(f"Transcription cache hit: Cloned {cached.id} ({len(rows)} segments, saved {compute_seconds:.1f}s).")
+    return clone, len(rows)
@@ -0,0 +1,31 @@
+# File: app/features/transcription/service/speech_gating.py
+from typing import List
+from app.features.vad.domain.models import VadSegment, VadEventType
+from ..domain.models import AudioSpan, SpeechGatingConfig
+
+
+def build_speech_spans(segments: List[VadSegment], config: SpeechGatingConfig) -> List[AudioSpan]:
+    """
+    Turns VAD output into the spans worth transcribing.
+    1. Keep SPEECH regions (at least min_span_seconds long).
+    2. Pad each side by padding_seconds (clamped to the recording).
+    3. Merge spans that overlap or are separated by less than merge_gap_seconds.
+    """
+    total_duration = max((s.end for s in segments), default=0.0)
+
+    speech = sorted(
+        (s for s in segments if s.event_type == VadEventType.SPEECH and (s.end - s.start) >= config.min_span_seconds),
+        key=lambda s: s.start
+    )
+
+    spans: List[AudioSpan] = []
+    for seg in speech:
+        start = max(0.0, seg.start - config.padding_seconds)
+        end = min(total_duration, seg.end + config.padding_seconds)
+
+        if spans and start - spans[-1].end <= config.merge_gap_seconds:
+            spans[-1] = AudioSpan(spans[-1].start, max(spans[-1].end, end))
+        else:
+            spans.append(AudioSpan(start, end))
+
+    return spans
@@ -0,0 +1,23 @@
+# File: app/features/vad/data/backends.py
+from typing import Optional, Union
+from app.core.config.settings import settings
+from .marblenet_adapter import MarbleNetAdapter
+from .energy_adapter import EnergyVadAdapter
+
+# Energy first, MarbleNet for borderline files (resolved in service/api.py)
+AUTO_BACKEND = "auto"
+
+VAD_BACKENDS = {
+    MarbleNetAdapter.backend: MarbleNetAdapter,
+    EnergyVadAdapter.backend: EnergyVadAdapter,
+}
+
+
+def create_vad_adapter(backend: Optional[str] = None) -> Union[MarbleNetAdapter, EnergyVadAdapter]:
+    """
+    Adapter for the requested backend (job payload), else settings.VAD_BACKEND.
+    """
+    backend = backend or settings.VAD_BACKEND
+    if backend not in VAD_BACKENDS:
+        raise ValueError(f"Unknown VAD backend: {backend}")
+    return VAD_BACKENDS[backend]()
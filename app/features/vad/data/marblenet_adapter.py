@@ -1,9 +1,11 @@
 # File: app/features/vad/data/marblenet_adapter.py
 import logging
-from typing import List
+import numpy as np
+from functools import partial
+from typing import Optional
 from app.core.config.settings import settings
 from app.core.model_lifecycle.orchestrator import ModelOrchestrator, ModelType
-from ..domain.models import VadSegment, VadEventType
+from app.features.audio_extraction.service.api import load_pcm
 
 logger = logging.getLogger(__name__)
 
@@ -11,39 +13,43 @@ class MarbleNetAdapter:
     """
     Wrapper for NVIDIA MarbleNet (VAD).
     """
+    backend = "marblenet"
+    # Part of the stored timeline key: timelines of different models may disagree
+    model_name = "vad_marblenet"
+    frame_seconds = 0.02
+
     def __init__(self):
         self.orchestrator = ModelOrchestrator()
     
-    def detect_voice(self, audio_path: str) -> List[VadSegment]:
-        logger.info(f"Running VAD (MarbleNet) on {audio_path}...")
-
+    def model_loader(self):
+        """Loader callable for the ModelOrchestrator (also used for prefetching)."""
         def loader():
             # from nemo.collections.asr.models import EncDecClassificationModel
             # return EncDecClassificationModel.from_pretrained(model_name="vad_marblenet")
             
             # Mock for architecture
             class MockVad:
-                def process(self, path):
+                def process(self, audio):
+                    # 'audio()' returns the 16 kHz PCM; the mock doesn't need it
+                    # Real: one speech probability per 20 ms frame
                     # Simulate: 0-5s Speech, 5-10s Silence
-                    return [
-                        (0.0, 5.0, "speech"),
-                        (5.0, 10.0, "silence")
-                    ]
+                    rng = np.random.default_rng(0)
+                    speech = np.clip(rng.normal(0.9, 0.05, 250), 0.0, 1.0)
+                    silence = np.clip(rng.normal(0.05, 0.05, 250), 0.0, 1.0)
+                    return np.concatenate([speech, silence]).astype(np.float32)
             return MockVad()
+        return loader
+
+    def speech_probabilities(self, audio_path: str, file_hash: Optional[str] = None) -> np.ndarray:
+        """
+        Frame-level speech probabilities, one per 'frame_seconds'.
+        Segments are derived from them in service/postprocessing.py.
+        """
+        logger.info(f"Running VAD (MarbleNet) on {audio_path}...")
+
+        # The model pulls PCM on demand, memory-mapped from the shared decoded-audio cache
+        audio = partial(load_pcm, audio_path, file_hash)
 
         # FIXED: Use ModelType.NEMO_VAD instead of MARBLENET_VAD
-        model = self.orchestrator.request_model(ModelType.NEMO_VAD, loader)
-        
-        results = model.process(audio_path)
-        
-        segments = []
-        for start, end, label in results:
-            e_type = VadEventType.SPEECH if label == "speech" else VadEventType.SILENCE
-            segments.append(VadSegment(
-                start=start, 
-                end=end, 
-                event_type=e_type,
-                confidence=0.95
-            ))
-            
-        return segments
\ No newline at end of file
+        with self.orchestrator.lease(ModelType.NEMO_VAD, self.model_loader()) as model:
+            return np.asarray(model.process(audio), dtype=np.float32)
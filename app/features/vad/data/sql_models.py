@@ -0,0 +1,58 @@
+# File: app/features/vad/data/sql_models.py
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Enum as SQLEnum, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database.base import Base
+from ..domain.models import VadEventType
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+class VadRunModel(Base):
+    """
+    The Header record of a VAD timeline.
+    Keyed by file_hash (not source): every source of the same bytes shares one timeline.
+    """
+    __tablename__ = "vad_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    file_hash = Column(String, nullable=False, index=True)
+    model_name = Column(String, nullable=False)
+
+    # Summary stats, so pre-flight checks never have to read the segments
+    total_seconds = Column(Float, nullable=False, default=0.0)
+    speech_seconds = Column(Float, nullable=False, default=0.0)
+    segment_count = Column(Integer, nullable=False, default=0)
+
+    # Longest segment; bounds the start_time range scan of interval queries
+    max_segment_seconds = Column(Float, nullable=False, default=0.0)
+
+    created_at = Column(DateTime(timezone=True), default=utc_now)
+
+    segments = relationship("VadSegmentModel", back_populates="run", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        UniqueConstraint('file_hash', 'model_name', name='uix_vad_run_file_model'),
+    )
+
+class VadSegmentModel(Base):
+    """
+    One speech or silence interval of a VAD timeline.
+    """
+    __tablename__ = "vad_segments"
+    __table_args__ = (
+        # "Intervals overlapping [t0, t1]" lookups
+        Index("ix_vad_segments_run_start", "run_id", "start_time"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    run_id = Column(UUID(as_uuid=True), ForeignKey("vad_runs.id", ondelete="CASCADE"), nullable=False)
+
+    start_time = Column(Float, nullable=False)
+    end_time = Column(Float, nullable=False)
+    event_type = Column(SQLEnum(VadEventType), nullable=False)
+    confidence = Column(Float, nullable=False, default=0.0)
+
+    run = relationship("VadRunModel", back_populates="segments")
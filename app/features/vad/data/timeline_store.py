@@ -0,0 +1,82 @@
+# File: app/features/vad/data/timeline_store.py
+import uuid
+import logging
+from typing import List, Optional, Sequence
+from sqlalchemy import select, delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..domain.models import VadSegment, VadEventType
+from .sql_models import VadRunModel, VadSegmentModel
+
+logger = logging.getLogger(__name__)
+
+
+class VadTimelineStore:
+    """
+    Persists VAD timelines (vad_runs + vad_segments) and answers interval queries.
+
+    Segments of one timeline never overlap, so anything overlapping [t0, t1] starts in
+    [t0 - longest segment, t1): the lookup is a bounded range scan on (run_id, start_time)
+    instead of a filter over the whole timeline.
+    """
+
+    def find_run(self, db: Session, file_hash: str, model_name: Optional[str] = None) -> Optional[VadRunModel]:
+        """The timeline of a file (of 'model_name', else the most recent one)."""
+        stmt = select(VadRunModel).where(VadRunModel.file_hash == file_hash)
+        if model_name:
+            stmt = stmt.where(VadRunModel.model_name == model_name)
+        return db.execute(stmt.order_by(VadRunModel.created_at.desc()).limit(1)).scalars().first()
+
+    def save(self, db: Session, file_hash: str, model_name: str, segments: Sequence[VadSegment]) -> Optional[VadRunModel]:
+        """
+        Replaces the file's timeline for 'model_name' and commits.
+        If another worker stores the same timeline concurrently, theirs is kept.
+        """
+        run = VadRunModel(
+            id=uuid.uuid4(),
+            file_hash=file_hash,
+            model_name=model_name,
+            total_seconds=max((s.end for s in segments), default=0.0),
+            speech_seconds=sum(s.end - s.start for s in segments if s.event_type == VadEventType.SPEECH),
+            segment_count=len(segments),
+            max_segment_seconds=max((s.end - s.start for s in segments), default=0.0)
+        )
+        try:
+            # Segments first: SQLite only honours ON DELETE CASCADE with foreign_keys enabled
+            stale = select(VadRunModel.id).where(VadRunModel.file_hash == file_hash, VadRunModel.model_name == model_name)
+            db.execute(delete(VadSegmentModel).where(VadSegmentModel.run_id.in_(stale)))
+            db.execute(delete(VadRunModel).where(VadRunModel.id.in_(stale)))
+            db.add(run)
+            db.flush()
+            if segments:
+                db.execute(insert(VadSegmentModel), [
+                    {"id": uuid.uuid4(), "run_id": run.id, "start_time": s.start, "end_time": s.end,
+                     "event_type": s.event_type, "confidence": s.confidence}
+                    for s in segments
+                ])
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.info(f"VAD timeline for {file_hash} was stored by another worker.")
+            return self.find_run(db, file_hash, model_name)
+        return run
+
+    def load(self, db: Session, run: VadRunModel, start: Optional[float] = None, end: Optional[float] = None,
+             event_type: Optional[VadEventType] = None) -> List[VadSegment]:
+        """Segments of 'run' overlapping [start, end), in time order."""
+        stmt = select(
+            VadSegmentModel.start_time, VadSegmentModel.end_time, VadSegmentModel.event_type, VadSegmentModel.confidence
+        ).where(VadSegmentModel.run_id == run.id)
+
+        if start is not None:
+            stmt = stmt.where(
+                VadSegmentModel.start_time >= start - run.max_segment_seconds,
+                VadSegmentModel.end_time > start
+            )
+        if end is not None:
+            stmt = stmt.where(VadSegmentModel.start_time < end)
+        if event_type is not None:
+            stmt = stmt.where(VadSegmentModel.event_type == event_type)
+
+        rows = db.execute(stmt.order_by(VadSegmentModel.start_time)).all()
+        return [VadSegment(start=r.start_time, end=r.end_time, event_type=r.event_type, confidence=r.confidence) for r in rows]
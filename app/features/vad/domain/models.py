@@ -14,4 +14,18 @@ class VadSegment:
     start: float
     end: float
     event_type: VadEventType
-    confidence: float
\ No newline at end of file
+    confidence: float
+
+@dataclass(frozen=True)
+class VadConfig:
+    """
+    How frame-level speech probabilities are turned into segments.
+    Hysteresis: speech starts at a frame >= onset and lasts until a frame < offset,
+    so probabilities wobbling between the two never flip the state.
+    """
+    onset: float = 0.5
+    offset: float = 0.35
+    pad_onset_seconds: float = 0.1      # Context added before each speech segment
+    pad_offset_seconds: float = 0.1     # ...and after it
+    min_silence_seconds: float = 0.3    # Shorter (padded) gaps are bridged
+    min_speech_seconds: float = 0.25    # Shorter (merged) speech is dropped as noise
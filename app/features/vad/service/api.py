@@ -1,11 +1,93 @@
 # File: app/features/vad/service/api.py
-from typing import List
+import logging
+from typing import List, Optional, Tuple
+from app.core.database.connection import SessionLocal
+from app.core.config.settings import settings
+from ..data.backends import AUTO_BACKEND, create_vad_adapter
 from ..data.marblenet_adapter import MarbleNetAdapter
-from ..domain.models import VadSegment
+from ..data.energy_adapter import EnergyVadAdapter
+from ..data.timeline_store import VadTimelineStore
+from ..domain.models import VadSegment, VadEventType
+from .postprocessing import probabilities_to_segments
 
-def run_vad_analysis(audio_path: str) -> List[VadSegment]:
+logger = logging.getLogger(__name__)
+
+def run_vad_analysis(audio_path: str, file_hash: Optional[str] = None, backend: Optional[str] = None) -> List[VadSegment]:
     """
     Public API for Voice Activity Detection.
+    Pass the file_hash to read the shared decoded-audio cache and the stored timeline:
+    a file is only analyzed once per backend, every later call reads the vad_segments table.
+    'backend' defaults to settings.VAD_BACKEND (see analyze_voice_activity).
+    """
+    segments, _ = analyze_voice_activity(audio_path, file_hash, backend)
+    return segments
+
+def analyze_voice_activity(audio_path: str, file_hash: Optional[str] = None,
+                           backend: Optional[str] = None) -> Tuple[List[VadSegment], str]:
+    """
+    Public API: run_vad_analysis, plus the model that produced the timeline.
+    With the 'auto' backend the cheap energy VAD answers clear cases (almost no speech,
+    or plenty of it); only files in the borderline band are re-analyzed by MarbleNet.
+    """
+    backend = backend or settings.VAD_BACKEND
+    if backend != AUTO_BACKEND:
+        adapter = create_vad_adapter(backend)
+        return _timeline(adapter, audio_path, file_hash), adapter.model_name
+
+    segments = _timeline(EnergyVadAdapter(), audio_path, file_hash)
+    ratio = speech_ratio(segments)
+    if settings.VAD_AUTO_MIN_SPEECH_RATIO < ratio < settings.VAD_AUTO_MAX_SPEECH_RATIO:
+        logger.info(f"Energy VAD is borderline (speech ratio {ratio:.2f}); escalating to MarbleNet.")
+        return _timeline(MarbleNetAdapter(), audio_path, file_hash), MarbleNetAdapter.model_name
+    return segments, EnergyVadAdapter.model_name
+
+def speech_ratio(segments: List[VadSegment]) -> float:
+    """Share of the timeline that is speech (0 for an empty timeline)."""
+    total = sum(s.end - s.start for s in segments)
+    speech = sum(s.end - s.start for s in segments if s.event_type == VadEventType.SPEECH)
+    return speech / total if total > 0 else 0.0
+
+def _timeline(adapter, audio_path: str, file_hash: Optional[str]) -> List[VadSegment]:
+    """The adapter's timeline for the file, read through the store when the file is hashed."""
+    if not file_hash:
+        return _detect_voice(adapter, audio_path)
+
+    store = VadTimelineStore()
+    with SessionLocal() as db:
+        run = store.find_run(db, file_hash, adapter.model_name)
+        if run is not None:
+            logger.debug(f"VAD timeline for {file_hash} ({adapter.model_name}) read from the store.")
+            return store.load(db, run)
+
+        segments = _detect_voice(adapter, audio_path, file_hash)
+        store.save(db, file_hash, adapter.model_name, segments)
+        return segments
+
+def _detect_voice(adapter, audio_path: str, file_hash: Optional[str] = None) -> List[VadSegment]:
+    probs = adapter.speech_probabilities(audio_path, file_hash)
+    return probabilities_to_segments(probs, adapter.frame_seconds)
+
+def get_vad_timeline(file_hash: str, start: Optional[float] = None, end: Optional[float] = None,
+                     event_type: Optional[VadEventType] = None) -> Optional[List[VadSegment]]:
+    """
+    Public API: The stored VAD segments of a file overlapping [start, end).
+    Returns None if the file was never analyzed (see run_vad_analysis).
+    """
+    store = VadTimelineStore()
+    with SessionLocal() as db:
+        run = store.find_run(db, file_hash)
+        if run is None:
+            return None
+        return store.load(db, run, start, end, event_type)
+
+def get_speech_intervals(file_hash: str, start: float = 0.0,
+                         end: Optional[float] = None) -> Optional[List[Tuple[float, float]]]:
+    """
+    Public API: (start, end) of the stored speech segments overlapping [start, end),
+    clipped to the range. Returns None if the file was never analyzed.
     """
-    adapter = MarbleNetAdapter()
-    return adapter.detect_voice(audio_path)
\ No newline at end of file
+    segments = get_vad_timeline(file_hash, start, end, VadEventType.SPEECH)
+    if segments is None:
+        return None
+    upper = float("inf") if end is None else end
+    return [(max(s.start, start), min(s.end, upper)) for s in segments]
@@ -4,7 +4,8 @@ from uuid import UUID
 from app.core.database.connection import SessionLocal
 from app.core.jobs.models import JobModel, JobStatus
 from app.features.storage.data.sql_models import SourceModel
-from .api import run_vad_analysis
+from ..domain.models import VadEventType
+from .api import analyze_voice_activity
 
 logger = logging.getLogger(__name__)
 
@@ -30,33 +31,27 @@ class VadHandler:
                 
             audio_path = file_record.file_path
 
-            # 2. Execute VAD (MarbleNet)
-            # This calls the Adapter -> ModelOrchestrator
-            segments = run_vad_analysis(audio_path)
+            # 2. Execute VAD
+            # 'marblenet' leases the model via the ModelOrchestrator; 'energy' runs on the CPU
+            # without it; 'auto' only escalates borderline files to MarbleNet
+            segments, model_name = analyze_voice_activity(audio_path, file_record.file_hash, params.get("backend"))
+
+            # 3. Summarize
+            # The timeline itself lives in the vad_segments table (see get_vad_timeline);
+            # the job row only carries the stats pre-flight checks look at.
+            total_speech = sum(s.end - s.start for s in segments if s.event_type == VadEventType.SPEECH)
+            total_silence = sum(s.end - s.start for s in segments if s.event_type == VadEventType.SILENCE)
 
-            # 3. Serialize Results
-            # We map the Domain Objects (VadSegment) to simple dicts
-            result_payload = [
-                {
-                    "start": seg.start, 
-                    "end": seg.end, 
-                    "type": seg.event_type.value, # 'speech' or 'silence'
-                    "conf": seg.confidence
-                }
-                for seg in segments
-            ]
-            
-            # Calculate stats
-            total_speech = sum(s.end - s.start for s in segments if s.event_type == "speech")
-            total_silence = sum(s.end - s.start for s in segments if s.event_type == "silence")
-            
             summary = {
                 "total_duration": total_speech + total_silence,
                 "speech_duration": total_speech,
                 "silence_duration": total_silence,
                 "ratio": total_speech / (total_speech + total_silence) if (total_speech + total_silence) > 0 else 0,
-                "segments": result_payload
+                "segment_count": len(segments),
+                "file_hash": file_record.file_hash,
+                "model": model_name,
+                "timeline": "vad_segments"
             }
-            
+
             logger.info(f"VAD Complete. Speech Ratio: {summary['ratio']:.2f}")
-            return summary
\ No newline at end of file
+            return summary
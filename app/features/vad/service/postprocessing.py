@@ -0,0 +1,152 @@
+# File: app/features/vad/service/postprocessing.py
+import numpy as np
+from typing import List, Optional, Tuple
+from ..domain.models import VadConfig, VadSegment, VadEventType
+
+
+def _hysteresis(probs: np.ndarray, config: VadConfig, initial: bool = False) -> np.ndarray:
+    """
+    Per-frame speech state. Frames >= onset switch speech on, frames < offset switch it off,
+    anything in between repeats the last decision (forward-filled with maximum.accumulate).
+    """
+    if config.offset > config.onset:
+        raise ValueError("VAD offset threshold must not be above the onset threshold.")
+
+    events = np.zeros(len(probs), dtype=np.int8)
+    events[probs < config.offset] = -1
+    events[probs >= config.onset] = 1
+
+    last = np.maximum.accumulate(np.where(events != 0, np.arange(len(probs)), -1))
+    return np.where(last >= 0, events[last] == 1, initial)
+
+
+def _runs(state: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(starts, ends) frame indices of the speech runs; ends are exclusive."""
+    edges = np.diff(np.concatenate(([0], state.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def _frame_counts(config: VadConfig, frame_seconds: float) -> Tuple[int, int, int, int]:
+    """Padding and minimum durations in whole frames: (pad_onset, pad_offset, min_silence, min_speech)."""
+    return tuple(int(round(seconds / frame_seconds)) for seconds in (
+        config.pad_onset_seconds, config.pad_offset_seconds, config.min_silence_seconds, config.min_speech_seconds
+    ))
+
+
+def _postprocess(starts: np.ndarray, ends: np.ndarray, total: int, frames: Tuple[int, int, int, int]):
+    """Pads the runs, bridges short gaps, then drops short speech."""
+    pad_onset, pad_offset, min_silence, min_speech = frames
+    starts = np.maximum(starts - pad_onset, 0)
+    ends = np.minimum(ends + pad_offset, total)
+    if len(starts) == 0:
+        return starts, ends
+
+    wide_gap = starts[1:] - ends[:-1] >= min_silence
+    starts = starts[np.concatenate(([True], wide_gap))]
+    ends = ends[np.concatenate((wide_gap, [True]))]
+
+    long_enough = ends - starts >= min_speech
+    return starts[long_enough], ends[long_enough]
+
+
+def _to_segments(starts: np.ndarray, ends: np.ndarray, probs: np.ndarray, base: int, first: int,
+                 last: Optional[int], frame_seconds: float) -> Tuple[List[VadSegment], int]:
+    """
+    Speech segments plus the silence between them, from frame 'first' (up to 'last' if given).
+    'probs' starts at frame 'base'. Confidence is the mean speech (or non-speech) probability.
+    Returns the segments and the frame the timeline now ends at.
+    """
+    csum = np.concatenate(([0.0], np.cumsum(probs, dtype=np.float64)))
+
+    def mean(a: int, b: int) -> float:
+        return float(csum[b - base] - csum[a - base]) / max(b - a, 1)
+
+    segments: List[VadSegment] = []
+    cursor = first
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if start > cursor:
+            segments.append(VadSegment(cursor * frame_seconds, start * frame_seconds, VadEventType.SILENCE, 1.0 - mean(cursor, start)))
+        segments.append(VadSegment(start * frame_seconds, end * frame_seconds, VadEventType.SPEECH, mean(start, end)))
+        cursor = end
+    if last is not None and last > cursor:
+        segments.append(VadSegment(cursor * frame_seconds, last * frame_seconds, VadEventType.SILENCE, 1.0 - mean(cursor, last)))
+        cursor = last
+    return segments, cursor
+
+
+def probabilities_to_segments(probs: np.ndarray, frame_seconds: float, config: Optional[VadConfig] = None) -> List[VadSegment]:
+    """
+    Turns frame-level speech probabilities into a speech/silence timeline covering the whole track.
+    Every step is an array operation over frames; Python only loops over the resulting segments.
+    """
+    config = config or VadConfig()
+    probs = np.asarray(probs, dtype=np.float32).ravel()
+
+    starts, ends = _runs(_hysteresis(probs, config))
+    starts, ends = _postprocess(starts, ends, len(probs), _frame_counts(config, frame_seconds))
+    segments, _ = _to_segments(starts, ends, probs, 0, 0, len(probs), frame_seconds)
+    return segments
+
+
+class StreamingVadPostprocessor:
+    """
+    probabilities_to_segments over a track that arrives in blocks (e.g. live or streamed audio).
+
+    push() returns the segments that later frames can no longer change: a speech run is final
+    once the silence after it is too long to be bridged, even after padding. flush() returns
+    the rest. The concatenated output equals probabilities_to_segments over the whole track.
+    Only the frames since the last emitted segment are kept.
+    """
+
+    def __init__(self, frame_seconds: float, config: Optional[VadConfig] = None):
+        self.frame_seconds = frame_seconds
+        self.config = config or VadConfig()
+        self._frames = _frame_counts(self.config, frame_seconds)
+
+        self._probs = np.empty(0, dtype=np.float32)  # Buffered frames, starting at frame _base
+        self._speech = np.empty(0, dtype=bool)       # Their hysteresis state
+        self._base = 0
+        self._total = 0           # Frames pushed so far
+        self._emitted_until = 0   # End of the emitted timeline
+        self._scan_from = 0       # Runs before this frame are decided
+
+    def push(self, probs: np.ndarray) -> List[VadSegment]:
+        probs = np.asarray(probs, dtype=np.float32).ravel()
+        initial = bool(self._speech[-1]) if len(self._speech) else False
+        self._speech = np.concatenate((self._speech, _hysteresis(probs, self.config, initial)))
+        self._probs = np.concatenate((self._probs, probs))
+        self._total += len(probs)
+        return self._emit(final=False)
+
+    def flush(self) -> List[VadSegment]:
+        return self._emit(final=True)
+
+    def _emit(self, final: bool) -> List[VadSegment]:
+        starts, ends = _runs(self._speech[self._scan_from - self._base:])
+        starts, ends = starts + self._scan_from, ends + self._scan_from
+
+        if not final:
+            pad_onset, pad_offset, min_silence, _ = self._frames
+            # Any later run starts at or after the last frame pushed
+            next_starts = np.concatenate((starts[1:], [self._total]))
+            closed = next_starts - ends >= pad_onset + pad_offset + min_silence
+            if len(closed) and self._speech[-1]:
+                closed[-1] = False  # Still talking
+            decided = np.flatnonzero(closed)
+            if len(decided) == 0:
+                return []
+            starts, ends = starts[:decided[-1] + 1], ends[:decided[-1] + 1]
+
+        raw_end = int(ends[-1]) if len(ends) else self._scan_from
+        starts, ends = _postprocess(starts, ends, self._total, self._frames)
+        segments, self._emitted_until = _to_segments(
+            starts, ends, self._probs, self._base, self._emitted_until,
+            self._total if final else None, self.frame_seconds
+        )
+        self._scan_from = max(raw_end, self._emitted_until)
+
+        # The silence after the last segment is still open: keep its frames for its confidence
+        drop = self._emitted_until - self._base
+        self._probs, self._speech = self._probs[drop:], self._speech[drop:]
+        self._base = self._emitted_until
+        return segments
@@ -8,6 +8,7 @@ from app.features.storage.data.sql_models import SourceModel
 from app.features.storage.service.api import storage
 from app.features.storage.domain.models import IngestRequest
 from app.core.common.enums import SourceType
+from app.features.vad.service.api import run_vad_analysis, get_speech_intervals
 
 from ..data.ffmpeg_adapter import FFmpegClipAdapter
 from ..data.sql_models import VideoClipModel
@@ -36,6 +37,13 @@ class VideoClippingHandler:
                 raise ValueError(f"Source {source_id} not found")
                 
             original_path = Path(parent_source.original_file.file_path)
+
+            # 1b. Optional: Drop leading/trailing silence (reads the stored VAD timeline)
+            trim = None
+            if params.get("trim_silence", False):
+                start_time, end_time, trim = self._trim_to_speech(
+                    parent_source.original_file, start_time, end_time, float(params.get("trim_padding", 0.25))
+                )
             
             # 2. Generate Clip in Temp
             with tempfile.TemporaryDirectory() as tmp_dir:
@@ -82,5 +90,28 @@ class VideoClippingHandler:
             return {
                 "clip_source_id": str(clip_source_id),
                 "duration": end_time - start_time,
-                "lineage_id": str(clip_record.id)
-            }
\ No newline at end of file
+                "lineage_id": str(clip_record.id),
+                "trim": trim
+            }
+
+    def _trim_to_speech(self, file_record, start_time: float, end_time: float, padding: float):
+        """
+        Tightens [start_time, end_time] to the first/last speech inside it (plus 'padding').
+        VAD only runs if the file has no stored timeline yet.
+        """
+        intervals = get_speech_intervals(file_record.file_hash, start_time, end_time)
+        if intervals is None:
+            run_vad_analysis(file_record.file_path, file_record.file_hash)
+            intervals = get_speech_intervals(file_record.file_hash, start_time, end_time) or []
+
+        if not intervals:
+            logger.info(f"No speech in {start_time}-{end_time}s; clip left untrimmed.")
+            return start_time, end_time, {"trimmed": False, "reason": "no_speech"}
+
+        trimmed_start = max(start_time, intervals[0][0] - padding)
+        trimmed_end = min(end_time, intervals[-1][1] + padding)
+        return trimmed_start, trimmed_end, {
+            "trimmed": True,
+            "requested": [start_time, end_time],
+            "removed_seconds": (end_time - start_time) - (trimmed_end - trimmed_start)
+        }
\ No newline at end of file
@@ -0,0 +1,89 @@
+# File: benchmarks/bench_context_windows.py
+"""
+Context-pipeline sliding windows on a synthetic long transcript:
+the previous list-based builder (insert(0, ...) overlap walk, per-window copies and sums)
+vs the prefix-sum/bisect builder in context_pipeline/service/orchestrator.py.
+
+    python -m benchmarks.bench_context_windows --segments 200000
+
+Both use the rough SimpleTokenizer so only the window building is compared.
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from app.features.context_pipeline.domain.models import WindowConfig, ContextWindow
+from app.features.context_pipeline.service.orchestrator import ContextOrchestrator, SimpleTokenizer
+
+
+def make_segments(count: int):
+    rng = random.Random(0)
+    speaker = SimpleNamespace(user_label="Dr. Smith", detected_label="speaker_0")
+    return [
+        SimpleNamespace(id=uuid4(), start_time=i * 3.0, speaker=speaker, text="word " * rng.randint(2, 60))
+        for i in range(count)
+    ]
+
+
+def list_based(orchestrator, segments, config):
+    """The previous ContextOrchestrator._build_sliding_windows."""
+    enriched = []
+    for seg in segments:
+        text = orchestrator._format_segment(seg)
+        enriched.append((seg, orchestrator.tokenizer.count_tokens(text), text))
+
+    windows, current, current_tokens = [], [], 0
+
+    def finalize(items):
+        windows.append(ContextWindow(len(windows), "\n".join([t[2] for t in items]),
+                                     sum([t[1] for t in items]), [t[0].id for t in items]))
+
+    for i, item in enumerate(enriched):
+        if current_tokens + item[1] > config.target_size and current:
+            finalize(current)
+            overlap, overlap_tokens, back = [], 0, i - 1
+            while back >= 0:
+                if overlap_tokens + enriched[back][1] > config.overlap_size and overlap:
+                    break
+                overlap.insert(0, enriched[back])
+                overlap_tokens += enriched[back][1]
+                back -= 1
+            current, current_tokens = list(overlap), overlap_tokens
+        current.append(item)
+        current_tokens += item[1]
+    if current:
+        finalize(current)
+    return windows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segments", type=int, default=200000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[8192, 32768, 131072], help="context_window_limit values")
+    parser.add_argument("--overlap", type=float, default=0.10, help="overlap_ratio")
+    args = parser.parse_args()
+
+    orchestrator = ContextOrchestrator.__new__(ContextOrchestrator)
+    orchestrator.tokenizer = SimpleTokenizer()
+    segments = make_segments(args.segments)
+
+    print(f"{len(segments)} segments, overlap ratio {args.overlap:g}")
+    for limit in args.limits:
+        config = WindowConfig(context_window_limit=limit, overlap_ratio=args.overlap)
+
+        started = time.perf_counter()
+        reference = list_based(orchestrator, segments, config)
+        old = time.perf_counter() - started
+
+        started = time.perf_counter()
+        windows = orchestrator._build_sliding_windows(segments, config)
+        new = time.perf_counter() - started
+
+        assert windows == reference, "Prefix-sum builder output differs"
+        print(f"  limit {limit:>7}: {len(windows):6} windows   list-based {old:7.2f} s   prefix-sum {new:7.2f} s   ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# File: benchmarks/bench_speaker_alignment.py
+"""
+Speaker-to-text alignment on a synthetic long recording:
+the old nested midpoint scan vs the overlap sweep in diarization/service/alignment.py.
+
+    python -m benchmarks.bench_speaker_alignment --text 50000 --speakers 20000
+
+The nested scan is O(N*M), so it is timed on a sample of text segments and extrapolated.
+"""
+import argparse
+import random
+import time
+
+from app.features.diarization.domain.models import SpeakerSegment
+from app.features.diarization.service.alignment import assign_speakers
+
+
+def make_inputs(text_count: int, speaker_count: int, hours: float):
+    rng = random.Random(0)
+    total = hours * 3600
+
+    cuts = sorted(rng.uniform(0, total) for _ in range(speaker_count - 1))
+    bounds = [0.0] + cuts + [total]
+    speakers = [SpeakerSegment(bounds[i], bounds[i + 1], f"speaker_{rng.randrange(6)}") for i in range(speaker_count)]
+
+    step = total / text_count
+    spans = []
+    for i in range(text_count):
+        start = i * step + rng.uniform(0, step * 0.2)
+        spans.append((start, start + rng.uniform(step * 0.5, step * 0.95)))
+    return spans, speakers
+
+
+def nested_midpoint(spans, speakers):
+    """The previous DiarizationHandler loop."""
+    ordered = sorted(speakers, key=lambda x: x.start)
+    labels = []
+    for start, end in spans:
+        midpoint = (start + end) / 2
+        matched = None
+        for ds in ordered:
+            if ds.start <= midpoint <= ds.end:
+                matched = ds.speaker_label
+                break
+        labels.append(matched)
+    return labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--text", type=int, default=50000, help="Transcription segments")
+    parser.add_argument("--speakers", type=int, default=20000, help="Diarization segments")
+    parser.add_argument("--hours", type=float, default=10.0)
+    parser.add_argument("--sample", type=int, default=500, help="Text segments timed for the nested scan")
+    args = parser.parse_args()
+
+    spans, speakers = make_inputs(args.text, args.speakers, args.hours)
+
+    started = time.perf_counter()
+    labels = assign_speakers(spans, speakers)
+    sweep = time.perf_counter() - started
+
+    sample = spans[::max(1, len(spans) // args.sample)][:args.sample]
+    started = time.perf_counter()
+    nested_midpoint(sample, speakers)
+    nested = (time.perf_counter() - started) * len(spans) / len(sample)
+
+    assigned = sum(1 for label in labels if label is not None)
+    print(f"{len(spans)} text segments x {len(speakers)} speaker segments ({args.hours:g}h)")
+    print(f"  nested scan  {nested:8.2f} s   (extrapolated from {len(sample)} segments)")
+    print(f"  sweep        {sweep:8.3f} s   ({nested / sweep:.0f}x faster, {assigned} assigned)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# File: benchmarks/bench_transcription_backends.py
+"""
+Realtime factor and word error rate of the transcription backends on one clip.
+
+    python -m benchmarks.bench_transcription_backends --clip fixtures/deposition_5min.mp3 \
+        --reference fixtures/deposition_5min.txt --model-size base
+
+RTF = processing seconds / audio seconds (lower is better). WER is computed against
+the reference transcript after lowercasing and stripping punctuation.
+Backends that are not installed are skipped.
+"""
+import argparse
+import re
+import time
+
+from app.features.audio_extraction.service.api import probe_duration
+from app.features.transcription.data.backends import TRANSCRIPTION_BACKENDS
+
+
+def normalize(text: str):
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref, hyp = normalize(reference), normalize(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    # Levenshtein distance over words, one row at a time
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clip", required=True, help="Audio/video file to transcribe")
+    parser.add_argument("--reference", required=True, help="Plain-text reference transcript")
+    parser.add_argument("--model-size", default="base")
+    parser.add_argument("--runs", type=int, default=1, help="Timed runs per backend (after one warm-up load)")
+    args = parser.parse_args()
+
+    with open(args.reference, encoding="utf-8") as f:
+        reference = f.read()
+    duration = probe_duration(args.clip)
+    print(f"{args.clip}: {duration:.1f}s, model {args.model_size}")
+
+    for name, adapter_cls in TRANSCRIPTION_BACKENDS.items():
+        if getattr(adapter_cls, "is_available", lambda: True)() is False:
+            print(f"  {name:<15} not installed, skipped")
+            continue
+
+        adapter = adapter_cls()
+        adapter.transcribe(args.clip, args.model_size)  # Warm-up: model load is not part of RTF
+
+        timings = []
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            result = adapter.transcribe(args.clip, args.model_size)
+            timings.append(time.perf_counter() - started)
+
+        elapsed = min(timings)
+        print(f"  {name:<15} RTF {elapsed / duration:6.3f}   WER {word_error_rate(reference, result.full_text):6.1%}"
+              f"   ({elapsed:.1f}s, device {adapter.device})")
+
+
+if __name__ == "__main__":
+    main()
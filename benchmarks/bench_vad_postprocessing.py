@@ -0,0 +1,92 @@
+# File: benchmarks/bench_vad_postprocessing.py
+"""
+Frame-level VAD post-processing on a synthetic multi-hour probability track:
+a per-frame Python state machine vs the array ops in vad/service/postprocessing.py,
+whole-track and streamed in blocks.
+
+    python -m benchmarks.bench_vad_postprocessing --hours 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.features.vad.domain.models import VadConfig, VadEventType
+from app.features.vad.service.postprocessing import probabilities_to_segments, StreamingVadPostprocessor
+
+
+def make_track(hours: float, frame_seconds: float) -> np.ndarray:
+    """Alternating speech/pause stretches with noisy probabilities."""
+    rng = np.random.default_rng(0)
+    frames = int(hours * 3600 / frame_seconds)
+    lengths = rng.integers(5, 400, frames // 100)
+    levels = np.resize([0.85, 0.1], len(lengths))
+    track = np.repeat(levels, lengths)[:frames]
+    return np.clip(track + rng.normal(0, 0.2, len(track)), 0.0, 1.0).astype(np.float32)
+
+
+def per_frame(probs, frame_seconds, config):
+    """Speech spans via a per-frame loop, with the same padding and filtering rules."""
+    pad_on, pad_off, min_silence, min_speech = (
+        int(round(s / frame_seconds)) for s in
+        (config.pad_onset_seconds, config.pad_offset_seconds, config.min_silence_seconds, config.min_speech_seconds)
+    )
+    spans, speaking, start = [], False, 0
+    for i, p in enumerate(probs.tolist()):
+        if not speaking and p >= config.onset:
+            speaking, start = True, i
+        elif speaking and p < config.offset:
+            speaking = False
+            spans.append([start, i])
+    if speaking:
+        spans.append([start, len(probs)])
+
+    merged = []
+    for start, end in spans:
+        start, end = max(start - pad_on, 0), min(end + pad_off, len(probs))
+        if merged and start - merged[-1][1] < min_silence:
+            merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(s * frame_seconds, e * frame_seconds) for s, e in merged if e - s >= min_speech]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=4.0)
+    parser.add_argument("--frame", type=float, default=0.02, help="Seconds per probability frame")
+    parser.add_argument("--block", type=float, default=30.0, help="Seconds per streamed block")
+    args = parser.parse_args()
+
+    config = VadConfig()
+    probs = make_track(args.hours, args.frame)
+
+    started = time.perf_counter()
+    reference = per_frame(probs, args.frame, config)
+    loop = time.perf_counter() - started
+
+    started = time.perf_counter()
+    segments = probabilities_to_segments(probs, args.frame, config)
+    vectorized = time.perf_counter() - started
+
+    started = time.perf_counter()
+    stream = StreamingVadPostprocessor(args.frame, config)
+    block = int(args.block / args.frame)
+    streamed = []
+    for offset in range(0, len(probs), block):
+        streamed += stream.push(probs[offset:offset + block])
+    streamed += stream.flush()
+    streaming = time.perf_counter() - started
+
+    speech = [(s.start, s.end) for s in segments if s.event_type == VadEventType.SPEECH]
+    assert speech == reference, "Vectorized output differs from the per-frame loop"
+    assert [(s.start, s.end) for s in streamed] == [(s.start, s.end) for s in segments], "Streaming output differs"
+
+    print(f"{len(probs)} frames ({args.hours:g}h at {args.frame * 1000:g} ms), {len(speech)} speech segments")
+    print(f"  per-frame loop {loop:8.3f} s   (speech spans only)")
+    print(f"  vectorized     {vectorized:8.3f} s   ({loop / vectorized:.0f}x faster, full timeline)")
+    print(f"  streamed       {streaming:8.3f} s   ({args.block:g}s blocks)")
+
+
+if __name__ == "__main__":
+    main()
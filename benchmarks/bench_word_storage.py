@@ -0,0 +1,84 @@
+# File: benchmarks/bench_word_storage.py
+"""
+Storage size and read time of word timings for a long transcript:
+per-segment JSON word lists (old layout) vs packed columnar blobs.
+
+    python -m benchmarks.bench_word_storage --hours 10
+"""
+import argparse
+import json
+import random
+import time
+
+from app.features.transcription.domain.models import WordTiming
+from app.features.transcription.data.word_codec import pack_words, unpack_arrays, unpack_words
+
+
+def make_transcript(hours: float, words_per_segment: int):
+    rng = random.Random(0)
+    segments = []
+    start = 0.0
+    while start < hours * 3600:
+        words = []
+        t = start
+        for _ in range(words_per_segment):
+            duration = rng.uniform(0.15, 0.6)
+            words.append(WordTiming(rng.choice(["the", "deposition", "witness", "objection", "counsel", "yes"]),
+                                    t, t + duration, rng.uniform(0.5, 1.0)))
+            t += duration + rng.uniform(0.0, 0.2)
+        segments.append((start, words))
+        start = t + rng.uniform(0.2, 1.5)
+    return segments
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=10.0)
+    parser.add_argument("--words", type=int, default=12, help="Words per segment")
+    args = parser.parse_args()
+
+    segments = make_transcript(args.hours, args.words)
+    total_words = sum(len(w) for _, w in segments)
+
+    as_json = [json.dumps([{"w": w.word, "s": w.start, "e": w.end, "c": w.confidence} for w in words])
+               for _, words in segments]
+    as_blob = [pack_words(words, base=start) for start, words in segments]
+
+    # Both sides build the same WordTiming objects; 'arrays' is the timings alone, no objects
+    _, json_read = timed(lambda: [[WordTiming(w["w"], w["s"], w["e"], w["c"]) for w in json.loads(doc)] for doc in as_json])
+    _, blob_read = timed(lambda: [unpack_words(blob, base=start) for blob, (start, _) in zip(as_blob, segments)])
+    _, array_read = timed(lambda: [unpack_arrays(blob, base=start) for blob, (start, _) in zip(as_blob, segments)])
+
+    # Range read: one minute in the middle, segments already narrowed down by the index
+    t0 = args.hours * 1800
+    t1 = t0 + 60
+    picked = [i for i, (start, words) in enumerate(segments) if start < t1 and words[-1].end > t0]
+
+    def json_range():
+        return [WordTiming(w["w"], w["s"], w["e"], w["c"])
+                for i in picked for w in json.loads(as_json[i]) if w["s"] < t1 and w["e"] > t0]
+
+    def blob_range():
+        return [w for i in picked for w in unpack_words(as_blob[i], base=segments[i][0], start=t0, end=t1)]
+
+    json_hits, json_range_t = timed(json_range)
+    blob_hits, blob_range_t = timed(blob_range)
+    assert len(json_hits) == len(blob_hits)
+
+    json_bytes = sum(len(doc.encode()) for doc in as_json)
+    blob_bytes = sum(len(blob) for blob in as_blob)
+    print(f"{len(segments)} segments, {total_words} words ({args.hours:g}h)")
+    print(f"  size       json {json_bytes / 1024 ** 2:8.2f} MB   packed {blob_bytes / 1024 ** 2:8.2f} MB"
+          f"   ({json_bytes / blob_bytes:.1f}x smaller)")
+    print(f"  full read  json {json_read:8.3f} s    packed {blob_read:8.3f} s    packed arrays only {array_read:8.3f} s")
+    print(f"  1 min      json {json_range_t * 1000:8.2f} ms   packed {blob_range_t * 1000:8.2f} ms   ({len(blob_hits)} words)")
+
+
+if __name__ == "__main__":
+    main()
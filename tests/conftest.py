@@ -48,6 +48,7 @@ def global_setup():
     import app.features.diarization.data.sql_models
     import app.features.audio_extraction.data.sql_models
     import app.features.video_clipping.data.sql_models
+    import app.features.vad.data.sql_models
 
     # Create tables once
     Base.metadata.create_all(bind=TEST_ENGINE)
@@ -92,4 +92,56 @@ def test_run_job_routing_failure():
     with SessionLocal() as db:
         job = db.get(JobModel, job_id)
         assert job.status == JobStatus.FAILED
-        assert "No handler registered" in job.error_message
\ No newline at end of file
+        assert "No handler registered" in job.error_message
+
+
+def test_admission_gate_skips_jobs_without_speech():
+    """
+    Verifies that TRANSCRIPTION/DIARIZATION jobs of a source whose (stored) VAD
+    timeline has no speech complete immediately as skipped, and are reported.
+    """
+    from app.core.jobs.admission import SpeechAdmissionGate, admission_report, NO_SPEECH_REASON
+    from app.features.vad.data.timeline_store import VadTimelineStore
+    from app.features.vad.domain.models import VadSegment, VadEventType
+
+    manager = JobManager()
+    store = VadTimelineStore()
+    timelines = {
+        "silent_hash": [VadSegment(0.0, 600.0, VadEventType.SILENCE, 0.9)],
+        "talk_hash": [VadSegment(0.0, 20.0, VadEventType.SPEECH, 0.9), VadSegment(20.0, 60.0, VadEventType.SILENCE, 0.9)],
+    }
+    sources = {}
+    with SessionLocal() as db:
+        for file_hash, segments in timelines.items():
+            f = FileModel(file_path=f"/tmp/{file_hash}.wav", file_size_bytes=1, file_hash=file_hash, file_type=FileType.AUDIO)
+            db.add(f)
+            db.flush()
+            s = SourceModel(name=file_hash, source_type=SourceType.AUDIO_FILE, file_id=f.id)
+            db.add(s)
+            db.commit()
+            sources[file_hash] = s.id
+            store.save(db, file_hash, "vad_marblenet", segments)
+
+    job_ids = [manager.submit_job(sources["silent_hash"], t) for t in (JobType.TRANSCRIPTION, JobType.DIARIZATION)]
+    for job_id in job_ids:
+        manager.run_job(job_id)
+
+    with SessionLocal() as db:
+        for job_id in job_ids:
+            job = db.get(JobModel, job_id)
+            assert job.status == JobStatus.COMPLETED
+            assert job.skip_reason == NO_SPEECH_REASON
+            assert job.result_meta["segment_count"] == 0
+            assert job.result_meta["speech_seconds"] == 0.0
+
+        report = admission_report(db)
+        assert report["jobs_skipped"] == 2
+        assert report["per_job_type"] == {"transcription": 1, "diarization": 1}
+        assert report["gpu_seconds_saved"] > 0
+
+        # Enough speech: admitted
+        talk_job = db.get(JobModel, manager.submit_job(sources["talk_hash"], JobType.TRANSCRIPTION))
+        assert SpeechAdmissionGate().check(talk_job) is None
+        # Not a speech job: never gated
+        vad_job = db.get(JobModel, manager.submit_job(sources["silent_hash"], JobType.VAD_ANALYSIS))
+        assert SpeechAdmissionGate().check(vad_job) is None
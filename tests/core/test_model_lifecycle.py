@@ -0,0 +1,219 @@
+import pytest
+import torch
+from app.core.model_lifecycle.orchestrator import ModelOrchestrator
+from app.core.model_lifecycle.types import ModelType
+
+
+@pytest.fixture
+def orchestrator():
+    """The singleton, emptied and restored around each test."""
+    orch = ModelOrchestrator()
+    previous = orch.get_memory_usage()
+    orch.configure(host_budget_bytes=0)
+    orch.unload_all()
+    yield orch
+    orch.unload_all()
+    orch.clear_host_cache()
+    orch.configure(mode=previous["mode"], budget_bytes=previous["budget_bytes"])
+
+
+def _linear():
+    # 32x32 weights + 32 bias, fp32 -> 4224 bytes
+    return torch.nn.Linear(32, 32)
+
+
+def test_budget_mode_keeps_models_and_evicts_lru(orchestrator):
+    """
+    Two small models fit the budget together; a third evicts the least recently used.
+    """
+    orchestrator.configure(
+        mode="budget",
+        budget_bytes=10_000,
+        size_estimates={t: 4224 for t in ModelType}
+    )
+
+    vad = orchestrator.request_model(ModelType.NEMO_VAD, _linear)
+    orchestrator.request_model(ModelType.NEMO_DIARIZATION, _linear)
+    assert orchestrator.get_resident_models() == [ModelType.NEMO_VAD, ModelType.NEMO_DIARIZATION]
+
+    # Touch VAD so DIARIZATION becomes the LRU entry
+    assert orchestrator.request_model(ModelType.NEMO_VAD, _linear) is vad
+
+    orchestrator.request_model(ModelType.WHISPER, _linear)
+    assert orchestrator.get_resident_models() == [ModelType.NEMO_VAD, ModelType.WHISPER]
+
+    usage = orchestrator.get_memory_usage()
+    assert usage["used_bytes"] == 2 * 4224
+    assert usage["models"]["whisper"]["measured"] is True
+
+
+def test_variants_of_one_model_type_are_separate_residents(orchestrator):
+    """
+    Whisper 'base' and 'large-v3' are different models: asking for one must never return the other.
+    """
+    from app.core.model_lifecycle.types import ModelVariant
+
+    orchestrator.configure(mode="budget", budget_bytes=10_000, size_estimates={t: 4224 for t in ModelType})
+
+    with orchestrator.lease(ModelType.WHISPER, _linear, variant="base") as small:
+        with orchestrator.lease(ModelType.WHISPER, _linear, variant="large-v3") as large:
+            assert small is not large
+
+    with orchestrator.lease(ModelType.WHISPER, _linear, variant="base") as again:
+        assert again is small
+
+    assert orchestrator.get_resident_models() == [
+        ModelVariant(ModelType.WHISPER, "large-v3"), ModelVariant(ModelType.WHISPER, "base")
+    ]
+    assert set(orchestrator.get_memory_usage()["models"]) == {"whisper:base", "whisper:large-v3"}
+
+
+def test_single_mode_holds_one_model(orchestrator):
+    orchestrator.configure(mode="single")
+
+    orchestrator.request_model(ModelType.NEMO_VAD, _linear)
+    orchestrator.request_model(ModelType.WHISPER, _linear)
+
+    assert orchestrator.get_resident_models() == [ModelType.WHISPER]
+    assert orchestrator.get_current_model_type() == ModelType.WHISPER
+
+
+def test_leases_share_model_and_block_swaps(orchestrator):
+    """
+    Two threads share one leased model; a swap waits until both leases drain.
+    """
+    import threading
+
+    orchestrator.configure(mode="single")
+    both_leased = threading.Barrier(3)
+    release = threading.Event()
+    seen = []
+
+    def reader():
+        with orchestrator.lease(ModelType.WHISPER, _linear) as model:
+            seen.append(model)
+            both_leased.wait()
+            release.wait()
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    for t in readers:
+        t.start()
+    both_leased.wait()
+
+    assert seen[0] is seen[1], "Concurrent readers must share the resident model"
+    assert orchestrator.get_lease_metrics()["whisper"]["active_leases"] == 2
+
+    # A swap can't happen while Whisper is pinned
+    with pytest.raises(TimeoutError):
+        with orchestrator.lease(ModelType.NEMO_VAD, _linear, timeout=0.1):
+            pass
+    assert orchestrator.get_resident_models() == [ModelType.WHISPER]
+
+    # Once the leases drain, the swap goes through
+    swapper = threading.Thread(
+        target=lambda: orchestrator.request_model(ModelType.NEMO_VAD, _linear)
+    )
+    swapper.start()
+    release.set()
+    for t in readers + [swapper]:
+        t.join(timeout=5)
+
+    assert orchestrator.get_resident_models() == [ModelType.NEMO_VAD]
+
+    metrics = orchestrator.get_lease_metrics()
+    assert metrics["whisper"]["leases"] >= 2
+    assert metrics["whisper"]["hold_max_seconds"] > 0
+    assert metrics["nemo_vad"]["timeouts"] == 1
+
+
+def test_evicted_module_is_restored_from_host_tier(orchestrator):
+    """
+    An evicted torch module is parked in host RAM and restored without calling its loader.
+    """
+    orchestrator.configure(mode="single", host_budget_bytes=1_000_000)
+    before = orchestrator.get_load_metrics().get("whisper", {"disk_loads": 0, "host_restores": 0})
+
+    whisper = orchestrator.request_model(ModelType.WHISPER, _linear)
+    orchestrator.request_model(ModelType.NEMO_VAD, _linear)
+    assert orchestrator.get_host_cached_models() == [ModelType.WHISPER]
+
+    def must_not_load():
+        raise AssertionError("Loader called although the model was parked in host RAM")
+
+    restored = orchestrator.request_model(ModelType.WHISPER, must_not_load)
+    assert restored is whisper
+    assert orchestrator.get_host_cached_models() == [ModelType.NEMO_VAD]
+
+    metrics = orchestrator.get_load_metrics()["whisper"]
+    assert metrics["disk_loads"] - before["disk_loads"] == 1
+    assert metrics["host_restores"] - before["host_restores"] == 1
+
+
+def test_host_tier_respects_its_budget(orchestrator):
+    """
+    The host tier evicts its own LRU entry when full.
+    """
+    orchestrator.configure(mode="single", host_budget_bytes=5_000)  # Room for one 4224-byte module
+
+    orchestrator.request_model(ModelType.WHISPER, _linear)
+    orchestrator.request_model(ModelType.NEMO_VAD, _linear)
+    orchestrator.request_model(ModelType.NEMO_DIARIZATION, _linear)
+
+    assert orchestrator.get_host_cached_models() == [ModelType.NEMO_VAD]
+
+
+def test_prefetch_and_idle_eviction(orchestrator):
+    """
+    prefetch() loads in the background; evict_idle() drops unused models.
+    """
+    import time
+
+    orchestrator.configure(mode="budget", budget_bytes=1_000_000)
+
+    assert orchestrator.prefetch(ModelType.NEMO_VAD, _linear) is True
+
+    deadline = time.monotonic() + 5
+    while ModelType.NEMO_VAD not in orchestrator.get_resident_models() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert ModelType.NEMO_VAD in orchestrator.get_resident_models()
+
+    # Already resident: nothing to do
+    assert orchestrator.prefetch(ModelType.NEMO_VAD, _linear) is False
+
+    # A leased model is never idle-evicted
+    with orchestrator.lease(ModelType.WHISPER, _linear):
+        dropped = orchestrator.evict_idle(idle_seconds=0)
+        assert dropped == [ModelType.NEMO_VAD]
+        assert orchestrator.get_resident_models() == [ModelType.WHISPER]
+
+
+def test_idle_time_starts_when_the_lease_ends(orchestrator):
+    """
+    A lease held longer than the idle timeout must not make the model look idle on release.
+    """
+    import time
+
+    orchestrator.configure(mode="budget", budget_bytes=1_000_000)
+    with orchestrator.lease(ModelType.NEMO_VAD, _linear):
+        time.sleep(0.6)
+
+    assert orchestrator.evict_idle(idle_seconds=0.5) == []
+    assert ModelType.NEMO_VAD in orchestrator.get_resident_models()
+
+
+def test_external_copies_are_reserved_in_the_budget(orchestrator):
+    """
+    Worker processes load their own copies outside the leases: reserve_external grants
+    only as many as fit next to the resident models, and counts them as used memory.
+    """
+    orchestrator.configure(mode="budget", budget_bytes=20_000, size_estimates={t: 4224 for t in ModelType})
+
+    with orchestrator.lease(ModelType.WHISPER, _linear, variant="base"):
+        with orchestrator.reserve_external(ModelType.WHISPER, 8, variant="base") as granted:
+            assert granted == 3  # (20000 - 4224) // 4224
+            assert orchestrator.get_memory_usage()["used_bytes"] == 4 * 4224
+
+            with orchestrator.reserve_external(ModelType.WHISPER, 2, variant="base") as none_left:
+                assert none_left == 0
+
+    assert orchestrator.get_memory_usage()["used_bytes"] == 4224
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from app.core.jobs.scheduler import ModelAffinityScheduler, QueuedJob
+from app.core.jobs.types import JobType
+from app.core.model_lifecycle.types import ModelType
+
+
+def _simulate(scheduler, queue, now):
+    """Dispatches one job at a time, the way a single-slot worker would."""
+    queue = list(queue)
+    order = []
+    while queue:
+        model = scheduler.choose_model(queue, now=now)
+        eligible = scheduler.job_types_for(model)
+        job = min((j for j in queue if j.job_type in eligible), key=lambda j: j.created_at)
+        queue.remove(job)
+        scheduler.record_dispatch([job])
+        order.append(job.model_type)
+    return order
+
+
+def test_affinity_groups_interleaved_queue():
+    """
+    An interleaved TRANSCRIPTION/DIARIZATION queue is drained group by group.
+    FIFO would swap on every job; affinity swaps once.
+    """
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    queue = [
+        QueuedJob(JobType.TRANSCRIPTION if i % 2 == 0 else JobType.DIARIZATION, t0 + timedelta(seconds=i))
+        for i in range(6)
+    ]
+
+    scheduler = ModelAffinityScheduler(max_batch=100, max_wait_seconds=3600)
+    order = _simulate(scheduler, queue, now=t0 + timedelta(seconds=10))
+
+    assert order == [ModelType.WHISPER] * 3 + [ModelType.NEMO_DIARIZATION] * 3
+
+    report = scheduler.report()
+    assert report["swaps"] == 1
+    assert report["fifo_swaps"] == 5
+    assert report["swaps_avoided"] == 4
+
+
+def test_starvation_bound_forces_switch():
+    """
+    A group whose oldest job waited past max_wait_seconds preempts the active group.
+    """
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    scheduler = ModelAffinityScheduler(max_batch=100, max_wait_seconds=60)
+    scheduler.active_model = ModelType.WHISPER
+
+    queue = [
+        QueuedJob(JobType.TRANSCRIPTION, t0 + timedelta(seconds=100)),
+        QueuedJob(JobType.VAD_ANALYSIS, t0),
+    ]
+
+    assert scheduler.choose_model(queue, now=t0 + timedelta(seconds=30)) == ModelType.WHISPER
+    assert scheduler.choose_model(queue, now=t0 + timedelta(seconds=120)) == ModelType.NEMO_VAD
+
+
+def test_deep_backlog_of_old_jobs_still_batches():
+    """
+    When every queued job is older than max_wait_seconds, the starvation bound
+    preempts once and then lets the new group run; it must not swap on every job.
+    """
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    queue = [
+        QueuedJob(JobType.TRANSCRIPTION if i % 2 == 0 else JobType.DIARIZATION, t0 + timedelta(seconds=i))
+        for i in range(20)
+    ]
+
+    scheduler = ModelAffinityScheduler(max_batch=100, max_wait_seconds=1800)
+    order = _simulate(scheduler, queue, now=t0 + timedelta(hours=3))
+
+    report = scheduler.report()
+    assert report["fifo_swaps"] == 19
+    assert report["swaps"] <= 2
+    assert order.count(ModelType.WHISPER) == 10
+
+    # Served groups restart their clock: once the wait passes the bound again, they preempt
+    scheduler = ModelAffinityScheduler(max_batch=100, max_wait_seconds=60)
+    now = t0 + timedelta(hours=3)
+    assert scheduler.choose_model(queue, now=now) == ModelType.WHISPER
+    assert scheduler.choose_model(queue, now=now) == ModelType.NEMO_DIARIZATION  # Old backlog: one preemption
+    assert scheduler.choose_model(queue, now=now + timedelta(seconds=30)) == ModelType.NEMO_DIARIZATION
+    assert scheduler.choose_model(queue, now=now + timedelta(seconds=90)) == ModelType.WHISPER
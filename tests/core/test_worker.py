@@ -0,0 +1,212 @@
+import time
+import pytest
+from uuid import uuid4
+from datetime import timedelta
+from app.core.database.connection import SessionLocal
+from app.core.jobs.manager import JobManager
+from app.core.jobs.worker import JobWorker, utc_now
+from app.core.jobs.types import JobType, JobStatus
+from app.core.jobs.models import JobModel
+from app.features.storage.data.sql_models import FileModel, SourceModel
+from app.core.common.enums import FileType, SourceType
+
+
+@pytest.fixture
+def source_id():
+    """A minimal Source to hang jobs on (required by ForeignKey)."""
+    with SessionLocal() as db:
+        f = FileModel(
+            file_path="/tmp/fake_worker_test.wav",
+            file_size_bytes=1024,
+            file_hash="worker_test_hash",
+            file_type=FileType.AUDIO
+        )
+        db.add(f)
+        db.flush()
+        s = SourceModel(name="Worker Test Source", source_type=SourceType.AUDIO_FILE, file_id=f.id)
+        db.add(s)
+        db.commit()
+        return s.id
+
+
+def test_workers_never_double_claim(source_id):
+    """
+    Two workers competing for the same queue must receive disjoint job sets.
+    """
+    manager = JobManager()
+    job_ids = {manager.submit_job(source_id, JobType.INTELLIGENCE) for _ in range(5)}
+
+    worker_a = JobWorker(worker_id="worker-a")
+    worker_b = JobWorker(worker_id="worker-b")
+
+    claimed_a = worker_a.claim_jobs(3)
+    claimed_b = worker_b.claim_jobs(5)
+
+    assert len(claimed_a) == 3
+    assert len(claimed_b) == 2
+    assert set(claimed_a).isdisjoint(claimed_b)
+    assert set(claimed_a) | set(claimed_b) == job_ids
+
+    with SessionLocal() as db:
+        job = db.get(JobModel, claimed_a[0])
+        assert job.status == JobStatus.PROCESSING
+        assert job.worker_id == "worker-a"
+        assert job.lease_expires_at is not None
+        assert job.attempts == 1
+
+
+def test_worker_pool_drains_queue(source_id):
+    """
+    A threaded pool runs every PENDING job exactly once.
+    INTELLIGENCE has no handler, so every job should end up FAILED (not stuck).
+    """
+    manager = JobManager()
+    job_ids = [manager.submit_job(source_id, JobType.INTELLIGENCE) for _ in range(6)]
+
+    worker = JobWorker(concurrency=3, pool_mode="thread", poll_interval=0.05)
+    executed = worker.drain()
+
+    assert executed == 6
+    with SessionLocal() as db:
+        for job_id in job_ids:
+            job = db.get(JobModel, job_id)
+            assert job.status == JobStatus.FAILED
+            assert "No handler registered" in job.error_message
+            assert job.attempts == 1
+            assert job.lease_expires_at is None
+
+
+def test_expired_lease_is_requeued(source_id):
+    """
+    A job whose worker died (lease in the past) goes back to PENDING.
+    """
+    job_id = JobManager().submit_job(source_id, JobType.INTELLIGENCE)
+
+    dead_worker = JobWorker(worker_id="dead-worker")
+    assert dead_worker.claim_jobs(1) == [job_id]
+
+    with SessionLocal() as db:
+        job = db.get(JobModel, job_id)
+        job.lease_expires_at = utc_now() - timedelta(seconds=1)
+        db.commit()
+
+    assert JobWorker().reclaim_expired_leases() == 1
+
+    with SessionLocal() as db:
+        job = db.get(JobModel, job_id)
+        assert job.status == JobStatus.PENDING
+        assert job.worker_id is None
+
+
+def test_external_stop_event_interrupts_a_full_pool():
+    """
+    run_forever(stop_event=...) must wake up from slot waiting when that event is set,
+    even while every slot is busy and the poll interval is long.
+    """
+    import threading
+    from concurrent.futures import Future
+
+    worker = JobWorker(concurrency=1, pool_mode="thread", poll_interval=30)
+    busy = Future()  # A job that never finishes on its own
+    worker._inflight[busy] = uuid4()
+
+    # The loop is left once shutdown begins; shutdown itself waits for the busy slot
+    shutting_down = threading.Event()
+    shutdown = worker._shutdown
+    worker._shutdown = lambda: (shutting_down.set(), shutdown())
+
+    stop_event = threading.Event()
+    runner = threading.Thread(target=worker.run_forever, kwargs={"stop_event": stop_event}, daemon=True)
+    runner.start()
+    time.sleep(0.2)
+    stop_event.set()
+    interrupted = shutting_down.wait(5)
+    busy.set_result(None)
+    runner.join(timeout=5)
+
+    assert interrupted
+    assert not runner.is_alive()
+
+
+def test_drain_backs_off_on_unclaimable_jobs(source_id, monkeypatch):
+    """
+    Pending jobs the worker cannot claim make drain() retry once per poll interval,
+    not spin, and stop() ends it.
+    """
+    import threading
+
+    JobManager().submit_job(source_id, JobType.INTELLIGENCE)
+    worker = JobWorker(concurrency=1, pool_mode="thread", poll_interval=0.1)
+    attempts = []
+    monkeypatch.setattr(worker, "claim_jobs", lambda limit, job_types=None: attempts.append(limit) or [])
+
+    runner = threading.Thread(target=worker.drain, daemon=True)
+    runner.start()
+    time.sleep(0.5)
+    worker.stop()
+    runner.join(timeout=5)
+
+    assert not runner.is_alive()
+    assert 1 <= len(attempts) <= 10
+
+
+def test_run_that_lost_its_lease_does_not_overwrite_the_rerun(source_id, monkeypatch):
+    """
+    If the lease is reclaimed while a job runs, the late run must not finish the row
+    now owned by another worker.
+    """
+    job_id = JobManager().submit_job(source_id, JobType.INTELLIGENCE)
+    assert JobWorker(worker_id="slow-worker").claim_jobs(1) == [job_id]
+
+    def reclaimed_meanwhile(self, job):
+        with SessionLocal() as db:
+            job_row = db.get(JobModel, job_id)
+            job_row.worker_id = "other-worker"
+            job_row.attempts += 1
+            db.commit()
+        return {"late": True}
+
+    monkeypatch.setattr(JobManager, "_route_to_feature", reclaimed_meanwhile)
+    JobManager().run_job(job_id)
+
+    with SessionLocal() as db:
+        job = db.get(JobModel, job_id)
+        assert job.status == JobStatus.PROCESSING
+        assert job.worker_id == "other-worker"
+        assert job.result_meta != {"late": True}
+        assert job.lease_expires_at is not None
+
+
+def test_stopping_worker_keeps_renewing_leases_of_running_jobs(source_id, monkeypatch):
+    """
+    After stop(), a job that outlives its lease must stay owned by this worker
+    until it finishes, so no other worker can reclaim and rerun it.
+    """
+    import threading
+    from app.core.jobs import worker as worker_module
+
+    job_id = JobManager().submit_job(source_id, JobType.INTELLIGENCE)
+    started, release = threading.Event(), threading.Event()
+
+    def long_job(claimed_id):
+        started.set()
+        release.wait(10)
+
+    monkeypatch.setattr(worker_module, "_execute_job", long_job)
+    worker = JobWorker(concurrency=1, pool_mode="thread", poll_interval=0.1, lease_seconds=1)
+    runner = threading.Thread(target=worker.run_forever, daemon=True)
+    runner.start()
+    assert started.wait(5)
+
+    worker.stop()
+    time.sleep(1.5)  # Longer than the lease
+    try:
+        assert JobWorker(worker_id="other-worker").reclaim_expired_leases() == 0
+        with SessionLocal() as db:
+            job = db.get(JobModel, job_id)
+            assert job.status == JobStatus.PROCESSING
+            assert job.lease_expires_at.replace(tzinfo=None) > utc_now().replace(tzinfo=None)
+    finally:
+        release.set()
+        runner.join(timeout=5)
+    assert not runner.is_alive()
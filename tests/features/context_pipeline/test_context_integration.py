@@ -188,4 +188,59 @@ def test_provenance_reverse_engineering(seeded_source):
         print(f"   Window ID: {window.id}")
         print(f"   Derived Start: {first_seg.start_time}s")
 
-        assert first_seg.start_time >= 0.0
\ No newline at end of file
+        assert first_seg.start_time >= 0.0
+
+def _reference_windows(orchestrator, segments, config):
+    """The previous list-based builder (walks back with insert(0, ...) for the overlap)."""
+    from app.features.context_pipeline.domain.models import ContextWindow
+
+    enriched = [(seg, orchestrator.tokenizer.count_tokens(orchestrator._format_segment(seg)), orchestrator._format_segment(seg))
+                for seg in segments]
+    windows, current, current_tokens = [], [], 0
+
+    def finalize(items):
+        windows.append(ContextWindow(len(windows), "\n".join(t[2] for t in items), sum(t[1] for t in items), [t[0].id for t in items]))
+
+    for i, item in enumerate(enriched):
+        if current_tokens + item[1] > config.target_size and current:
+            finalize(current)
+            overlap, overlap_tokens, back = [], 0, i - 1
+            while back >= 0:
+                if overlap_tokens + enriched[back][1] > config.overlap_size and overlap:
+                    break
+                overlap.insert(0, enriched[back])
+                overlap_tokens += enriched[back][1]
+                back -= 1
+            current, current_tokens = overlap, overlap_tokens
+        current.append(item)
+        current_tokens += item[1]
+    if current:
+        finalize(current)
+    return windows
+
+
+def test_sliding_windows_match_reference_builder():
+    """
+    Unit: The prefix-sum/bisect builder produces exactly the windows of the previous
+    algorithm, including oversized segments, empty texts and overlaps wider than a window.
+    """
+    import random
+    from types import SimpleNamespace
+    from app.features.context_pipeline.domain.models import WindowConfig
+    from app.features.context_pipeline.service.orchestrator import ContextOrchestrator, SimpleTokenizer
+
+    orchestrator = ContextOrchestrator.__new__(ContextOrchestrator)
+    orchestrator.tokenizer = SimpleTokenizer()
+    rng = random.Random(0)
+
+    for trial in range(200):
+        segments = [
+            SimpleNamespace(id=uuid4(), start_time=i * 2.0, speaker=None,
+                            text="w" * rng.choice([0, 1, 10, 40, 200, rng.randint(0, 2000)]))
+            for i in range(rng.randint(0, 120))
+        ]
+        config = WindowConfig(context_window_limit=rng.choice([64, 256, 1024, 8192]),
+                              safe_buffer_ratio=rng.choice([0.5, 0.9, 1.0]),
+                              overlap_ratio=rng.choice([0.0, 0.1, 0.5, 1.2]))
+
+        assert orchestrator._build_sliding_windows(segments, config) == _reference_windows(orchestrator, segments, config)
@@ -113,4 +113,163 @@ def test_diarization_aligns_speakers_to_text():
         ).first()
         assert unlinked_seg.speaker_id is None
 
-        print(f"\n[Success] Successfully linked '{linked_seg.text}' to {speaker.user_label}")
\ No newline at end of file
+        print(f"\n[Success] Successfully linked '{linked_seg.text}' to {speaker.user_label}")
+
+def test_alignment_picks_the_speaker_with_most_overlap():
+    """
+    Sweep alignment: largest overlap wins (not the first segment containing the midpoint),
+    and word-level labels split a segment where the speaker changes.
+    """
+    from app.features.diarization.domain.models import SpeakerSegment
+    from app.features.diarization.service.alignment import assign_speakers, split_by_speaker
+
+    speakers = [
+        SpeakerSegment(0.0, 4.0, "speaker_0"),
+        SpeakerSegment(3.0, 10.0, "speaker_1"),   # Overlapping speech
+        SpeakerSegment(10.5, 12.0, "speaker_0"),
+    ]
+    spans = [(20.0, 21.0), (2.0, 5.0), (3.5, 9.0), (10.0, 10.4), (11.0, 11.0)]
+
+    assert assign_speakers(spans, speakers) == [None, "speaker_0", "speaker_1", None, "speaker_0"]
+
+    words = ["well", "I", "think", "objection", "sustained"]
+    labels = ["speaker_0", None, "speaker_0", "speaker_1", "speaker_1"]
+    assert split_by_speaker(words, labels) == [
+        ("speaker_0", ["well", "I", "think"]),
+        ("speaker_1", ["objection", "sustained"]),
+    ]
+
+
+def test_diarization_writes_are_set_based():
+    """
+    Speakers are upserted (user renames survive a re-run) and thousands of segments
+    are linked with a handful of statements, not one per segment.
+    """
+    from sqlalchemy import event
+
+    with SessionLocal() as db:
+        file_rec = FileModel(file_path="/tmp/bulk_speakers.wav", file_size_bytes=1,
+                             file_hash="bulk_speakers_hash", file_type=FileType.AUDIO)
+        db.add(file_rec)
+        db.flush()
+        src = SourceModel(name="Bulk Speakers", source_type=SourceType.AUDIO_FILE, file_id=file_rec.id)
+        db.add(src)
+        db.flush()
+        job = JobModel(source_id=src.id, job_type=JobType.DIARIZATION, status=JobStatus.PROCESSING)
+        db.add(job)
+        db.flush()
+        trans = TranscriptionModel(source_id=src.id, job_id=job.id, model_used="fake", full_text="...")
+        db.add(trans)
+        db.flush()
+        db.add(SourceSpeakerModel(source_id=src.id, detected_label="speaker_0", user_label="Dr. Smith"))
+        db.add_all([
+            TranscriptionSegmentModel(transcription_id=trans.id, start_time=i * 0.0015, end_time=i * 0.0015 + 0.001, text=f"w{i}")
+            for i in range(3000)
+        ])
+        db.commit()
+        source_id = src.id
+
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        result = DiarizationHandler().handle(source_id, {})
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert result["new_profiles_created"] == 1
+    assert result["segments_aligned"] == 3000
+    assert len(statements) < 20
+
+    with SessionLocal() as db:
+        speakers = {s.detected_label: s.user_label for s in db.query(SourceSpeakerModel).filter_by(source_id=source_id)}
+        assert speakers == {"speaker_0": "Dr. Smith", "speaker_1": "Unknown speaker_1"}
+
+
+def test_speakers_are_recognized_across_sources(tmp_path, monkeypatch):
+    """
+    Speaker identities: a voice enrolled from one source is matched in another by
+    cosine similarity, and the name a user gave it is suggested there.
+    """
+    import numpy as np
+    from app.core.config.settings import settings
+    from app.features.diarization.data.speaker_writer import SpeakerBulkWriter
+    from app.features.diarization.data.speaker_index import SpeakerEmbeddingIndex
+    from app.features.diarization.service.api import rename_speaker
+    from app.features.diarization.service.identity import match_speaker_identities
+
+    monkeypatch.setattr(settings, "SPEAKER_INDEX_PATH", tmp_path / "speaker_index.npz")
+    rng = np.random.default_rng(7)
+    witness, judge, stranger = rng.standard_normal((3, 192))
+
+    def new_source(name):
+        file_rec = FileModel(file_path=f"/tmp/{name}.wav", file_size_bytes=1, file_hash=f"{name}_hash", file_type=FileType.AUDIO)
+        db.add(file_rec)
+        db.flush()
+        src = SourceModel(name=name, source_type=SourceType.AUDIO_FILE, file_id=file_rec.id)
+        db.add(src)
+        db.flush()
+        return src.id
+
+    with SessionLocal() as db:
+        first = new_source("hearing_day_1")
+        speakers, _ = SpeakerBulkWriter().upsert_speakers(db, first, ["speaker_0", "speaker_1"])
+        stats = match_speaker_identities(db, speakers, {"speaker_0": witness.tolist(), "speaker_1": judge.tolist()})
+        db.commit()
+        witness_speaker = speakers["speaker_0"]
+    assert stats["enrolled"] == 2 and stats["matched"] == 0
+
+    rename_speaker(witness_speaker, "Dr. Smith")
+
+    with SessionLocal() as db:
+        second = new_source("hearing_day_2")
+        speakers, _ = SpeakerBulkWriter().upsert_speakers(db, second, ["speaker_0", "speaker_1"])
+        noisy_witness = witness + rng.normal(0, 0.3, 192)
+        stats = match_speaker_identities(db, speakers, {"speaker_0": stranger.tolist(), "speaker_1": noisy_witness.tolist()})
+        db.commit()
+
+        renamed = db.get(SourceSpeakerModel, speakers["speaker_1"])
+        assert renamed.user_label == "Dr. Smith"
+        assert renamed.identity_id == db.get(SourceSpeakerModel, witness_speaker).identity_id
+        assert renamed.profile_meta["identity_score"] > 0.9
+
+        # The persisted index is current, so a fresh load reads the file instead of the DB
+        index = SpeakerEmbeddingIndex.load(db)
+        assert index._read() == SpeakerEmbeddingIndex.stamp(db)
+
+    assert stats == {"matched": 1, "enrolled": 1, "suggested_labels": 1}
+
+
+def test_diarization_embeds_speech_only_and_reclusters_from_cache(tmp_path, monkeypatch):
+    """
+    Windows are laid out inside speech regions only; a second run with another
+    num_speakers reuses the cached embeddings instead of calling the model.
+    """
+    from app.core.config.settings import settings
+    from app.features.diarization.data.nemo_adapter import NemoDiarizationAdapter
+    from app.features.diarization.service.api import run_diarization
+
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_DIR", tmp_path / "embeddings")
+    embedded = []
+    original = NemoDiarizationAdapter.embed_windows
+    def spy(self, audio_path, windows, file_hash=None):
+        embedded.append(windows.copy())
+        return original(self, audio_path, windows, file_hash)
+    monkeypatch.setattr(NemoDiarizationAdapter, "embed_windows", spy)
+
+    speech = [(0.0, 3.0), (40.0, 41.0), (60.0, 66.0)]
+    first = run_diarization("/tmp/fake_audio.wav", file_hash="recluster_hash", speech_regions=speech)
+
+    windows = embedded[0]
+    assert all(any(s <= w0 and w1 <= e for s, e in speech) for w0, w1 in windows)
+    assert windows[:, 1].max() == 66.0
+    assert first.processing_meta["embedding_cache_hit"] is False
+    assert first.num_speakers == 2
+
+    second = run_diarization("/tmp/fake_audio.wav", num_speakers=3, file_hash="recluster_hash", speech_regions=speech)
+
+    assert len(embedded) == 1
+    assert second.processing_meta["embedding_cache_hit"] is True
+    assert second.num_speakers == 3
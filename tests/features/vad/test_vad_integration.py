@@ -17,4 +17,139 @@ def test_vad_service_returns_segments():
     
     assert has_speech
     assert has_silence
-    print(f"\n[Success] VAD returned {len(segments)} segments.")
\ No newline at end of file
+    print(f"\n[Success] VAD returned {len(segments)} segments.")
+
+def test_vad_timeline_is_stored_and_queried_by_interval(monkeypatch):
+    """
+    Integration: A hashed file is analyzed once; the timeline is then read back
+    from vad_segments, including 'speech overlapping [t0, t1]' lookups.
+    """
+    from app.features.vad.data.marblenet_adapter import MarbleNetAdapter
+    from app.features.vad.service.api import get_vad_timeline, get_speech_intervals
+
+    calls = []
+    original = MarbleNetAdapter.speech_probabilities
+    monkeypatch.setattr(MarbleNetAdapter, "speech_probabilities",
+                        lambda self, path, file_hash=None: calls.append(path) or original(self, path, file_hash))
+
+    file_hash = "vad_timeline_hash"
+    assert get_vad_timeline(file_hash) is None
+
+    first = run_vad_analysis("/tmp/any_path.wav", file_hash)
+    second = run_vad_analysis("/tmp/any_path.wav", file_hash)
+    assert len(calls) == 1
+    assert second == first
+
+    # Mock timeline: speech 0-5s (plus padding), then silence until 10s
+    speech_end = first[0].end
+    assert 5.0 <= speech_end < 6.0
+    assert [s.event_type for s in get_vad_timeline(file_hash, 4.0, 7.0)] == [VadEventType.SPEECH, VadEventType.SILENCE]
+    assert get_vad_timeline(file_hash, 7.0, 9.0)[0].start == speech_end
+    assert get_speech_intervals(file_hash, 2.0, 8.0) == [(2.0, speech_end)]
+    assert get_speech_intervals(file_hash, 6.0, 10.0) == []
+
+
+def test_replacing_a_timeline_removes_its_old_segments():
+    """
+    Saving a timeline again replaces the old segments, also on SQLite without
+    foreign key enforcement (no ON DELETE CASCADE to rely on).
+    """
+    from sqlalchemy import func, select
+    from app.core.database.connection import SessionLocal
+    from app.features.vad.data.sql_models import VadRunModel, VadSegmentModel
+    from app.features.vad.data.timeline_store import VadTimelineStore
+    from app.features.vad.domain.models import VadSegment
+
+    store = VadTimelineStore()
+    old = [VadSegment(0.0, 1.0, VadEventType.SPEECH, 0.9), VadSegment(1.0, 2.0, VadEventType.SILENCE, 0.8)]
+    new = [VadSegment(0.0, 2.0, VadEventType.SILENCE, 0.7)]
+
+    with SessionLocal() as db:
+        store.save(db, "vad_replace_hash", "test_model", old)
+        run = store.save(db, "vad_replace_hash", "test_model", new)
+        orphans = db.execute(
+            select(func.count()).select_from(VadSegmentModel)
+            .where(VadSegmentModel.run_id.not_in(select(VadRunModel.id)))
+        ).scalar()
+        assert orphans == 0
+        assert store.load(db, run) == new
+
+def test_vad_postprocessing_hysteresis_and_streaming():
+    """
+    Unit: Hysteresis, padding, gap bridging and blip removal on frame probabilities;
+    block-wise streaming yields the same timeline as the whole track.
+    """
+    import numpy as np
+    from app.features.vad.domain.models import VadConfig
+    from app.features.vad.service.postprocessing import probabilities_to_segments, StreamingVadPostprocessor
+
+    config = VadConfig(onset=0.5, offset=0.3, pad_onset_seconds=0.1, pad_offset_seconds=0.1,
+                       min_silence_seconds=0.3, min_speech_seconds=0.4)
+    frame = 0.1
+    probs = np.array(
+        [0.1] * 10 +
+        [0.9, 0.4, 0.45, 0.9] + [0.2] * 3 + [0.8] * 3 +   # 0.4/0.45 dip held by hysteresis; 3-frame gap bridged
+        [0.1] * 20 +
+        [0.9] +                                          # Blip: too short even with padding
+        [0.1] * 20
+    )
+
+    segments = probabilities_to_segments(probs, frame, config)
+    speech = [(round(s.start, 6), round(s.end, 6)) for s in segments if s.event_type == VadEventType.SPEECH]
+    assert speech == [(0.9, 2.1)]
+    assert segments[0].start == 0.0 and segments[-1].end == len(probs) * frame
+    assert all(a.end == b.start for a, b in zip(segments, segments[1:]))
+
+    track = np.tile(probs, 50) + np.random.default_rng(0).normal(0, 0.1, len(probs) * 50)
+    expected = probabilities_to_segments(track, frame, config)
+
+    stream = StreamingVadPostprocessor(frame, config)
+    streamed = []
+    for block in np.array_split(track, 37):
+        streamed += stream.push(block)
+    streamed += stream.flush()
+
+    assert [(s.start, s.end, s.event_type) for s in streamed] == [(s.start, s.end, s.event_type) for s in expected]
+    assert np.allclose([s.confidence for s in streamed], [s.confidence for s in expected])
+
+
+def test_energy_vad_runs_without_the_model_orchestrator(monkeypatch):
+    """
+    Integration: The energy backend finds voiced speech between silence and broadband
+    noise, on the CPU only; 'auto' escalates a borderline file to MarbleNet.
+    """
+    import numpy as np
+    from app.core.model_lifecycle.orchestrator import ModelOrchestrator
+    from app.features.vad.data import energy_adapter
+    from app.features.vad.service.api import analyze_voice_activity, speech_ratio
+
+    sr = 16000
+    rng = np.random.default_rng(0)
+    t = np.arange(3 * sr) / sr
+    voiced = 0.1 * sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 20)) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+    hiss = 0.1 * rng.standard_normal(3 * sr)
+    quiet = lambda seconds: 0.001 * rng.standard_normal(int(seconds * sr))
+    # 0-3s quiet, 3-6s voiced, 6-9s quiet, 9-12s loud white noise, 12-14s quiet
+    pcm = np.concatenate([quiet(3), voiced + quiet(3), quiet(3), hiss + quiet(3), quiet(2)]).astype(np.float32)
+    monkeypatch.setattr(energy_adapter, "load_pcm", lambda path, file_hash=None: pcm)
+
+    leases = []
+    original_lease = ModelOrchestrator.lease
+    monkeypatch.setattr(ModelOrchestrator, "lease", lambda self, *a, **kw: leases.append(a[0]) or original_lease(self, *a, **kw))
+
+    segments, model = analyze_voice_activity("/tmp/synthetic.wav", backend="energy")
+    speech = [s for s in segments if s.event_type == VadEventType.SPEECH]
+    assert model == "energy_vad"
+    assert leases == []
+    assert len(speech) == 1
+    assert 2.5 < speech[0].start < 3.2 and 5.8 < speech[0].end < 6.5
+    assert segments[-1].end == 14.0
+
+    # 3s of speech in 14s is borderline: MarbleNet gets the final word
+    assert 0.05 < speech_ratio(segments) < 0.5
+    _, model = analyze_voice_activity("/tmp/synthetic.wav", backend="auto")
+    assert model == "vad_marblenet"
+    assert len(leases) == 1
+
+    with pytest.raises(ValueError):
+        analyze_voice_activity("/tmp/synthetic.wav", backend="webrtc")